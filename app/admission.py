@@ -0,0 +1,203 @@
+# Admission control for HTTP routes
+"""
+1. With VEHICLE_ADMISSION=on, every request needs a slot in its route's budget
+   before any sync work is handed to the threadpool: admit() is an app-wide
+   async dependency, so it runs on the event loop right after routing.
+2. A Budget is a concurrency limit with a bounded FIFO wait queue. A request
+   that finds the queue full, or is still queued after
+   VEHICLE_ADMISSION_MAX_WAIT_MS, is shed at once with 503 and Retry-After
+   instead of piling up in the threadpool and the engine pool until it times out.
+3. Reads and writes have separate budgets (by HTTP method), so writes cannot
+   take every slot from point lookups. Heavy routes (bulk writes, imports,
+   exports) get small budgets of their own and unlimited routes (/metrics, the
+   change feed) none; VEHICLE_ADMISSION_ROUTES overrides the defaults.
+4. Keep the budgets' total below the threadpool size (40 by default) so that
+   admitted requests never queue for a worker thread.
+5. Active slots, queue depth, queue time and shed requests are exported on
+   GET /metrics.
+"""
+import asyncio
+import time
+from collections import deque
+from contextlib import suppress
+
+from fastapi import HTTPException
+from starlette.requests import HTTPConnection
+
+from . import config, metrics
+
+# Budget of routes not listed in ROUTES, by HTTP method
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Route → budget: "read", "write", "none" (not limited) or a number (a budget of its own)
+DEFAULT_ROUTES = {
+    "POST /vehicle/lookup": "read",
+    "POST /vehicle/batch": "2",
+    "POST /vehicle/bulk-update": "1",
+    "POST /vehicle/bulk-delete": "1",
+    "POST /vehicle/import": "2",
+    "GET /vehicle/export": "2",
+    "GET /vehicle/feed": "none",  # long-lived streams; they poll instead of holding the pool
+    "GET /metrics": "none",
+    "GET /debug/slow-queries": "none",
+    "GET /vehicle/cache/stats": "none",
+}
+
+
+def parse_routes(spec: str) -> dict:
+    """Parse "METHOD /path=budget, ..." (VEHICLE_ADMISSION_ROUTES) into {route: budget}."""
+    routes = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        route, _, budget = item.rpartition("=")
+        if not route or not budget.strip():
+            raise ValueError(f"Invalid admission route {item!r}; expected 'METHOD /path=budget'")
+        routes[" ".join(route.split())] = budget.strip()
+    return routes
+
+
+class Budget:
+    """
+    Up to `limit` concurrent requests, then up to `queue_size` waiting in FIFO
+    order for at most `max_wait` seconds. Used from the event loop only.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, max_wait: float, retry_after: int = 1):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self):
+        """Take a slot, waiting in line if needed; raises HTTPException 503 when shed."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self._report(wait=0.0)
+            return
+        if len(self._waiters) >= self.queue_size:
+            self._shed("queue_full")
+
+        started = time.perf_counter()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._report()
+        try:
+            # release() hands its slot straight to the waiter, so `active` is unchanged
+            await asyncio.wait_for(waiter, self.max_wait)
+        except asyncio.TimeoutError:
+            self._shed("deadline")
+        except asyncio.CancelledError:  # client gone while queued
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # the slot arrived at the same time: pass it on
+            raise
+        finally:
+            with suppress(ValueError):
+                self._waiters.remove(waiter)
+            self._report()
+        self._report(wait=time.perf_counter() - started)
+
+    def release(self):
+        """Give the slot to the first live waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._report()
+                return
+        self.active -= 1
+        self._report()
+
+    def _shed(self, reason: str):
+        metrics.admission_shed.inc(self.name, reason)
+        raise HTTPException(
+            status_code=503,
+            detail=f"Server busy ({self.name} requests); retry later",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+    def _report(self, wait: float | None = None):
+        metrics.admission_active.set(self.name, value=self.active)
+        metrics.admission_queued.set(self.name, value=len(self._waiters))
+        if wait is not None:
+            metrics.admission_wait.observe(self.name, value=wait)
+
+
+class AdmissionController:
+    """Maps each route to its Budget (or to none)."""
+
+    def __init__(
+        self,
+        read_limit: int,
+        write_limit: int,
+        queue_size: int,
+        max_wait: float,
+        retry_after: int = 1,
+        routes: dict | None = None,
+    ):
+        def budget(name, limit):
+            return Budget(name, limit, queue_size, max_wait, retry_after)
+
+        self.read = budget("read", read_limit)
+        self.write = budget("write", write_limit)
+        self.routes = {}  # "METHOD /path" → Budget | None
+        for route, spec in {**DEFAULT_ROUTES, **(routes or {})}.items():
+            if spec in ("read", "write"):
+                self.routes[route] = getattr(self, spec)
+            elif spec == "none":
+                self.routes[route] = None
+            else:
+                self.routes[route] = budget(route, int(spec))
+
+    def budget_for(self, method: str, path: str) -> Budget | None:
+        """Budget of a route template; method-based for routes without an override."""
+        key = f"{method} {path}"
+        if key in self.routes:
+            return self.routes[key]
+        return self.read if method in READ_METHODS else self.write
+
+    def budgets(self) -> list[Budget]:
+        unique = {id(b): b for b in (self.read, self.write, *self.routes.values()) if b is not None}
+        return list(unique.values())
+
+
+def _configured() -> AdmissionController | None:
+    if not config.ADMISSION:
+        return None
+    return AdmissionController(
+        read_limit=config.ADMISSION_READ_LIMIT,
+        write_limit=config.ADMISSION_WRITE_LIMIT,
+        queue_size=config.ADMISSION_QUEUE_SIZE,
+        max_wait=config.ADMISSION_MAX_WAIT_MS / 1000,
+        retry_after=config.ADMISSION_RETRY_AFTER,
+        routes=parse_routes(config.ADMISSION_ROUTES),
+    )
+
+
+# Process-wide controller used by admit(); None when admission control is off
+controller = _configured()
+
+
+async def admit(connection: HTTPConnection):
+    """
+    App-wide async dependency: hold a slot of the route's budget for the whole
+    request, or shed it with 503. WebSocket routes are not limited.
+    """
+    route = connection.scope.get("route")
+    budget = None
+    if controller is not None and connection.scope["type"] == "http" and route is not None:
+        budget = controller.budget_for(connection.scope["method"], route.path)
+    if budget is None:
+        yield
+        return
+
+    await budget.acquire()
+    try:
+        yield
+    finally:
+        budget.release()
@@ -0,0 +1,175 @@
+# Async CRUD routes
+"""
+1. Defines async def versions of the core /vehicle CRUD routes.
+2. Injects an AsyncSession using Depends(get_async_db), so requests wait on
+   the event loop instead of holding one of the threadpool's worker slots.
+3. Mirrors the sync routes in app/main.py exactly (paths, status codes, errors, ETags).
+4. Mounted by app/main.py when VEHICLE_API_MODE=async.
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import crud, schemas, versioning
+from .async_crud import AsyncVehicleRepository
+from .cache import page_cache, vehicle_cache
+from .crud import PreconditionFailed
+from .database import get_async_db
+
+router = APIRouter()
+
+
+@router.post("/vehicle", response_model=schemas.VehicleResponse, status_code=201)
+async def create_vehicle(vehicle: schemas.VehicleCreate, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """Create a new vehicle if VIN does not already exist."""
+    repo = AsyncVehicleRepository(db, cache=vehicle_cache)
+    created = await repo.create(vehicle)
+
+    if created is None:  # VIN uniqueness enforced by the primary key
+        raise HTTPException(
+            status_code=400,
+            detail=f"Vehicle with VIN {vehicle.vin.upper()} already exists."
+        )
+
+    response.headers["ETag"] = versioning.vehicle_etag(created.version)
+    return created
+
+
+@router.get("/vehicle", response_model=schemas.VehiclePage)
+async def get_all_vehicles(
+    request: Request,
+    filters: schemas.VehicleFilter = Depends(),
+    limit: int = Query(schemas.DEFAULT_PAGE_SIZE, ge=1, le=schemas.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: schemas.VehicleSort = "vin",
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retrieve one page of vehicles, optionally filtered and sorted (VIN order by default).
+    The ETag is the table generation: If-None-Match is answered without running the page
+    query, and serialized pages are reused until the next write.
+    """
+    repo = AsyncVehicleRepository(db, cache=vehicle_cache)
+    # Read the generation before the page, so a cached page is never older than its key
+    etag = versioning.collection_etag(await repo.generation())
+    if versioning.none_match(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    key = (etag, limit, cursor, sort, tuple(filters.model_dump(exclude_none=True).items()))
+    body = page_cache.get(key)
+    if body is None:
+        try:
+            body = await repo.page_json(limit=limit, cursor=cursor, filters=filters, sort=sort)
+        except ValueError:  # malformed cursor
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page_cache.put(key, body)
+
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("/vehicle/{vin}", response_model=schemas.VehicleResponse)
+async def get_vehicle(vin: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Retrieve a single vehicle by VIN; If-None-Match is answered from its version alone."""
+    repo = AsyncVehicleRepository(db, cache=vehicle_cache)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        version = await repo.version(vin)
+        if version is not None and versioning.none_match(if_none_match, versioning.vehicle_etag(version)):
+            return Response(status_code=304, headers={"ETag": versioning.vehicle_etag(version)})
+
+    vehicle = await repo.read(vin)
+
+    if not vehicle:  # handle not found
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+
+    # Trusted Core row → JSON bytes; response_model still documents the shape
+    return Response(
+        crud.row_json(vehicle),
+        media_type="application/json",
+        headers={"ETag": versioning.vehicle_etag(vehicle.version)},
+    )
+
+
+@router.put("/vehicle/{vin}", response_model=schemas.VehicleResponse)
+async def update_vehicle(
+    vin: str,
+    updates: schemas.VehicleUpdate,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Update an existing vehicle using its VIN; honours If-Match."""
+    repo = AsyncVehicleRepository(db, cache=vehicle_cache)
+    if_versions = versioning.if_match_versions(request.headers.get("if-match"))
+
+    try:
+        updated = await repo.update(vin, updates, if_versions=if_versions)
+    except PreconditionFailed as exc:  # changed since the client read it
+        raise HTTPException(
+            status_code=412,
+            detail="Vehicle has been modified",
+            headers={"ETag": versioning.vehicle_etag(exc.version)},
+        )
+
+    if not updated:  # handle nonexistent VIN
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+
+    response.headers["ETag"] = versioning.vehicle_etag(updated.version)
+    return updated
+
+
+@router.patch("/vehicle/{vin}", response_model=schemas.VehicleResponse)
+async def patch_vehicle(
+    vin: str,
+    patch: schemas.VehiclePatch,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Change only the fields sent. A `version` in the body makes the write
+    conditional (409 if the vehicle has changed); otherwise If-Match is honoured (412).
+    """
+    repo = AsyncVehicleRepository(db, cache=vehicle_cache)
+    if patch.version is not None:
+        if_versions, status_code = [patch.version], 409
+    else:
+        if_versions, status_code = versioning.if_match_versions(request.headers.get("if-match")), 412
+
+    try:
+        updated = await repo.patch(vin, patch, if_versions=if_versions)
+    except PreconditionFailed as exc:  # another writer got there first
+        raise HTTPException(
+            status_code=status_code,
+            detail={"message": "Vehicle has been modified", "version": exc.version},
+            headers={"ETag": versioning.vehicle_etag(exc.version)},
+        )
+
+    if not updated:  # handle nonexistent VIN
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+
+    response.headers["ETag"] = versioning.vehicle_etag(updated.version)
+    return updated
+
+
+@router.delete("/vehicle/{vin}", status_code=204)
+async def delete_vehicle(vin: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Delete a vehicle by VIN; honours If-Match."""
+    repo = AsyncVehicleRepository(db, cache=vehicle_cache)
+    if_versions = versioning.if_match_versions(request.headers.get("if-match"))
+
+    try:
+        deleted = await repo.delete(vin, if_versions=if_versions)
+    except PreconditionFailed as exc:  # changed since the client read it
+        raise HTTPException(
+            status_code=412,
+            detail="Vehicle has been modified",
+            headers={"ETag": versioning.vehicle_etag(exc.version)},
+        )
+
+    if not deleted:  # handle nonexistent VIN
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+
+    return None
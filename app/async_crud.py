@@ -0,0 +1,84 @@
+# Async repository
+"""
+1. Implements AsyncVehicleRepository for async routes using AsyncSession.
+2. Each method runs the matching VehicleRepository method through
+   AsyncSession.run_sync(), so SQL and business rules live in one place
+   while the driver I/O (aiosqlite) never blocks the event loop.
+3. Results are fully loaded before returning, so nothing lazy-loads later.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import schemas
+from .cache import VehicleCache
+from .crud import VehicleRepository
+
+
+class AsyncVehicleRepository:
+    """Async counterpart of VehicleRepository with the same method semantics."""
+
+    def __init__(self, db: AsyncSession, cache: VehicleCache | None = None):
+        self.db = db  # async database session
+        self.cache = cache
+
+    async def _run(self, method: str, *args, **kwargs):
+        """Call a VehicleRepository method on the session's sync facade."""
+        def call(session):
+            return getattr(VehicleRepository(session, cache=self.cache), method)(*args, **kwargs)
+
+        return await self.db.run_sync(call)
+
+    async def get(self, vin: str):
+        """Fetch a single vehicle by VIN."""
+        return await self._run("get", vin)
+
+    async def read(self, vin: str):
+        """Fetch a single vehicle as a read-only row, through the cache if configured."""
+        return await self._run("read", vin)
+
+    async def version(self, vin: str):
+        """Current version of a vehicle (None if missing) without loading the row."""
+        return await self._run("version", vin)
+
+    async def generation(self):
+        """Current generation of the vehicles table."""
+        return await self._run("generation")
+
+    async def list(self):
+        """Return all vehicles in the database."""
+        return await self._run("list")
+
+    async def page(
+        self,
+        limit: int = schemas.DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        filters=None,
+        sort: str = "vin",
+    ):
+        """Return one keyset page of vehicles and the next cursor."""
+        return await self._run("page", limit=limit, cursor=cursor, filters=filters, sort=sort)
+
+    async def page_json(
+        self,
+        limit: int = schemas.DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        filters=None,
+        sort: str = "vin",
+    ) -> bytes:
+        """Return one keyset page already serialized as a VehiclePage JSON body."""
+        return await self._run("page_json", limit=limit, cursor=cursor, filters=filters, sort=sort)
+
+    async def create(self, vehicle: schemas.VehicleCreate):
+        """Insert a new vehicle; None if the VIN already exists."""
+        return await self._run("create", vehicle)
+
+    async def update(self, vin: str, update_data: schemas.VehicleUpdate, if_versions=None):
+        """Update an existing vehicle; None if it does not exist."""
+        return await self._run("update", vin, update_data, if_versions=if_versions)
+
+    async def patch(self, vin: str, patch: schemas.VehiclePatch, if_versions=None):
+        """Write only the fields set on `patch`; None if the vehicle does not exist."""
+        return await self._run("patch", vin, patch, if_versions=if_versions)
+
+    async def delete(self, vin: str, if_versions=None):
+        """Delete a vehicle; None if it does not exist."""
+        return await self._run("delete", vin, if_versions=if_versions)
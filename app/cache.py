@@ -0,0 +1,240 @@
+# Per-VIN read-through cache
+"""
+1. VehicleCache keeps recently read vehicle rows in process memory, keyed by normalized VIN.
+2. Entries are evicted LRU-first once the cache is full and expire after a TTL;
+   misses (404s) are cached too, with a shorter TTL.
+3. Writes are queued on the session and invalidated once the transaction commits
+   (defer_invalidation; the in-memory store in app/memory.py uses it too).
+4. An InvalidationHook keeps several worker processes coherent; the SQLite
+   generation hook watches the `vehicles` table generation (bumped by triggers
+   on every write, app/versioning.py) and clears the local cache when it moves.
+5. ResponseCache keeps pre-serialized collection pages keyed by the table
+   generation, so a stale page can never be served and no invalidation is needed.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from . import config, models, versioning
+
+# Marks a cached "vehicle does not exist" result
+_MISSING = object()
+
+# Session.info key holding VINs to invalidate when the transaction commits
+_PENDING_KEY = "vehicle_cache_pending"
+
+# Session.info flag: the session commits a savepoint inside someone else's
+# transaction, so its invalidations wait for that owner (see take_pending)
+DEFER_KEY = "vehicle_cache_defer"
+
+
+class InvalidationHook:
+    """Default hook: a single process, so local invalidation is enough."""
+
+    def publish(self, db: Session, cache: "VehicleCache"):
+        """Called inside every write transaction."""
+
+    def poll(self, db: Session, cache: "VehicleCache"):
+        """Called before cache lookups; may clear the cache if others wrote."""
+
+
+class SQLiteGenerationHook(InvalidationHook):
+    """
+    Cross-process coherence through the table generation stored in SQLite.
+    Triggers bump it on every write, so publishing needs no extra statement;
+    readers re-check it at most every `poll_interval` seconds and drop their
+    whole cache if it moved (local writes included, as they cannot be told apart).
+    """
+
+    def __init__(self, poll_interval: float = 1.0):
+        self.poll_interval = poll_interval
+        self._seen = None
+        self._next_poll = 0.0
+        self._lock = threading.Lock()
+
+    def poll(self, db, cache):
+        now = time.monotonic()
+        if now < self._next_poll:
+            return
+
+        g = models.TableGeneration
+        row = db.execute(select(g.instance, g.generation).where(g.name == "vehicles")).first()
+        generation = versioning.generation_token(*(row or (None, None)))
+        with self._lock:
+            self._next_poll = now + self.poll_interval
+            if generation != self._seen:
+                if self._seen is not None:
+                    cache.clear()
+                self._seen = generation
+
+
+class VehicleCache:
+    """Thread-safe LRU + TTL cache of read-only vehicle rows (or known misses)."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl: float = 60.0,
+        negative_ttl: float = 5.0,
+        hook: InvalidationHook | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hook = hook or InvalidationHook()
+        self._entries: OrderedDict = OrderedDict()  # vin → (expires_at, value)
+        self._lock = threading.Lock()
+        # Bumped on every invalidation, so a slow miss cannot store a value read before it
+        self._epoch = 0
+        self._stats = dict.fromkeys(
+            ["hits", "negative_hits", "misses", "evictions", "expirations", "invalidations"], 0
+        )
+
+    def sync(self, db: Session):
+        """Let the invalidation hook catch up with writes made by other processes."""
+        self.hook.poll(db, self)
+
+    def lookup(self, vin: str):
+        """Return (found, value, epoch); value is None for a cached 404."""
+        with self._lock:
+            entry = self._entries.get(vin)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(vin)
+                    if value is _MISSING:
+                        self._stats["negative_hits"] += 1
+                        return True, None, self._epoch
+                    self._stats["hits"] += 1
+                    return True, value, self._epoch
+
+                del self._entries[vin]
+                self._stats["expirations"] += 1
+
+            self._stats["misses"] += 1
+            return False, None, self._epoch
+
+    def store(self, vin: str, value, epoch: int):
+        """Cache a lookup result unless an invalidation happened since `epoch`."""
+        ttl = self.ttl if value is not None else self.negative_ttl
+        with self._lock:
+            if epoch != self._epoch:
+                return
+            self._entries[vin] = (time.monotonic() + ttl, value if value is not None else _MISSING)
+            self._entries.move_to_end(vin)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, vins):
+        """Drop cached entries for the given VINs."""
+        with self._lock:
+            self._epoch += 1
+            for vin in vins:
+                if self._entries.pop(vin, None) is not None:
+                    self._stats["invalidations"] += 1
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._epoch += 1
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+
+    def publish(self, db: Session, vins):
+        """
+        Record a write inside the current transaction: notify other processes
+        through the hook and invalidate local entries once the transaction commits.
+        """
+        self.hook.publish(db, self)
+        defer_invalidation(db, self, vins)
+
+    def stats(self) -> dict:
+        """Counters plus current size, for monitoring."""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries), "max_entries": self.max_entries}
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU of serialized response bodies.
+    Keys start with the table generation they were computed at; pages of older
+    generations are simply never looked up again and age out.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()  # key → bytes
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(["hits", "misses", "evictions"], 0)
+
+    def get(self, key) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return body
+
+    def put(self, key, body: bytes):
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "size": len(self._entries), "max_entries": self.max_entries}
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    if session.info.get(DEFER_KEY):
+        return
+    apply_pending(session.info.pop(_PENDING_KEY, []))
+
+
+def defer_invalidation(db: Session, target, vins):
+    """Call target.invalidate(vins) once the session's current transaction commits."""
+    db.info.setdefault(_PENDING_KEY, []).append((target, list(vins)))
+
+
+def take_pending(session: Session) -> list:
+    """Remove and return a deferred session's committed invalidations."""
+    return session.info.pop(_PENDING_KEY, [])
+
+
+def apply_pending(pending: list):
+    """Apply invalidations collected by take_pending(), once their transaction has committed."""
+    for target, vins in pending:
+        target.invalidate(vins)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _configured_hook() -> InvalidationHook:
+    if config.CACHE_INVALIDATION == "sqlite":
+        return SQLiteGenerationHook(config.CACHE_POLL_INTERVAL)
+    return InvalidationHook()
+
+
+# Process-wide cache used by the API routes and background imports
+vehicle_cache = VehicleCache(
+    max_entries=config.CACHE_SIZE,
+    ttl=config.CACHE_TTL,
+    negative_ttl=config.CACHE_NEGATIVE_TTL,
+    hook=_configured_hook(),
+)
+
+# Serialized GET /vehicle pages, keyed by (generation, query)
+page_cache = ResponseCache(max_entries=config.PAGE_CACHE_SIZE)
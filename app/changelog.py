@@ -0,0 +1,204 @@
+# Vehicle change log and change feed
+"""
+1. vehicle_changes (models.VehicleChange) is an append-only log: one row per
+   created / updated / deleted vehicle with a sequence number, the VIN, the op,
+   the row version and the changed fields as JSON (all fields on create, only
+   the ones whose value changed on update, none on delete).
+2. Triggers on `vehicles` write it inside the same transaction as every write,
+   whichever path made it (repository, bulk writes, imports), without extra
+   round trips.
+3. Sequence numbers are AUTOINCREMENT: never reused, and in commit order
+   since SQLite has a single writer.
+4. prune() enforces the retention policy (VEHICLE_CHANGELOG_MAX_ROWS /
+   VEHICLE_CHANGELOG_MAX_AGE); the app runs it periodically. A consumer
+   resuming from a pruned position is told to resync instead of silently
+   missing changes.
+5. batches() reads the log after a resume position in batches, polling its
+   primary key (one index probe while idle); sse_events() / websocket_feed()
+   deliver them as Server-Sent Events or WebSocket messages.
+"""
+import asyncio
+import logging
+import time
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic_core import to_json
+from sqlalchemy import text
+
+from . import config
+
+logger = logging.getLogger("app.changelog")
+
+# Fields recorded in `changes`, i.e. everything the API exposes except the VIN
+FIELDS = (
+    "manufacturer_name", "description", "horse_power", "model_name",
+    "model_year", "purchase_price", "fuel_type",
+)
+
+_now = "((julianday('now') - 2440587.5) * 86400.0)"
+
+
+def _object(row: str) -> str:
+    return "json_object(" + ", ".join(f"'{f}', {row}.{f}" for f in FIELDS) + ")"
+
+
+_changed = f"""(
+    SELECT json_group_object(n.key, n.value)
+    FROM json_each({_object('new')}) AS n JOIN json_each({_object('old')}) AS o ON o.key = n.key
+    WHERE n.value IS NOT o.value
+)"""
+
+CREATE_STATEMENTS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS vehicle_changes_ai AFTER INSERT ON vehicles BEGIN
+        INSERT INTO vehicle_changes (vin, op, version, changes, at)
+        VALUES (new.vin, 'create', new.version, {_object('new')}, {_now});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS vehicle_changes_au AFTER UPDATE ON vehicles BEGIN
+        INSERT INTO vehicle_changes (vin, op, version, changes, at)
+        VALUES (new.vin, 'update', new.version, {_changed}, {_now});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS vehicle_changes_ad AFTER DELETE ON vehicles BEGIN
+        INSERT INTO vehicle_changes (vin, op, version, changes, at)
+        VALUES (old.vin, 'delete', old.version, NULL, {_now});
+    END
+    """,
+]
+
+
+def install(conn):
+    """Create the logging triggers if missing."""
+    for statement in CREATE_STATEMENTS:
+        conn.execute(text(statement))
+
+
+def prune(conn, max_rows: int = config.CHANGELOG_MAX_ROWS, max_age: float = config.CHANGELOG_MAX_AGE) -> int:
+    """
+    Drop entries beyond the newest `max_rows` or older than `max_age` seconds; returns how many.
+    Entries are appended in time order, so the age limit becomes a sequence bound: the scan
+    in seq order stops at the first entry young enough to keep, and the DELETE is a
+    primary-key range, touching only the rows it removes.
+    """
+    head = conn.execute(text("SELECT coalesce(max(seq), 0) FROM vehicle_changes")).scalar()
+    first_kept = conn.execute(
+        text(f"SELECT seq FROM vehicle_changes WHERE at >= {_now} - :max_age ORDER BY seq LIMIT 1"),
+        {"max_age": max_age},
+    ).scalar()
+    cutoff = max(head - max_rows, head if first_kept is None else first_kept - 1)
+    result = conn.execute(text("DELETE FROM vehicle_changes WHERE seq <= :cutoff"), {"cutoff": cutoff})
+    return result.rowcount
+
+
+async def retention_loop(session_factory, interval: float = config.CHANGELOG_PRUNE_INTERVAL):
+    """Background task: prune the log every `interval` seconds; a failed run is logged and retried."""
+    def run():
+        with session_factory() as db:
+            prune(db.connection())
+            db.commit()
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(run)
+        except Exception:  # e.g. "database is locked": the log must not grow unpruned until restart
+            logger.exception("Change log pruning failed; retrying in %s s", interval)
+
+
+# WebSocket close code sent when the resume position is no longer retained
+RESYNC_CLOSE_CODE = 4410
+
+
+class ResyncRequired(Exception):
+    """The requested position was pruned; the consumer must reload the inventory."""
+
+    def __init__(self, oldest: int):
+        super().__init__(f"Changes before sequence {oldest} are no longer retained; resync from GET /vehicle")
+        self.oldest = oldest
+
+
+def resume_position(repo, after: int | None) -> int:
+    """Sequence to deliver changes after: `after`, or the current head when None."""
+    head, oldest = repo.change_bounds()
+    if after is None:
+        return head
+    if after + 1 < oldest:
+        raise ResyncRequired(oldest)
+    return after
+
+
+async def batches(
+    repo,
+    position: int,
+    follow: bool = True,
+    batch_size: int = config.CHANGELOG_BATCH_SIZE,
+    poll_interval: float = config.CHANGELOG_POLL_INTERVAL,
+):
+    """
+    Yield (position, changes) batches after `position`; an empty batch on every
+    idle poll. Without `follow`, stop once caught up. Raises ResyncRequired if
+    pruning overtakes the consumer (sequences are gapless otherwise).
+    """
+    while True:
+        changes = await run_in_threadpool(repo.changes, position, batch_size)
+        if changes:
+            if changes[0]["seq"] != position + 1:
+                raise ResyncRequired(changes[0]["seq"])
+            position = changes[-1]["seq"]
+        if changes or follow:
+            yield position, changes
+        if len(changes) < batch_size:
+            if not follow:
+                return
+            await asyncio.sleep(poll_interval)
+
+
+async def sse_events(batches, heartbeat: float = config.CHANGELOG_HEARTBEAT):
+    """
+    Encode batches as Server-Sent Events. The event id is the resume position,
+    so EventSource clients resume through Last-Event-ID on reconnect.
+    """
+    yield b"retry: 1000\n\n"
+    last_sent = time.monotonic()
+    try:
+        async for position, changes in batches:
+            if changes:
+                yield b"id: %d\nevent: changes\ndata: %s\n\n" % (position, to_json(changes))
+            elif time.monotonic() - last_sent < heartbeat:
+                continue
+            else:
+                yield b": keep-alive\n\n"  # keeps proxies from closing an idle stream
+            last_sent = time.monotonic()
+    except ResyncRequired as exc:
+        yield b"event: resync\ndata: %s\n\n" % to_json({"oldest": exc.oldest, "detail": str(exc)})
+
+
+async def websocket_feed(websocket, batches):
+    """
+    Send each batch as a {"position", "changes"} text message; close with
+    RESYNC_CLOSE_CODE if the consumer fell behind the retained log. Returns when
+    the feed ends (follow=False) or the client disconnects.
+    """
+    async def send():
+        try:
+            async for position, changes in batches:
+                if changes:
+                    await websocket.send_text(to_json({"position": position, "changes": changes}).decode())
+        except ResyncRequired as exc:
+            await websocket.close(code=RESYNC_CLOSE_CODE, reason=str(exc)[:120])
+            return
+        await websocket.close()
+
+    async def until_disconnect():  # an idle feed sends nothing, so watch for the close instead
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.ensure_future(send()), asyncio.ensure_future(until_disconnect())]
+    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    for task in pending:
+        task.cancel()
+    for task in done:
+        task.result()  # re-raise unexpected errors
@@ -0,0 +1,160 @@
+# Group commit for single-vehicle writes
+"""
+1. With VEHICLE_WRITE_COALESCE=on, the single-vehicle write routes hand their
+   VehicleRepository call to a WriteCoalescer instead of committing themselves.
+2. One writer thread per process takes the first queued write, collects more
+   for up to VEHICLE_WRITE_COALESCE_WINDOW_MS (or VEHICLE_WRITE_COALESCE_MAX_BATCH
+   writes) and applies them all in one BEGIN IMMEDIATE ... COMMIT: one lock
+   acquisition and one journal sync for the whole batch.
+3. Each write runs in its own SAVEPOINT through an unchanged VehicleRepository
+   method, so its commit / rollback (a duplicate VIN, a version mismatch) stays
+   its own and every caller gets its own result or exception.
+4. Cache invalidations are held back until the batch has committed.
+5. Coalescing is per process: several uvicorn workers still contend for the
+   database lock, but once per batch rather than once per write.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy.orm import Session
+
+from .cache import DEFER_KEY, VehicleCache, apply_pending, take_pending
+from .crud import VehicleRepository
+
+# Queued to stop the writer thread
+_STOP = object()
+
+
+class WriteCoalescer:
+    """Applies queued VehicleRepository writes from many threads in shared transactions."""
+
+    def __init__(self, engine, cache: VehicleCache | None = None, window: float = 0.002, max_batch: int = 64):
+        self.engine = engine
+        self.cache = cache
+        self.window = window  # seconds to wait for more writes after the first
+        self.max_batch = max_batch
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(["batches", "writes", "failed_batches"], 0)
+
+    def submit(self, method: str, *args, **kwargs):
+        """Queue a VehicleRepository write and block until its batch commits; returns its result."""
+        future = Future()
+        self._start()
+        self._queue.put((method, args, kwargs, future))
+        return future.result()
+
+    def _start(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="write-coalescer", daemon=True)
+                    self._thread.start()
+
+    def close(self):
+        """Apply what is queued, then stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch, stop = [first], False
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._apply(batch)
+            if stop:
+                return
+
+    def _apply(self, batch: list):
+        pending = []
+        try:
+            with self.engine.connect() as conn:
+                # Drive the transaction by hand: pysqlite would otherwise let the
+                # first SAVEPOINT open (and its RELEASE commit) the transaction
+                dbapi_conn = conn.connection.dbapi_connection
+                isolation_level = dbapi_conn.isolation_level
+                dbapi_conn.isolation_level = None
+                try:
+                    conn.exec_driver_sql("BEGIN IMMEDIATE")
+                    try:
+                        outcomes = [self._apply_one(conn, item, pending) for item in batch]
+                        conn.exec_driver_sql("COMMIT")
+                    except BaseException:
+                        conn.exec_driver_sql("ROLLBACK")
+                        raise
+                finally:
+                    dbapi_conn.isolation_level = isolation_level
+                conn.rollback()  # end SQLAlchemy's (empty) view of the transaction
+        except Exception as exc:  # lock timeout, disk error...: the whole batch fails
+            with self._lock:
+                self._stats["failed_batches"] += 1
+            for *_, future in batch:
+                future.set_exception(exc)
+            return
+
+        apply_pending(pending)
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["writes"] += len(batch)
+        for (*_, future), (ok, value) in zip(batch, outcomes):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _apply_one(self, conn, item, pending: list):
+        """Run one write in a SAVEPOINT; return (ok, result or exception)."""
+        method, args, kwargs, _future = item
+        # commit() / rollback() inside the repository release / roll back the savepoint only
+        session = Session(bind=conn, join_transaction_mode="create_savepoint", info={DEFER_KEY: True})
+        try:
+            result = getattr(VehicleRepository(session, cache=self.cache), method)(*args, **kwargs)
+            pending.extend(take_pending(session))
+            return True, result
+        except Exception as exc:
+            return False, exc
+        finally:
+            session.close()
+
+
+class CoalescingRepository:
+    """The single-vehicle write methods of VehicleRepository, applied through a WriteCoalescer."""
+
+    def __init__(self, coalescer: WriteCoalescer):
+        self.coalescer = coalescer
+
+    def create(self, vehicle):
+        return self.coalescer.submit("create", vehicle)
+
+    def update(self, vin: str, update_data, if_versions=None):
+        return self.coalescer.submit("update", vin, update_data, if_versions=if_versions)
+
+    def patch(self, vin: str, patch, if_versions=None):
+        return self.coalescer.submit("patch", vin, patch, if_versions=if_versions)
+
+    def delete(self, vin: str, if_versions=None):
+        return self.coalescer.submit("delete", vin, if_versions=if_versions)
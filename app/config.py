@@ -0,0 +1,71 @@
+# Runtime configuration
+"""
+1. Reads every tunable setting from environment variables, with safe defaults.
+2. Imported by the other modules so configuration lives in one place.
+"""
+import os
+
+# SQLite database file used by the application
+DATABASE_URL = os.getenv("VEHICLE_DATABASE_URL", "sqlite:///./vehicles.db")
+
+# SQLite engine profile (see app/database.py)
+# "default": one engine, SQLite defaults (rollback journal)
+# "production": WAL + tuned pragmas, a read-only reader pool and a single writer connection
+DB_PROFILE = os.getenv("VEHICLE_DB_PROFILE", "default")
+DB_BUSY_TIMEOUT_MS = int(os.getenv("VEHICLE_DB_BUSY_TIMEOUT_MS", "5000"))
+DB_CACHE_SIZE_KB = int(os.getenv("VEHICLE_DB_CACHE_SIZE_KB", "65536"))
+DB_MMAP_SIZE = int(os.getenv("VEHICLE_DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+DB_READ_POOL_SIZE = int(os.getenv("VEHICLE_DB_READ_POOL_SIZE", "8"))
+DB_READ_POOL_OVERFLOW = int(os.getenv("VEHICLE_DB_READ_POOL_OVERFLOW", "32"))  # covers AnyIO's 40 threads
+
+# "sync": CRUD routes run on the threadpool with Session
+# "async": CRUD routes are async def and use AsyncSession
+API_MODE = os.getenv("VEHICLE_API_MODE", "sync")
+
+# Repository backend for reads: "sqlite" queries SQLite; "memory" serves lookups,
+# pages and counts from an in-memory copy kept in step with it (see app/memory.py)
+REPOSITORY = os.getenv("VEHICLE_REPOSITORY", "sqlite")
+MEMORY_POLL_INTERVAL = float(os.getenv("VEHICLE_MEMORY_POLL_INTERVAL", "1.0"))  # seconds between change-log polls
+
+# Per-VIN read cache (see app/cache.py)
+CACHE_SIZE = int(os.getenv("VEHICLE_CACHE_SIZE", "10000"))
+CACHE_TTL = float(os.getenv("VEHICLE_CACHE_TTL", "60"))
+CACHE_NEGATIVE_TTL = float(os.getenv("VEHICLE_CACHE_NEGATIVE_TTL", "5"))
+CACHE_INVALIDATION = os.getenv("VEHICLE_CACHE_INVALIDATION", "local")  # local | sqlite
+CACHE_POLL_INTERVAL = float(os.getenv("VEHICLE_CACHE_POLL_INTERVAL", "1.0"))
+
+# Serialized collection pages kept per table generation (see app/cache.py)
+PAGE_CACHE_SIZE = int(os.getenv("VEHICLE_PAGE_CACHE_SIZE", "256"))
+
+# Slow-statement log (see app/querylog.py); 0 disables it
+SLOW_QUERY_MS = float(os.getenv("VEHICLE_SLOW_QUERY_MS", "200"))
+SLOW_QUERY_WINDOW = float(os.getenv("VEHICLE_SLOW_QUERY_WINDOW", "300"))  # seconds kept for /debug/slow-queries
+SLOW_QUERY_PARAMS = os.getenv("VEHICLE_SLOW_QUERY_PARAMS", "redact")  # redact | full | none
+
+# Group commit for single-vehicle writes (see app/coalesce.py); off = one commit per request
+WRITE_COALESCE = os.getenv("VEHICLE_WRITE_COALESCE", "off") == "on"
+WRITE_COALESCE_WINDOW_MS = float(os.getenv("VEHICLE_WRITE_COALESCE_WINDOW_MS", "2"))
+WRITE_COALESCE_MAX_BATCH = int(os.getenv("VEHICLE_WRITE_COALESCE_MAX_BATCH", "64"))
+
+# Admission control per route (see app/admission.py); off = no limits
+ADMISSION = os.getenv("VEHICLE_ADMISSION", "off") == "on"
+ADMISSION_READ_LIMIT = int(os.getenv("VEHICLE_ADMISSION_READ_LIMIT", "16"))  # concurrent reads
+ADMISSION_WRITE_LIMIT = int(os.getenv("VEHICLE_ADMISSION_WRITE_LIMIT", "4"))  # concurrent writes
+ADMISSION_QUEUE_SIZE = int(os.getenv("VEHICLE_ADMISSION_QUEUE_SIZE", "64"))  # waiting requests per budget
+ADMISSION_MAX_WAIT_MS = float(os.getenv("VEHICLE_ADMISSION_MAX_WAIT_MS", "200"))  # queue-time deadline
+ADMISSION_RETRY_AFTER = int(os.getenv("VEHICLE_ADMISSION_RETRY_AFTER", "1"))  # seconds, sent with 503s
+# "METHOD /path=budget, ...": budget is read, write, none or a number (a limit of its own)
+ADMISSION_ROUTES = os.getenv("VEHICLE_ADMISSION_ROUTES", "")
+
+# Change log and feed (see app/changelog.py)
+CHANGELOG_MAX_ROWS = int(os.getenv("VEHICLE_CHANGELOG_MAX_ROWS", "1000000"))
+CHANGELOG_MAX_AGE = float(os.getenv("VEHICLE_CHANGELOG_MAX_AGE", str(7 * 24 * 3600)))  # seconds
+CHANGELOG_PRUNE_INTERVAL = float(os.getenv("VEHICLE_CHANGELOG_PRUNE_INTERVAL", "60"))
+CHANGELOG_BATCH_SIZE = int(os.getenv("VEHICLE_CHANGELOG_BATCH_SIZE", "500"))  # changes per feed message
+CHANGELOG_POLL_INTERVAL = float(os.getenv("VEHICLE_CHANGELOG_POLL_INTERVAL", "0.5"))
+CHANGELOG_HEARTBEAT = float(os.getenv("VEHICLE_CHANGELOG_HEARTBEAT", "15"))
+
+# Where background imports spool uploaded files
+IMPORT_DIR = os.getenv("VEHICLE_IMPORT_DIR", "./imports")
+# Seconds without progress after which another process may take over a running import
+IMPORT_LEASE_SECONDS = float(os.getenv("VEHICLE_IMPORT_LEASE_SECONDS", "60"))
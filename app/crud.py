@@ -3,11 +3,98 @@
 """
 1. Implements the VehicleRepository class for clean CRUD operations.
 2. Normalizes VIN (uppercase) before any DB interaction.
-3. Provides get(), list(), create(), update(), delete() methods.
+3. Provides get(), read(), lookup(), list(), page(), page_json(), search(), stats(), stream(), create(), create_many(), update(), patch(), delete() methods,
+   plus count(), update_where() and delete_where() for set-based writes by filter.
 4. Encapsulates all DB logic so routes stay clean and modular.
+5. Optionally serves read() from a VehicleCache and invalidates it on every write.
+   With VEHICLE_REPOSITORY=memory, lookups, pages and counts come from an
+   in-memory VehicleStore instead (app/memory.py); writes still go to SQLite.
+6. List and lookup reads also have an ORM-free path: Core column tuples serialized
+   straight to JSON bytes (row_json / page_json), skipping hydration and re-validation.
+7. Exposes row versions / the table generation for ETags; update() and delete()
+   accept the versions an If-Match header allows and raise PreconditionFailed otherwise.
+8. Reads the change log (changes(), change_bounds()) behind the change feed.
+9. delta() answers delta sync: vehicles written and VINs deleted after a cursor.
 """
+import base64
+import json
+
+from pydantic import ValidationError
+from pydantic_core import to_json
+from sqlalchemy import delete, func, insert, literal, null, select, text, tuple_, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-from . import models, schemas
+from . import memory, models, schemas, search, versioning
+from .cache import VehicleCache
+from .memory import VehicleStore
+
+# Core table for single-statement writes (no ORM unit of work or refresh)
+_vehicles = models.Vehicle.__table__
+
+# Columns exposed to API clients, in response order
+EXPORT_COLUMNS = ["vin", *schemas.VehicleBase.model_fields]
+
+# Columns of VehicleResponse, in its field order; read by the Core (ORM-free) path
+RESPONSE_COLUMNS = list(schemas.VehicleResponse.model_fields)
+_response_columns = [_vehicles.c[c] for c in RESPONSE_COLUMNS]
+
+# Rows fetched per round trip when streaming large result sets
+STREAM_CHUNK_SIZE = 1000
+
+# Values per IN (...) clause, well below SQLite's bound-parameter limit
+IN_CHUNK_SIZE = 500
+
+# Rows written per transaction by bulk updates / deletes, bounding how long
+# each one holds SQLite's write lock
+BULK_CHUNK_SIZE = 500
+
+
+def _chunks(items: list, size: int):
+    """Split a list into consecutive slices of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class PreconditionFailed(Exception):
+    """The vehicle exists but its version is not one the caller expected."""
+
+    def __init__(self, version: int):
+        super().__init__(f"Vehicle is at version {version}")
+        self.version = version
+
+
+class CursorExpired(Exception):
+    """A delta-sync cursor issued by another database instance; the client must resync."""
+
+
+def encode_cursor(vin: str, sort: str = "vin", key=None) -> str:
+    """Encode the sort key and VIN of a page's last row as an opaque, URL-safe cursor."""
+    raw = json.dumps({"s": sort, "k": key, "vin": vin}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str = "vin"):
+    """
+    Decode a cursor produced by encode_cursor() into (key, vin).
+    Raises ValueError if it is malformed or was issued for a different sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded))
+        if data["s"] != sort:
+            raise ValueError("cursor sort mismatch")
+        return data["k"], data["vin"]
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def row_json(row) -> bytes:
+    """
+    Serialize a RESPONSE_COLUMNS row as VehicleResponse JSON. Rows come from our own
+    typed columns, so they are trusted and not re-validated.
+    """
+    return to_json(row._asdict())
 
 
 class VehicleRepository:
@@ -16,8 +103,11 @@ class VehicleRepository:
     for Vehicle objects.
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: VehicleCache | None = None, store: VehicleStore | None = None):
         self.db = db  # database session
+        self.cache = cache  # optional read-through cache for read()
+        # In-memory copy serving lookups, pages and counts (VEHICLE_REPOSITORY=memory)
+        self.store = store if store is not None else memory.store_for(db)
 
     def _normalize_vin(self, vin: str) -> str:
         """Normalize VIN input for consistent DB lookups."""
@@ -26,61 +116,573 @@ class VehicleRepository:
     def get(self, vin: str):
         """Fetch a single vehicle by VIN."""
         norm_vin = self._normalize_vin(vin)
+        if self.store is not None:
+            return self._read_row(norm_vin)
         return (
             self.db.query(models.Vehicle)
             .filter(models.Vehicle.vin == norm_vin)
             .first()
         )
 
+    def read(self, vin: str):
+        """
+        Fetch a single vehicle as a read-only row of RESPONSE_COLUMNS (None if missing);
+        fields are attributes, as on VehicleResponse. Uses Core, not the ORM.
+        Goes through the cache when one is configured, including cached 404s.
+        """
+        norm_vin = self._normalize_vin(vin)
+        if self.cache is None:
+            return self._read_row(norm_vin)
+
+        self.cache.sync(self.db)
+        found, value, epoch = self.cache.lookup(norm_vin)
+        if found:
+            return value
+
+        value = self._read_row(norm_vin)
+        self.cache.store(norm_vin, value, epoch)
+        return value
+
+    def lookup(self, vins) -> tuple[list, list[str]]:
+        """
+        Fetch many vehicles as read() rows. VINs are normalized and de-duplicated;
+        returns (rows, missing VINs), both in first-requested order. Cached entries,
+        including cached 404s, are used first; the rest are read with chunked IN
+        queries (or from the in-memory store) and cached.
+        """
+        wanted = list(dict.fromkeys(self._normalize_vin(vin) for vin in vins))
+        found = {}  # vin → row, or None when known missing
+        epochs = {}  # vin → cache epoch of its miss
+        if self.cache is not None:
+            self.cache.sync(self.db)
+            for vin in wanted:
+                hit, value, epoch = self.cache.lookup(vin)
+                if hit:
+                    found[vin] = value
+                else:
+                    epochs[vin] = epoch
+
+        unread = [vin for vin in wanted if vin not in found]
+        if self.store is not None:
+            self.store.sync(self.db)
+            found.update((vin, self.store.get(vin)) for vin in unread)
+        else:
+            for chunk in _chunks(unread, IN_CHUNK_SIZE):
+                found.update(
+                    (row.vin, row)
+                    for row in self.db.execute(select(*_response_columns).where(_vehicles.c.vin.in_(chunk)))
+                )
+        for vin in unread:
+            value = found.setdefault(vin, None)
+            if self.cache is not None:
+                self.cache.store(vin, value, epochs[vin])
+
+        rows = [found[vin] for vin in wanted if found[vin] is not None]
+        return rows, [vin for vin in wanted if found[vin] is None]
+
+    def _read_row(self, vin: str):
+        if self.store is not None:
+            self.store.sync(self.db)
+            return self.store.get(vin)
+        return self.db.execute(select(*_response_columns).where(_vehicles.c.vin == vin)).first()
+
+    def version(self, vin: str) -> int | None:
+        """
+        Current version of a vehicle (None if missing) without loading the row;
+        answered from the cache when the vehicle is cached.
+        """
+        norm_vin = self._normalize_vin(vin)
+        if self.cache is not None:
+            self.cache.sync(self.db)
+            found, value, _ = self.cache.lookup(norm_vin)
+            if found:
+                return value.version if value else None
+
+        if self.store is not None:
+            value = self._read_row(norm_vin)
+            return value.version if value else None
+
+        return self.db.scalar(select(_vehicles.c.version).where(_vehicles.c.vin == norm_vin))
+
+    def generation(self) -> str:
+        """
+        Opaque token for the current state of the vehicles table: the database's
+        instance id plus its generation, which changes with every committed write.
+        """
+        g = models.TableGeneration
+        row = self.db.execute(select(g.instance, g.generation).where(g.name == "vehicles")).first()
+        return versioning.generation_token(*(row or (None, None)))
+
+    def changes(self, after: int, limit: int) -> list[dict]:
+        """Change log entries with seq > after, oldest first, at most `limit`."""
+        c = models.VehicleChange
+        rows = self.db.execute(
+            select(c.seq, c.vin, c.op, c.version, c.changes, c.at)
+            .where(c.seq > after).order_by(c.seq).limit(limit)
+        ).all()
+        self.db.rollback()  # long-lived feeds must not pin a read transaction between polls
+        return [{**row._asdict(), "changes": json.loads(row.changes) if row.changes else None} for row in rows]
+
+    def change_bounds(self) -> tuple[int, int]:
+        """(head, oldest): the last sequence ever written and the oldest one still retained."""
+        head, oldest = self.db.execute(text("""
+            SELECT coalesce((SELECT seq FROM sqlite_sequence WHERE name = 'vehicle_changes'), 0),
+                   (SELECT min(seq) FROM vehicle_changes)
+        """)).one()
+        self.db.rollback()
+        return head, oldest if oldest is not None else head + 1
+
+    def delta(self, cursor: str | None = None, limit: int = schemas.DEFAULT_PAGE_SIZE):
+        """
+        Vehicles written and VINs deleted after a delta-sync cursor (from the start
+        when None), oldest first, as (rows, deleted VINs, next cursor, has_more).
+        Raises ValueError for a malformed cursor and CursorExpired for one issued
+        by another database instance.
+        """
+        g = models.TableGeneration
+        # Read before the changes, so the page can only run ahead of the cursor
+        # returned with it; re-delivering an upsert or tombstone is harmless
+        state = self.db.execute(select(g.instance, g.generation).where(g.name == "vehicles")).first()
+        instance, generation = (state.instance, state.generation) if state else ("", 0)
+
+        seq, after_vin = 0, None
+        if cursor is not None:
+            key, after_vin = decode_cursor(cursor, "changes")
+            if not (isinstance(key, list) and len(key) == 2 and isinstance(key[1], int)):
+                raise ValueError("Invalid cursor")
+            if key[0] != instance:
+                raise CursorExpired("Cursor was issued by another database; resync from GET /vehicle")
+            seq = key[1]
+
+        caught_up = encode_cursor(None, "changes", [instance, generation])
+        if after_vin is None and seq >= generation:
+            return [], [], caught_up, False  # nothing written since: one primary-key probe
+
+        def after(table):
+            if after_vin is None:
+                return table.c.version > seq
+            return tuple_(table.c.version, table.c.vin) > tuple_(seq, after_vin)
+
+        t = models.VehicleTombstone.__table__
+        live = select(*_response_columns, literal(False).label("deleted")).where(after(_vehicles))
+        gone = select(
+            *[t.c[c] if c in ("vin", "version") else null().label(c) for c in RESPONSE_COLUMNS],
+            literal(True).label("deleted"),
+        ).where(after(t))
+        merged = union_all(live, gone).subquery()
+        rows = self.db.execute(
+            select(merged).order_by(merged.c.version, merged.c.vin).limit(limit + 1)
+        ).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].vin, "changes", [instance, rows[-1].version]) if has_more else caught_up
+        upserts = [row for row in rows if not row.deleted]
+        deleted = [row.vin for row in rows if row.deleted]
+        return upserts, deleted, next_cursor, has_more
+
+    def _invalidate(self, vins):
+        """Queue cache invalidation for VINs written in the current transaction."""
+        if self.cache is not None and vins:
+            self.cache.publish(self.db, vins)
+        if self.store is not None and vins:
+            self.store.publish(self.db, vins)
+
     def list(self):
         """Return all vehicles in the database."""
+        if self.store is not None:
+            self.store.sync(self.db)
+            return self.store.all()
         return self.db.query(models.Vehicle).all()
 
-    def create(self, vehicle: schemas.VehicleCreate):
-        """Insert a new vehicle if VIN does not already exist."""
-        norm_vin = self._normalize_vin(vehicle.vin)
+    def _conditions(self, filters: schemas.VehicleFilter | None = None):
+        """
+        Translate filters into SQL conditions usable by ORM and Core queries.
+        `<column>_min` / `<column>_max` become inclusive range bounds, anything else equality.
+        """
+        if filters is None:
+            return []
 
-        existing = self.get(vehicle.vin)
-        if existing:
-            return None  # main.py will raise the HTTP 400
+        conditions = []
+        for field, value in filters.model_dump(exclude_none=True).items():
+            if field.endswith("_min"):
+                conditions.append(getattr(models.Vehicle, field[:-4]) >= value)
+            elif field.endswith("_max"):
+                conditions.append(getattr(models.Vehicle, field[:-4]) <= value)
+            else:
+                conditions.append(getattr(models.Vehicle, field) == value)
+        return conditions
+
+    def _page(
+        self,
+        columns,
+        limit: int,
+        cursor: str | None,
+        filters: schemas.VehicleFilter | None,
+        sort: str,
+    ):
+        """Keyset page of `columns` (an ORM entity or Core columns) plus the next cursor."""
+        descending = sort.startswith("-")
+        column = getattr(models.Vehicle, sort.lstrip("-"))
+        keys = [models.Vehicle.vin] if sort == "vin" else [column, models.Vehicle.vin]
+
+        last = None
+        if cursor:
+            key, last_vin = decode_cursor(cursor, sort)
+            last = [last_vin] if sort == "vin" else [key, last_vin]
+
+        # Fetch one extra row to learn whether another page exists
+        if self.store is not None:
+            # Pages are cached under the generation ETag, so the store must be at least that current
+            self.store.sync(self.db, generation=self.generation())
+            after = None if last is None else (last[0] if sort == "vin" else last)
+            rows = self.store.scan(filters, sort, after, limit + 1)
+        else:
+            stmt = select(*columns).where(*self._conditions(filters))
+            if last is not None:
+                after = tuple_(*keys) < tuple_(*last) if descending else tuple_(*keys) > tuple_(*last)
+                stmt = stmt.where(after)
+            order = [k.desc() for k in keys] if descending else keys
+            result = self.db.execute(stmt.order_by(*order).limit(limit + 1))
+            rows = result.scalars().all() if len(columns) == 1 else result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_row = rows[-1]
+            key = None if sort == "vin" else getattr(last_row, column.key)
+            next_cursor = encode_cursor(last_row.vin, sort, key)
+        return rows, next_cursor
+
+    def page(
+        self,
+        limit: int = schemas.DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        filters: schemas.VehicleFilter | None = None,
+        sort: str = "vin",
+    ):
+        """
+        Return one page of matching vehicles and the cursor for the next one.
 
-        new_vehicle = models.Vehicle(
-            vin=norm_vin,
-            manufacturer_name=vehicle.manufacturer_name,
-            description=vehicle.description,
-            horse_power=vehicle.horse_power,
-            model_name=vehicle.model_name,
-            model_year=vehicle.model_year,
-            purchase_price=vehicle.purchase_price,
-            fuel_type=vehicle.fuel_type,
+        Rows are ordered by the sort column with VIN as tie-breaker, and pages
+        continue with a keyset condition ((sort_key, vin) > last row), so the cost
+        of a page does not grow with its position in the result.
+        """
+        return self._page([models.Vehicle], limit, cursor, filters, sort)
+
+    def page_json(
+        self,
+        limit: int = schemas.DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        filters: schemas.VehicleFilter | None = None,
+        sort: str = "vin",
+    ) -> bytes:
+        """
+        Same page as page(), already serialized as a VehiclePage JSON body.
+        Selects plain column tuples, so no ORM objects are built and nothing is re-validated.
+        """
+        rows, next_cursor = self._page(_response_columns, limit, cursor, filters, sort)
+        return to_json({"items": [row._asdict() for row in rows], "next_cursor": next_cursor})
+
+    def search(self, query: str, limit: int = schemas.DEFAULT_PAGE_SIZE, cursor: str | None = None):
+        """
+        Full-text search over description / model / manufacturer, best bm25 match first.
+        Every word is prefix-matched. Returns (rows, next_cursor); raises ValueError
+        for a query without searchable words or a malformed cursor.
+        """
+        match = search.match_expression(query)
+        if match is None:
+            raise ValueError("Empty search query")
+
+        # Ranking needs every match anyway, so pages continue by offset
+        offset = decode_cursor(cursor, "rank")[0] if cursor else 0
+        if type(offset) is not int or offset < 0:  # well-formed, but not one we issued
+            raise ValueError("Invalid cursor")
+        rows = self.db.scalars(
+            select(models.Vehicle).from_statement(text(search.SEARCH_SQL)),
+            {"match": match, "limit": limit + 1, "offset": offset},
+        ).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].vin, "rank", offset + limit)
+        return rows, next_cursor
+
+    def stats(self, group_by=(), filters: schemas.VehicleStatsFilter | None = None):
+        """
+        Fleet statistics grouped by any subset of (manufacturer_name, model_year, fuel_type).
+        Reads the vehicle_stats summary (kept current by triggers, see app/stats.py),
+        so the cost depends on the number of groups rather than the number of vehicles.
+        """
+        s = models.VehicleStats
+        dims = [getattr(s, d) for d in group_by]
+        conditions = [
+            getattr(s, field) == value
+            for field, value in (filters.model_dump(exclude_none=True) if filters else {}).items()
+        ]
+        count = func.sum(s.count)
+        stmt = (
+            select(
+                *dims,
+                count.label("count"),
+                func.sum(s.sum_price), func.min(s.min_price), func.max(s.max_price),
+                func.sum(s.sum_hp), func.min(s.min_hp), func.max(s.max_hp),
+            )
+            .where(*conditions)
+            .group_by(*dims)
+            .having(count > 0)
+            .order_by(*dims)
         )
 
-        self.db.add(new_vehicle)
+        groups = []
+        for row in self.db.execute(stmt):
+            n = row.count
+            price_sum, price_min, price_max, hp_sum, hp_min, hp_max = row[len(dims) + 1:]
+            groups.append({
+                **dict(zip(group_by, row[:len(dims)])),
+                "count": n,
+                "purchase_price": {"sum": price_sum, "avg": price_sum / n, "min": price_min, "max": price_max},
+                "horse_power": {"sum": hp_sum, "avg": hp_sum / n, "min": hp_min, "max": hp_max},
+            })
+        return groups
+
+    def stream(
+        self,
+        filters: schemas.VehicleFilter | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ):
+        """
+        Yield lists of plain row tuples (in EXPORT_COLUMNS order) for every matching vehicle.
+
+        Selects columns with Core rather than ORM entities, so rows never enter the
+        identity map, and fetches them chunk_size at a time from a streaming cursor.
+        Memory use therefore stays flat however many rows match.
+        """
+        stmt = (
+            select(*(getattr(models.Vehicle, c) for c in EXPORT_COLUMNS))
+            .where(*self._conditions(filters))
+            .order_by(models.Vehicle.vin)
+            .execution_options(stream_results=True, yield_per=chunk_size)
+        )
+        result = self.db.execute(stmt)
+        try:
+            for chunk in result.partitions():
+                yield chunk
+        finally:
+            result.close()
+
+    def create(self, vehicle: schemas.VehicleCreate):
+        """
+        Insert a new vehicle with a single INSERT.
+        Returns None if the VIN already exists (detected from the primary key).
+        """
+        values = {**vehicle.model_dump(), "vin": self._normalize_vin(vehicle.vin)}
+
+        try:
+            # The version default is evaluated by SQLite, so read it back in the same statement
+            values["version"] = self.db.scalar(insert(_vehicles).values(**values).returning(_vehicles.c.version))
+        except IntegrityError as exc:
+            self.db.rollback()
+            if "UNIQUE" not in str(exc.orig):
+                raise
+            return None  # main.py will raise the HTTP 400
+
+        self._invalidate([values["vin"]])  # drops a cached 404
         self.db.commit()
-        self.db.refresh(new_vehicle)
-        return new_vehicle
+        # Every column value is already known, so no refresh round trip is needed
+        return models.Vehicle(**values)
 
-    def update(self, vin: str, update_data: schemas.VehicleUpdate):
-        """Update fields of an existing vehicle."""
-        vehicle = self.get(vin)
-        if not vehicle:
-            return None
+    def _existing_vins(self, vins) -> set[str]:
+        """Return which of the given (normalized) VINs are already stored."""
+        found = set()
+        for chunk in _chunks(vins, IN_CHUNK_SIZE):
+            found.update(self.db.scalars(
+                select(models.Vehicle.vin).where(models.Vehicle.vin.in_(chunk))
+            ))
+        return found
+
+    def create_many(self, items, atomic: bool = False, commit: bool = True):
+        """
+        Validate and insert many vehicles in one transaction.
+
+        Returns one result dict per item, in input order, with status
+        created / duplicate / invalid / skipped. Existing VINs are found with
+        chunked IN queries and rows are written with a single multi-row
+        INSERT ... ON CONFLICT DO NOTHING, followed by one commit.
+        With atomic=True nothing is written unless every item can be created;
+        with commit=False the caller owns the transaction.
+        """
+        results = []
+        rows = {}  # normalized VIN → column values
+
+        for index, item in enumerate(items):
+            raw_vin = item.get("vin") if isinstance(item, dict) else getattr(item, "vin", None)
+            result = {"index": index, "vin": raw_vin if isinstance(raw_vin, str) else None}
+            results.append(result)
 
-        update_dict = update_data.model_dump()
+            try:
+                vehicle = schemas.VehicleCreate.model_validate(item)
+            except ValidationError as exc:
+                error = exc.errors()[0]
+                location = ".".join(str(part) for part in error["loc"])
+                result.update(status="invalid", detail=f"{location}: {error['msg']}")
+                continue
 
-        for field, value in update_dict.items():
-            setattr(vehicle, field, value)
+            norm_vin = self._normalize_vin(vehicle.vin)
+            result["vin"] = norm_vin
+            if not norm_vin:
+                result.update(status="invalid", detail="vin: must not be blank")
+            elif norm_vin in rows:
+                result.update(status="duplicate", detail="VIN repeated within batch")
+            else:
+                result["status"] = "created"
+                rows[norm_vin] = {**vehicle.model_dump(), "vin": norm_vin}
 
+        existing = self._existing_vins(list(rows))
+        for result in results:
+            if result["status"] == "created" and result["vin"] in existing:
+                result.update(status="duplicate", detail="VIN already exists")
+                del rows[result["vin"]]
+
+        if atomic and len(rows) < len(results):
+            return self._skip_created(results)
+
+        if rows:
+            stmt = (
+                sqlite_insert(models.Vehicle)
+                .on_conflict_do_nothing(index_elements=["vin"])
+                .returning(models.Vehicle.vin)
+            )
+            inserted = set(self.db.scalars(stmt, list(rows.values())))
+
+            # Rows inserted concurrently since the IN check lose the race
+            for result in results:
+                if result["status"] == "created" and result["vin"] not in inserted:
+                    result.update(status="duplicate", detail="VIN already exists")
+
+            if atomic and len(inserted) < len(results):
+                self.db.rollback()
+                return self._skip_created(results)
+
+            self._invalidate(sorted(inserted))
+
+            if commit:
+                self.db.commit()
+
+        return results
+
+    @staticmethod
+    def _skip_created(results):
+        """Downgrade 'created' results to 'skipped' after an all-or-nothing batch fails."""
+        for result in results:
+            if result["status"] == "created":
+                result.update(status="skipped", detail="Batch rejected")
+        return results
+
+    def _check_versions(self, vin: str, if_versions):
+        """After a conditional write matched nothing: raise if the row exists at another version."""
+        current = self.db.scalar(select(_vehicles.c.version).where(_vehicles.c.vin == vin))
+        self.db.rollback()
+        if current is not None:
+            raise PreconditionFailed(current)
+
+    def update(self, vin: str, update_data: schemas.VehicleUpdate, if_versions=None):
+        """
+        Update fields of an existing vehicle with a single UPDATE ... RETURNING.
+        Returns None if no row matched. With if_versions, only a row at one of
+        those versions is updated; PreconditionFailed is raised otherwise.
+        """
+        return self._update(vin, update_data.model_dump(), if_versions)
+
+    def patch(self, vin: str, patch: schemas.VehiclePatch, if_versions=None):
+        """
+        Like update(), but writes only the fields set on `patch`, so
+        untouched columns (and their indexes / triggers) are left alone.
+        """
+        return self._update(vin, patch.changes(), if_versions)
+
+    def _update(self, vin: str, values: dict, if_versions):
+        norm_vin = self._normalize_vin(vin)
+        stmt = update(_vehicles).where(_vehicles.c.vin == norm_vin)
+        if if_versions is not None:
+            stmt = stmt.where(_vehicles.c.version.in_(if_versions))
+        row = self.db.execute(
+            stmt.values(**values).returning(*_vehicles.c)
+        ).first()
+
+        if row is None:
+            if if_versions is not None:
+                self._check_versions(norm_vin, if_versions)
+            self.db.rollback()
+            return None
+
+        self._invalidate([norm_vin])
         self.db.commit()
-        self.db.refresh(vehicle)
-        return vehicle
+        return models.Vehicle(**row._mapping)
+
+    def delete(self, vin: str, if_versions=None):
+        """
+        Delete a vehicle by VIN with a single DELETE; None if no row matched.
+        if_versions works as in update().
+        """
+        norm_vin = self._normalize_vin(vin)
+        stmt = delete(_vehicles).where(_vehicles.c.vin == norm_vin)
+        if if_versions is not None:
+            stmt = stmt.where(_vehicles.c.version.in_(if_versions))
+        result = self.db.execute(stmt)
 
-    def delete(self, vin: str):
-        """Delete a vehicle by VIN."""
-        vehicle = self.get(vin)
-        if not vehicle:
+        if result.rowcount == 0:
+            if if_versions is not None:
+                self._check_versions(norm_vin, if_versions)
+            self.db.rollback()
             return None
 
-        self.db.delete(vehicle)
+        self._invalidate([norm_vin])
         self.db.commit()
-        return True
\ No newline at end of file
+        return True
+
+    def count(self, filters: schemas.VehicleFilter | None = None) -> int:
+        """Number of vehicles matching the filters."""
+        if self.store is not None:
+            self.store.sync(self.db)
+            return self.store.count(filters)
+        return self.db.scalar(select(func.count()).select_from(_vehicles).where(*self._conditions(filters)))
+
+    def update_where(self, filters: schemas.VehicleFilter, changes: dict, chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        """Apply the same column values to every matching vehicle; returns how many were updated."""
+        return self._write_where(lambda: update(_vehicles).values(**changes), filters, chunk_size)
+
+    def delete_where(self, filters: schemas.VehicleFilter, chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        """Delete every matching vehicle; returns how many were deleted."""
+        return self._write_where(lambda: delete(_vehicles), filters, chunk_size)
+
+    def _write_where(self, statement, filters, chunk_size: int) -> int:
+        """
+        Run a set-based UPDATE / DELETE over the matching rows, `chunk_size` VINs
+        per statement and transaction. Chunks walk the VIN order, so rows an
+        update moves out of (or into) the filter are never revisited.
+        Triggers keep the derived tables in step; the cache is invalidated per chunk.
+        """
+        conditions = self._conditions(filters)
+        total, after = 0, ""
+        while True:
+            chunk = (
+                select(_vehicles.c.vin)
+                .where(*conditions, _vehicles.c.vin > after)
+                .order_by(_vehicles.c.vin)
+                .limit(chunk_size)
+            )
+            vins = self.db.scalars(
+                statement().where(_vehicles.c.vin.in_(chunk)).returning(_vehicles.c.vin)
+            ).all()
+            if not vins:
+                self.db.rollback()
+                return total
+
+            self._invalidate(vins)
+            self.db.commit()
+            total += len(vins)
+            if len(vins) < chunk_size:
+                return total
+            after = max(vins)
@@ -4,35 +4,159 @@
 2. Creates a SessionLocal factory used to open/close DB sessions.
 3. Provides the get_db() dependency used in FastAPI routes.
 4. Defines Base = declarative_base() for SQLAlchemy models to inherit.
+5. Creates the matching aiosqlite engine / async session factory and
+   get_async_db() used when the API runs in async mode; they are built on
+   first use so sync deployments never import the async stack.
+6. With VEHICLE_DB_PROFILE=production, applies WAL and tuned pragmas on connect
+   and routes SELECTs to a read-only pool and writes to a single writer connection.
+7. Instruments every engine for /metrics (statement count / DB time per request,
+   pool checkout wait; see app/metrics.py) and for the slow-query log (app/querylog.py).
 """
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
-# SQLite database file used by the application
-DATABASE_URL = "sqlite:///./vehicles.db"
+from . import config, metrics, querylog
+from .config import DATABASE_URL
+
+# Same database, driven through aiosqlite for AsyncSession
+ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+# Session.info flag: the current transaction has written, keep it on the writer
+_WRITING = "routing_writer"
+
+
+def _production_pragmas(read_only: bool):
+    """Build a connect listener applying the production pragmas."""
+    def apply(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        if not read_only:
+            cursor.execute("PRAGMA journal_mode=WAL")  # persistent; readers no longer block on the writer
+        cursor.execute("PRAGMA synchronous=NORMAL")  # fsync at checkpoints, not every commit (safe with WAL)
+        cursor.execute(f"PRAGMA busy_timeout={config.DB_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA cache_size=-{config.DB_CACHE_SIZE_KB}")  # negative → KiB
+        cursor.execute(f"PRAGMA mmap_size={config.DB_MMAP_SIZE}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+    return apply
+
+
+def build_engines(url: str = DATABASE_URL, profile: str = config.DB_PROFILE):
+    """
+    Return (write_engine, read_engine) for a profile.
+    The default profile uses one engine for both.
+    """
+    connect_args = {"check_same_thread": False}
+    if profile != "production":
+        engine = create_engine(url, connect_args=connect_args)
+        return engine, engine
+
+    # One writer connection: SQLite allows a single writer anyway, and queuing in
+    # the pool is cheaper than spinning on SQLITE_BUSY
+    writer = create_engine(url, connect_args=connect_args, pool_size=1, max_overflow=0)
+    reader = create_engine(
+        url,
+        connect_args=connect_args,
+        pool_size=config.DB_READ_POOL_SIZE,
+        max_overflow=config.DB_READ_POOL_OVERFLOW,
+    )
+    event.listen(writer, "connect", _production_pragmas(read_only=False))
+    event.listen(reader, "connect", _production_pragmas(read_only=True))
+    return writer, reader
+
+
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to the reader pool and everything else
+    (flushes, INSERT/UPDATE/DELETE, raw text() statements, and any query
+    after a write in the same transaction) to the writer.
+    """
+
+    write_engine = None
+    read_engine = None
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        # text() can hide a write, so only real Select constructs may read
+        is_select = clause is not None and getattr(clause, "is_select", False)
+        if is_select and not self._flushing and not self.info.get(_WRITING):
+            return self.read_engine
+
+        self.info[_WRITING] = True
+        return self.write_engine
 
-# SQLAlchemy engine that manages the DB connection
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
+
+@event.listens_for(RoutingSession, "after_commit")
+@event.listens_for(RoutingSession, "after_rollback")
+def _reset_routing(session):
+    session.info.pop(_WRITING, None)
+
+
+def routing_sessionmaker(write_engine, read_engine, **kw):
+    """Session factory for a writer/reader engine pair."""
+    if write_engine is read_engine:
+        return sessionmaker(bind=write_engine, **kw)
+
+    session_class = type("BoundRoutingSession", (RoutingSession,), {
+        "write_engine": write_engine,
+        "read_engine": read_engine,
+    })
+    return sessionmaker(class_=session_class, **kw)
+
+
+# SQLAlchemy engines that manage the DB connections
+# (engine is the writer; read_engine is the same object in the default profile)
+engine, read_engine = build_engines()
+
+for _engine, _name in ((engine, "writer"), (read_engine, "reader")):
+    metrics.instrument_engine(_engine, _name)  # no-op for the reader when it is the writer
+    querylog.instrument_engine(_engine, _name)
 
 
 # Factory that creates database sessions
-SessionLocal = sessionmaker(
+SessionLocal = routing_sessionmaker(
+    engine,
+    read_engine,
     autocommit=False,
     autoflush=False,
-    bind=engine,
 )
 
+_async_session_factory = None
+
+
+def async_session_factory():
+    """Factory that creates async sessions (objects stay usable after commit), built on first use."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        # Deferred: sqlalchemy.ext.asyncio pulls in asyncio / aiosqlite machinery
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        async_engine = create_async_engine(ASYNC_DATABASE_URL)
+        if config.DB_PROFILE == "production":
+            event.listen(async_engine.sync_engine, "connect", _production_pragmas(read_only=False))
+        metrics.instrument_engine(async_engine.sync_engine, "async")
+        querylog.instrument_engine(async_engine.sync_engine, "async")
+        _async_session_factory = async_sessionmaker(
+            autoflush=False,
+            expire_on_commit=False,
+            bind=async_engine,
+        )
+    return _async_session_factory
+
 # Base class for all SQLAlchemy ORM models
 Base = declarative_base()
 
 
 # Dependency that provides a database session to FastAPI routes
 def get_db():
+    metrics.threadpool_started()  # first code of the request on a worker thread
     db = SessionLocal()
     try:
         yield db # Makes the session available inside the request
     finally:
         db.close() 
+
+
+# Dependency that provides an async database session to async routes
+async def get_async_db():
+    async with async_session_factory()() as db:
+        yield db
@@ -0,0 +1,58 @@
+# Streaming export encoders
+"""
+1. Turns chunks of row tuples from VehicleRepository.stream() into bytes.
+2. Supports NDJSON (one JSON object per line) and CSV (with header row).
+3. Optionally gzip-compresses the byte stream incrementally.
+4. Never materialises the full result set, so memory stays flat.
+"""
+import csv
+import io
+import json
+import zlib
+from typing import Iterable, Iterator, Sequence
+
+# Supported export formats → response media type
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def ndjson_chunks(columns: Sequence[str], chunks: Iterable[Sequence[tuple]]) -> Iterator[bytes]:
+    """Encode each chunk of rows as newline-delimited JSON objects."""
+    for rows in chunks:
+        lines = [json.dumps(dict(zip(columns, row))) for row in rows]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def csv_chunks(columns: Sequence[str], chunks: Iterable[Sequence[tuple]]) -> Iterator[bytes]:
+    """Encode rows as CSV, emitting the header row first."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    writer.writerow(columns)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():  # header only, no rows matched
+        yield buffer.getvalue().encode()
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compress a byte stream into a single gzip member, chunk by chunk."""
+    compressor = zlib.compressobj(wbits=31)  # 31 → gzip header/trailer
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def encode(fmt: str, columns: Sequence[str], chunks: Iterable[Sequence[tuple]], gzip: bool = False) -> Iterator[bytes]:
+    """Return the byte stream for the requested format, optionally gzipped."""
+    encoder = ndjson_chunks if fmt == "ndjson" else csv_chunks
+    stream = encoder(columns, chunks)
+    return gzip_chunks(stream) if gzip else stream
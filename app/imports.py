@@ -0,0 +1,395 @@
+# Background bulk imports
+"""
+1. Spools uploaded CSV / NDJSON bodies to disk without buffering them in memory.
+2. Parses the spooled file incrementally and validates rows against VehicleCreate.
+3. Writes rows through VehicleRepository.create_many() in chunked transactions,
+   committing the job's progress (byte offset + line) in the same transaction.
+4. Runs jobs on a single background worker thread; unfinished jobs resume from
+   their last committed chunk when resume_pending() is called at startup. The
+   spooled file is kept while a job may still resume and deleted once it
+   completes or fails.
+5. A worker claims a job atomically and holds it through a lease, renewed with
+   every committed chunk. With several processes sharing the database only the
+   claimant runs a job; another takes over only once the lease has lapsed.
+"""
+import csv
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from typing import AsyncIterator
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from . import config, models
+from .cache import vehicle_cache
+from .crud import VehicleRepository
+
+# Where uploads are spooled; one file per job
+IMPORT_DIR = config.IMPORT_DIR
+
+# Chunk size is tuned between these bounds to keep each commit near the target duration
+INITIAL_CHUNK_ROWS = 1000
+MIN_CHUNK_ROWS = 100
+MAX_CHUNK_ROWS = 10_000
+TARGET_CHUNK_SECONDS = 0.25
+
+# Rejected rows returned by the status endpoint (all are stored)
+MAX_REPORTED_REJECTS = 100
+
+# One worker: SQLite has a single writer, so parallel jobs would only contend
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vehicle-import")
+_futures: dict[str, Future] = {}  # submitted jobs until they finish
+
+# Seconds a claimed job stays reserved for its worker without a committed chunk
+LEASE_SECONDS = config.IMPORT_LEASE_SECONDS
+
+# This process as a job owner; unique across restarts and hosts
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaseLost(Exception):
+    """Another worker took the job over after this worker's lease lapsed."""
+
+
+async def spool(body: AsyncIterator[bytes], fmt: str):
+    """Write an upload stream to IMPORT_DIR; returns (job_id, path, size in bytes)."""
+    os.makedirs(IMPORT_DIR, exist_ok=True)
+    job_id = uuid.uuid4().hex
+    path = os.path.join(IMPORT_DIR, f"{job_id}.{fmt}")
+
+    size = 0
+    f = await run_in_threadpool(open, path, "wb")  # disk I/O stays off the event loop
+    try:
+        async for chunk in body:
+            await run_in_threadpool(f.write, chunk)
+            size += len(chunk)
+    finally:
+        await run_in_threadpool(f.close)
+    return job_id, path, size
+
+
+def discard(path: str):
+    """Delete a spooled upload (already gone is fine)."""
+    with suppress(FileNotFoundError):
+        os.remove(path)
+
+
+def start_job(db: Session, job_id: str, fmt: str, path: str, size: int):
+    """Record a queued job and hand it to the background worker."""
+    job = models.ImportJob(id=job_id, format=fmt, path=path, total_bytes=size, status="queued")
+    db.add(job)
+    db.commit()
+
+    submit(sessionmaker(bind=db.get_bind(), autoflush=False), job_id)
+    return job
+
+
+def submit(session_factory, job_id: str) -> Future:
+    """Queue a job on the worker thread."""
+    future = _executor.submit(run_job, session_factory, job_id)
+    _futures[job_id] = future
+
+    def forget(done: Future):
+        if _futures.get(job_id) is done:
+            del _futures[job_id]
+
+    future.add_done_callback(forget)
+    return future
+
+
+def wait(job_id: str, timeout: float | None = None):
+    """Block until a submitted job finishes (used by tools and tests)."""
+    future = _futures.get(job_id)
+    if future is not None:
+        future.result(timeout=timeout)
+
+
+def resume_pending(session_factory):
+    """
+    Resubmit jobs left queued or running by a previous process. Each is claimed
+    before it runs, so a job another live process is running is left to it.
+    """
+    db = session_factory()
+    try:
+        pending = (
+            db.query(models.ImportJob.id)
+            .filter(models.ImportJob.status.in_(["queued", "running"]))
+            .all()
+        )
+    finally:
+        db.close()
+
+    for (job_id,) in pending:
+        submit(session_factory, job_id)
+
+
+def claim(db: Session, job_id: str) -> bool:
+    """Atomically take a job that is queued, or running under a lapsed lease; True if taken."""
+    now = time.time()
+    job = models.ImportJob
+    result = db.execute(
+        update(job)
+        .where(
+            job.id == job_id,
+            or_(
+                job.status == "queued",
+                and_(job.status == "running", or_(job.lease_expires_at.is_(None), job.lease_expires_at < now)),
+            ),
+        )
+        .values(status="running", owner=WORKER_ID, lease_expires_at=now + LEASE_SECONDS)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def _renew_lease(db: Session, job_id: str):
+    """Extend this worker's lease inside the chunk's transaction; raises LeaseLost if it was taken over."""
+    job = models.ImportJob
+    result = db.execute(
+        update(job)
+        .where(job.id == job_id, job.owner == WORKER_ID)
+        .values(lease_expires_at=time.time() + LEASE_SECONDS)
+    )
+    if result.rowcount != 1:
+        raise LeaseLost(job_id)
+
+
+def _retry_after_lease(session_factory, job: models.ImportJob):
+    """Resubmit a job held by another worker once its lease lapses, in case that worker died."""
+    delay = max(job.lease_expires_at - time.time(), 0) + 1
+    timer = threading.Timer(delay, submit, (session_factory, job.id))
+    timer.daemon = True
+    timer.start()
+
+
+def _decode(raw: bytes, encoding: str = "utf-8") -> tuple[str, str | None]:
+    """(text, None), or (text with replacement characters, reject message) if `raw` is not valid UTF-8."""
+    try:
+        return raw.decode(encoding), None
+    except UnicodeDecodeError as exc:
+        return raw.decode(encoding, errors="replace"), f"invalid UTF-8: {exc.reason} at byte {exc.start}"
+
+
+def _lines(f, position: dict):
+    """
+    Yield decoded lines, recording the byte offset and line number after each.
+    A line that is not valid UTF-8 is yielded empty, with (line, message) appended
+    to position["undecodable"], so the caller can reject it and go on.
+    """
+    while True:
+        raw = f.readline()
+        if not raw:
+            return
+        position["offset"] = f.tell()
+        position["line"] += 1
+        text, error = _decode(raw)
+        if error is not None:
+            position["undecodable"].append((position["line"], error))
+            text = "\n"
+        yield text
+
+
+def _records(f, job: models.ImportJob):
+    """
+    Yield (line, offset, end_line, data, error) for each record after the resume point.
+
+    `line` is where the record starts, `offset` / `end_line` where it ends;
+    exactly one of `data` (a dict) and `error` (a message) is set.
+    """
+    position = {"offset": job.committed_offset, "line": job.committed_line, "undecodable": []}
+
+    def undecodable():
+        """Rejects for the lines that failed to decode while reading the last record."""
+        rejects, position["undecodable"] = position["undecodable"], []
+        return [(line, position["offset"], position["line"], None, error) for line, error in rejects]
+
+    if job.format == "ndjson":
+        f.seek(job.committed_offset)
+        for text in _lines(f, position):
+            yield from undecodable()
+            if not text.strip():
+                continue
+            line = position["line"]
+            try:
+                data = json.loads(text)
+            except ValueError as exc:
+                yield line, position["offset"], line, None, f"invalid JSON: {exc}"
+                continue
+            if not isinstance(data, dict):
+                yield line, position["offset"], line, None, "expected a JSON object"
+                continue
+            yield line, position["offset"], line, data, None
+        return
+
+    # CSV: the header is always read from the top, then parsing continues at the resume point
+    f.seek(0)
+    text, header_error = _decode(f.readline(), "utf-8-sig")
+    header = next(csv.reader([text]), [])
+    if job.committed_offset:
+        f.seek(job.committed_offset)
+    else:
+        position.update(offset=f.tell(), line=1)
+        if header_error is not None:  # reported once; columns with intact names still import
+            yield 1, position["offset"], 1, None, f"header: {header_error}"
+
+    reader = csv.reader(_lines(f, position))
+    while True:
+        line = position["line"] + 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            yield line, position["offset"], position["line"], None, f"invalid CSV: {exc}"
+            continue
+        rejects = undecodable()
+        if rejects:  # the row is the undecodable line itself, or a record spanning it
+            yield from rejects
+            continue
+        if not row:
+            continue
+        if len(row) != len(header):
+            error = f"expected {len(header)} fields, got {len(row)}"
+            yield line, position["offset"], position["line"], None, error
+            continue
+        data = {key: (value if value != "" else None) for key, value in zip(header, row)}
+        yield line, position["offset"], position["line"], data, None
+
+
+def _commit_chunk(db: Session, job: models.ImportJob, batch: list, offset: int, end_line: int) -> float:
+    """Insert one chunk, record rejects and progress, and commit; returns elapsed seconds."""
+    started = time.perf_counter()
+
+    valid = [(line, data) for line, data, _ in batch if data is not None]
+    rejects = [
+        models.ImportReject(job_id=job.id, line=line, detail=error)
+        for line, _, error in batch if error is not None
+    ]
+
+    created = 0
+    results = VehicleRepository(db, cache=vehicle_cache).create_many([data for _, data in valid], commit=False)
+    for (line, _), result in zip(valid, results):
+        if result["status"] == "created":
+            created += 1
+        else:
+            rejects.append(models.ImportReject(
+                job_id=job.id, line=line, vin=result["vin"], detail=result["detail"],
+            ))
+
+    _renew_lease(db, job.id)
+    db.add_all(sorted(rejects, key=lambda r: r.line))
+    job.rows_processed += len(batch)
+    job.rows_created += created
+    job.rows_rejected += len(rejects)
+    job.committed_offset = offset
+    job.committed_line = end_line
+    db.commit()
+
+    return time.perf_counter() - started
+
+
+def _tune(chunk_rows: int, elapsed: float) -> int:
+    """Grow or shrink the chunk so that commits stay close to TARGET_CHUNK_SECONDS."""
+    if elapsed < TARGET_CHUNK_SECONDS / 2:
+        return min(chunk_rows * 2, MAX_CHUNK_ROWS)
+    if elapsed > TARGET_CHUNK_SECONDS * 2:
+        return max(chunk_rows // 2, MIN_CHUNK_ROWS)
+    return chunk_rows
+
+
+def run_job(session_factory, job_id: str):
+    """Process a job from its last committed chunk to the end of the file."""
+    db = session_factory()
+    try:
+        if not claim(db, job_id):
+            job = db.get(models.ImportJob, job_id)
+            if job is not None and job.status == "running":
+                _retry_after_lease(session_factory, job)
+            return
+
+        job = db.get(models.ImportJob, job_id)
+        job.error = None
+        job.run_started_at = time.time()
+        job.run_start_offset = job.committed_offset
+        job.run_start_rows = job.rows_processed
+        db.commit()
+
+        chunk_rows = INITIAL_CHUNK_ROWS
+        batch = []
+        with open(job.path, "rb") as f:
+            for line, offset, end_line, data, error in _records(f, job):
+                batch.append((line, data, error))
+                if len(batch) >= chunk_rows:
+                    elapsed = _commit_chunk(db, job, batch, offset, end_line)
+                    chunk_rows = _tune(chunk_rows, elapsed)
+                    batch = []
+            if batch:
+                _commit_chunk(db, job, batch, offset, end_line)
+
+        _renew_lease(db, job.id)
+        job.status = "completed"
+        job.finished_at = time.time()
+        db.commit()
+        discard(job.path)
+    except LeaseLost:  # the job is another worker's now; its progress stands
+        db.rollback()
+    except Exception as exc:  # keep the job inspectable instead of dying silently
+        db.rollback()
+        job = db.get(models.ImportJob, job_id)
+        if job is not None and job.owner == WORKER_ID:
+            job.status = "failed"
+            job.error = str(exc)
+            job.finished_at = time.time()
+            db.commit()
+            discard(job.path)
+    finally:
+        db.close()
+
+
+def status(db: Session, job_id: str):
+    """Build the status report for a job, or return None if it does not exist."""
+    job = db.get(models.ImportJob, job_id)
+    if job is None:
+        return None
+
+    rejects = (
+        db.query(models.ImportReject)
+        .filter(models.ImportReject.job_id == job_id)
+        .order_by(models.ImportReject.id)
+        .limit(MAX_REPORTED_REJECTS)
+        .all()
+    )
+
+    done = job.status == "completed"
+    rows_per_sec = eta_seconds = None
+    if job.run_started_at:
+        elapsed = (job.finished_at or time.time()) - job.run_started_at
+        if elapsed > 0:
+            rows_per_sec = (job.rows_processed - job.run_start_rows) / elapsed
+            bytes_per_sec = (job.committed_offset - job.run_start_offset) / elapsed
+            if done:
+                eta_seconds = 0.0
+            elif job.status == "running" and bytes_per_sec > 0:
+                eta_seconds = (job.total_bytes - job.committed_offset) / bytes_per_sec
+
+    return {
+        "id": job.id,
+        "status": job.status,
+        "format": job.format,
+        "rows_processed": job.rows_processed,
+        "rows_created": job.rows_created,
+        "rows_rejected": job.rows_rejected,
+        "bytes_processed": job.total_bytes if done else job.committed_offset,
+        "total_bytes": job.total_bytes,
+        "rows_per_sec": rows_per_sec,
+        "eta_seconds": eta_seconds,
+        "error": job.error,
+        "rejects": [{"line": r.line, "vin": r.vin, "detail": r.detail} for r in rejects],
+    }
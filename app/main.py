@@ -1,76 +1,461 @@
 # FastAPI application
 """
-1. Defines all HTTP routes (POST, GET, PUT, DELETE) for the /vehicle API.
+1. Defines all HTTP routes (POST, GET, PUT, PATCH, DELETE) for the /vehicle API.
 2. Injects a database session using Depends(get_db) on every request.
+   With VEHICLE_API_MODE=async the core CRUD routes come from app/async_api.py instead.
 3. Uses VehicleRepository to perform business logic and DB operations.
-4. Raises appropriate HTTP errors (400, 404) using HTTPException.
+4. Raises appropriate HTTP errors (400, 404, 409, 410, 412) using HTTPException
+   (410 when a sync or feed position is gone); with VEHICLE_ADMISSION=on,
+   overloaded routes shed requests with 503 (app/admission.py).
+   Single vehicles and pages carry ETags and honour If-None-Match / If-Match (app/versioning.py).
 5. Controls the flow of request → validation → business logic → response.
+6. Records per-route request, SQL and threadpool metrics, served on GET /metrics;
+   slow statements are logged and summarized on GET /debug/slow-queries.
+7. Importing the module touches no database: the lifespan applies pending schema
+   migrations (app/migrations.py, a single version check once up to date) before
+   the first request is served.
+8. With VEHICLE_WRITE_COALESCE=on, single-vehicle writes are group-committed
+   through app/coalesce.py; each request still gets its own result.
 """
 
-from fastapi import FastAPI, Depends, HTTPException
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import Literal, Optional
+
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, Query, Request, WebSocket
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 
-from .database import engine, get_db
-from . import models, schemas, crud
-from .crud import VehicleRepository
+from .database import engine, get_db, SessionLocal
+from . import schemas, crud, admission, changelog, coalesce, export, imports, config, memory, metrics, migrations, querylog, versioning
+from .cache import page_cache, vehicle_cache
+from .crud import PreconditionFailed, VehicleRepository
+
+# Group commit for the single-vehicle write routes (VEHICLE_WRITE_COALESCE=on)
+write_coalescer = coalesce.WriteCoalescer(
+    engine,
+    cache=vehicle_cache,
+    window=config.WRITE_COALESCE_WINDOW_MS / 1000,
+    max_batch=config.WRITE_COALESCE_MAX_BATCH,
+) if config.WRITE_COALESCE else None
+
+
+def write_repository(db: Session):
+    """Repository for a single-vehicle write: queued for group commit when enabled."""
+    if write_coalescer is not None:
+        return coalesce.CoalescingRepository(write_coalescer)
+    return VehicleRepository(db, cache=vehicle_cache)
+
 
-# Create all database tables at startup
-models.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Bring the schema up to date, resume import jobs interrupted by a previous
+    shutdown, load the in-memory store (VEHICLE_REPOSITORY=memory) and start
+    pruning the change log.
+    """
+    migrations.run(engine)
+    imports.resume_pending(SessionLocal)
+    memory.preload(SessionLocal)
+    retention = asyncio.create_task(changelog.retention_loop(SessionLocal))
+    yield
+    retention.cancel()
+    with suppress(asyncio.CancelledError):
+        await retention
+    if write_coalescer is not None:
+        write_coalescer.close()  # commit writes still queued
 
-app = FastAPI()
 
-@app.post("/vehicle", response_model=schemas.VehicleResponse, status_code=201)
-def create_vehicle(vehicle: schemas.VehicleCreate, db: Session = Depends(get_db)):
+# Admission first, so time spent queued for a budget is not counted as threadpool wait
+app = FastAPI(lifespan=lifespan, dependencies=[Depends(admission.admit), Depends(metrics.mark_dispatch)])
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Core CRUD routes (sync); registered after the fixed /vehicle/... paths below
+router = APIRouter()
+
+@router.post("/vehicle", response_model=schemas.VehicleResponse, status_code=201)
+def create_vehicle(vehicle: schemas.VehicleCreate, response: Response, db: Session = Depends(get_db)):
     """Create a new vehicle if VIN does not already exist."""
-    repo = VehicleRepository(db)
+    repo = write_repository(db)
+    created = repo.create(vehicle)
 
-    if repo.get(vehicle.vin):  # check VIN uniqueness
+    if created is None:  # VIN uniqueness enforced by the primary key
         raise HTTPException(
             status_code=400,
             detail=f"Vehicle with VIN {vehicle.vin.upper()} already exists."
         )
 
-    return repo.create(vehicle)
+    response.headers["ETag"] = versioning.vehicle_etag(created.version)
+    return created
+
+
+@app.post("/vehicle/batch", response_model=schemas.VehicleBatchResult, status_code=201)
+def create_vehicles_batch(batch: schemas.VehicleBatchCreate, db: Session = Depends(get_db)):
+    """Create many vehicles in one transaction and report the outcome per item."""
+    repo = VehicleRepository(db, cache=vehicle_cache)
+    atomic = batch.mode == "all_or_nothing"
+    results = repo.create_many(batch.items, atomic=atomic)
+    created = sum(1 for r in results if r["status"] == "created")
+
+    if atomic and created < len(results):  # nothing was written
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "Batch rejected; no vehicles were created.", "results": results},
+        )
+
+    return {"created": created, "results": results}
+
+
+@app.post("/vehicle/lookup", response_model=schemas.VehicleLookupResult)
+def lookup_vehicles(lookup: schemas.VehicleLookup, db: Session = Depends(get_db)):
+    """Fetch many vehicles by VIN in one request; VINs not found are listed under `missing`."""
+    repo = VehicleRepository(db, cache=vehicle_cache)
+    rows, missing = repo.lookup(lookup.vins)
+    return {"items": [row._asdict() for row in rows], "missing": missing}
+
+
+@app.post("/vehicle/bulk-update", response_model=schemas.VehicleBulkResult)
+def bulk_update_vehicles(bulk: schemas.VehicleBulkUpdate, db: Session = Depends(get_db)):
+    """Apply the same changes to every vehicle matching the filter (chunked; not atomic as a whole)."""
+    repo = VehicleRepository(db, cache=vehicle_cache)
+    if bulk.dry_run:
+        return {"dry_run": True, "matched": repo.count(bulk.filter), "affected": 0}
+
+    updated = repo.update_where(bulk.filter, bulk.changes.changes())
+    return {"dry_run": False, "matched": updated, "affected": updated}
+
+
+@app.post("/vehicle/bulk-delete", response_model=schemas.VehicleBulkResult)
+def bulk_delete_vehicles(bulk: schemas.VehicleBulkDelete, db: Session = Depends(get_db)):
+    """Delete every vehicle matching the filter (chunked; not atomic as a whole)."""
+    repo = VehicleRepository(db, cache=vehicle_cache)
+    if bulk.dry_run:
+        return {"dry_run": True, "matched": repo.count(bulk.filter), "affected": 0}
+
+    deleted = repo.delete_where(bulk.filter)
+    return {"dry_run": False, "matched": deleted, "affected": deleted}
+
+
+@app.post("/vehicle/import", response_model=schemas.ImportJobStatus, status_code=202)
+async def import_vehicles(
+    request: Request,
+    format: Literal["csv", "ndjson"] = "csv",
+    db: Session = Depends(get_db),
+):
+    """
+    Accept a raw CSV / NDJSON request body and import it in the background.
+    Returns immediately with the job id; poll GET /vehicle/import/{job_id} for progress.
+    """
+    job_id, path, size = await imports.spool(request.stream(), format)
+    if size == 0:
+        await run_in_threadpool(imports.discard, path)
+        raise HTTPException(status_code=400, detail="Empty upload")
+
+    await run_in_threadpool(imports.start_job, db, job_id, format, path, size)
+    return await run_in_threadpool(imports.status, db, job_id)
+
+
+@app.get("/vehicle/import/{job_id}", response_model=schemas.ImportJobStatus)
+def get_import_job(job_id: str, db: Session = Depends(get_db)):
+    """Report progress, throughput, ETA and rejected rows of an import job."""
+    report = imports.status(db, job_id)
+
+    if report is None:  # handle unknown job
+        raise HTTPException(status_code=404, detail="Import job not found")
+
+    return report
+
+
+@router.get("/vehicle", response_model=schemas.VehiclePage)
+def get_all_vehicles(
+    request: Request,
+    filters: schemas.VehicleFilter = Depends(),
+    limit: int = Query(schemas.DEFAULT_PAGE_SIZE, ge=1, le=schemas.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: schemas.VehicleSort = "vin",
+    db: Session = Depends(get_db),
+):
+    """
+    Retrieve one page of vehicles, optionally filtered and sorted (VIN order by default).
+    The ETag is the table generation: If-None-Match is answered without running the page
+    query, and serialized pages are reused until the next write.
+    """
+    repo = VehicleRepository(db, cache=vehicle_cache)
+    # Read the generation before the page, so a cached page is never older than its key
+    etag = versioning.collection_etag(repo.generation())
+    if versioning.none_match(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    key = (etag, limit, cursor, sort, tuple(filters.model_dump(exclude_none=True).items()))
+    body = page_cache.get(key)
+    if body is None:
+        try:
+            body = repo.page_json(limit=limit, cursor=cursor, filters=filters, sort=sort)
+        except ValueError:  # malformed cursor
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        page_cache.put(key, body)
+
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+@app.get("/vehicle/export")
+def export_vehicles(
+    filters: schemas.VehicleFilter = Depends(),
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    db: Session = Depends(get_db),
+):
+    """Stream every matching vehicle as NDJSON or CSV without buffering the table."""
+    repo = VehicleRepository(db, cache=vehicle_cache)
+    body = export.encode(format, crud.EXPORT_COLUMNS, repo.stream(filters), gzip=gzip)
+
+    headers = {"Content-Disposition": f'attachment; filename="vehicles.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(body, media_type=export.MEDIA_TYPES[format], headers=headers)
+
+
+@app.get("/vehicle/search", response_model=schemas.VehiclePage)
+def search_vehicles(
+    q: str = Query(..., min_length=1, description="Free text; every word is prefix-matched"),
+    limit: int = Query(schemas.DEFAULT_PAGE_SIZE, ge=1, le=schemas.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Full-text search over description, model and manufacturer, best matches first."""
+    repo = VehicleRepository(db, cache=vehicle_cache)
 
+    try:
+        items, next_cursor = repo.search(q, limit=limit, cursor=cursor)
+    except ValueError as exc:  # no searchable words / malformed cursor
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@app.get("/vehicle/stats", response_model=schemas.VehicleStatsResponse)
+def get_vehicle_stats(
+    group_by: list[schemas.StatsDimension] = Query([]),
+    filters: schemas.VehicleStatsFilter = Depends(),
+    db: Session = Depends(get_db),
+):
+    """Fleet count and purchase_price / horse_power aggregates, grouped by the given dimensions."""
+    repo = VehicleRepository(db, cache=vehicle_cache)
+    group_by = list(dict.fromkeys(group_by))  # ignore repeated dimensions
+    return {"group_by": group_by, "groups": repo.stats(group_by, filters)}
+
+
+@app.get("/vehicle/changes", response_model=schemas.VehicleDelta)
+def get_vehicle_changes(
+    since: Optional[str] = Query(None, description="next_cursor of the previous sync; omit for a full sync"),
+    limit: int = Query(schemas.DEFAULT_PAGE_SIZE, ge=1, le=schemas.MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    """
+    Delta sync: vehicles written and VINs deleted since the cursor, oldest first.
+    Page while has_more is true; then keep next_cursor for the next sync.
+    410 if the cursor belongs to another database: reload with a full sync.
+    """
+    repo = VehicleRepository(db)
+    try:
+        items, deleted, next_cursor, has_more = repo.delta(since, limit)
+    except crud.CursorExpired as exc:
+        raise HTTPException(status_code=410, detail=str(exc))
+    except ValueError:  # malformed cursor
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {
+        "items": [row._asdict() for row in items],
+        "deleted": deleted,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
+
+
+@app.get("/vehicle/feed")
+async def vehicle_feed(
+    request: Request,
+    after: Optional[int] = Query(None, ge=0, description="Resume after this sequence; default: from now on"),
+    follow: bool = Query(True, description="Keep the stream open for new changes"),
+    db: Session = Depends(get_db),
+):
+    """
+    Server-Sent Events stream of change-log batches. Event ids are sequences,
+    so reconnecting EventSource clients resume through Last-Event-ID.
+    410 if the resume point was pruned: reload with GET /vehicle, then follow from now.
+    """
+    last_event_id = request.headers.get("last-event-id", "")
+    if after is None and last_event_id.isdigit():
+        after = int(last_event_id)
 
-@app.get("/vehicle", response_model=list[schemas.VehicleResponse])
-def get_all_vehicles(db: Session = Depends(get_db)):
-    """Retrieve all vehicles in the database."""
     repo = VehicleRepository(db)
-    return repo.list()
+    try:
+        position = await run_in_threadpool(changelog.resume_position, repo, after)
+    except changelog.ResyncRequired as exc:
+        raise HTTPException(status_code=410, detail=str(exc))
 
+    return StreamingResponse(
+        changelog.sse_events(changelog.batches(repo, position, follow)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-@app.get("/vehicle/{vin}", response_model=schemas.VehicleResponse)
-def get_vehicle(vin: str, db: Session = Depends(get_db)):
-    """Retrieve a single vehicle by VIN."""
+
+@app.websocket("/vehicle/feed/ws")
+async def vehicle_feed_ws(
+    websocket: WebSocket,
+    after: Optional[int] = Query(None, ge=0),
+    follow: bool = True,
+    db: Session = Depends(get_db),
+):
+    """The change feed over a WebSocket: one JSON text message per batch."""
+    await websocket.accept()
     repo = VehicleRepository(db)
-    vehicle = repo.get(vin)
+    try:
+        position = await run_in_threadpool(changelog.resume_position, repo, after)
+    except changelog.ResyncRequired as exc:
+        await websocket.close(code=changelog.RESYNC_CLOSE_CODE, reason=str(exc)[:120])
+        return
+
+    await changelog.websocket_feed(websocket, changelog.batches(repo, position, follow))
+
+
+@app.get("/vehicle/cache/stats")
+def get_cache_stats():
+    """Expose hit / miss / eviction counters of the per-VIN cache."""
+    return vehicle_cache.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Request, SQL, pool and threadpool metrics in Prometheus text format."""
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/debug/slow-queries", include_in_schema=False)
+def get_slow_queries(
+    limit: int = Query(10, ge=1, le=100),
+    window: Optional[float] = Query(None, gt=0, description="Seconds to look back (capped at the retention window)"),
+):
+    """Slowest normalized SQL statements over a rolling window, by total time."""
+    return {
+        "threshold_ms": querylog.slow_log.threshold_ms,
+        "window_seconds": min(window or querylog.slow_log.window, querylog.slow_log.window),
+        "statements": querylog.slow_log.top(limit, window),
+    }
+
+
+@router.get("/vehicle/{vin}", response_model=schemas.VehicleResponse)
+def get_vehicle(vin: str, request: Request, db: Session = Depends(get_db)):
+    """Retrieve a single vehicle by VIN; If-None-Match is answered from its version alone."""
+    repo = VehicleRepository(db, cache=vehicle_cache)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        version = repo.version(vin)
+        if version is not None and versioning.none_match(if_none_match, versioning.vehicle_etag(version)):
+            return Response(status_code=304, headers={"ETag": versioning.vehicle_etag(version)})
+
+    vehicle = repo.read(vin)  # served from the per-VIN cache when warm
 
     if not vehicle:  # handle not found
         raise HTTPException(status_code=404, detail="Vehicle not found")
 
-    return vehicle
+    # Trusted Core row → JSON bytes; response_model still documents the shape
+    return Response(
+        crud.row_json(vehicle),
+        media_type="application/json",
+        headers={"ETag": versioning.vehicle_etag(vehicle.version)},
+    )
 
 
-@app.put("/vehicle/{vin}", response_model=schemas.VehicleResponse)
-def update_vehicle(vin: str, updates: schemas.VehicleUpdate, db: Session = Depends(get_db)):
-    """Update an existing vehicle using its VIN."""
-    repo = VehicleRepository(db)
-    updated = repo.update(vin, updates)
+@router.put("/vehicle/{vin}", response_model=schemas.VehicleResponse)
+def update_vehicle(
+    vin: str,
+    updates: schemas.VehicleUpdate,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    """Update an existing vehicle using its VIN; honours If-Match."""
+    repo = write_repository(db)
+    if_versions = versioning.if_match_versions(request.headers.get("if-match"))
+
+    try:
+        updated = repo.update(vin, updates, if_versions=if_versions)
+    except PreconditionFailed as exc:  # changed since the client read it
+        raise HTTPException(
+            status_code=412,
+            detail="Vehicle has been modified",
+            headers={"ETag": versioning.vehicle_etag(exc.version)},
+        )
 
     if not updated:  # handle nonexistent VIN
         raise HTTPException(status_code=404, detail="Vehicle not found")
 
+    response.headers["ETag"] = versioning.vehicle_etag(updated.version)
     return updated
 
 
-@app.delete("/vehicle/{vin}", status_code=204)
-def delete_vehicle(vin: str, db: Session = Depends(get_db)):
-    """Delete a vehicle by VIN."""
-    repo = VehicleRepository(db)
-    deleted = repo.delete(vin)
+@router.patch("/vehicle/{vin}", response_model=schemas.VehicleResponse)
+def patch_vehicle(
+    vin: str,
+    patch: schemas.VehiclePatch,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    """
+    Change only the fields sent. A `version` in the body makes the write
+    conditional (409 if the vehicle has changed); otherwise If-Match is honoured (412).
+    """
+    repo = write_repository(db)
+    if patch.version is not None:
+        if_versions, status_code = [patch.version], 409
+    else:
+        if_versions, status_code = versioning.if_match_versions(request.headers.get("if-match")), 412
+
+    try:
+        updated = repo.patch(vin, patch, if_versions=if_versions)
+    except PreconditionFailed as exc:  # another writer got there first
+        raise HTTPException(
+            status_code=status_code,
+            detail={"message": "Vehicle has been modified", "version": exc.version},
+            headers={"ETag": versioning.vehicle_etag(exc.version)},
+        )
+
+    if not updated:  # handle nonexistent VIN
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+
+    response.headers["ETag"] = versioning.vehicle_etag(updated.version)
+    return updated
+
+
+@router.delete("/vehicle/{vin}", status_code=204)
+def delete_vehicle(vin: str, request: Request, db: Session = Depends(get_db)):
+    """Delete a vehicle by VIN; honours If-Match."""
+    repo = write_repository(db)
+    if_versions = versioning.if_match_versions(request.headers.get("if-match"))
+
+    try:
+        deleted = repo.delete(vin, if_versions=if_versions)
+    except PreconditionFailed as exc:  # changed since the client read it
+        raise HTTPException(
+            status_code=412,
+            detail="Vehicle has been modified",
+            headers={"ETag": versioning.vehicle_etag(exc.version)},
+        )
 
     if not deleted:  # handle nonexistent VIN
         raise HTTPException(status_code=404, detail="Vehicle not found")
 
     return None
+
+
+# Serve the core CRUD routes from the threadpool (sync) or the event loop (async)
+if config.API_MODE == "async":
+    from . import async_api  # the async stack is only imported when it serves the routes
+    app.include_router(async_api.router)
+else:
+    app.include_router(router)
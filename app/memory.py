@@ -0,0 +1,442 @@
+# In-memory vehicle store
+"""
+1. With VEHICLE_REPOSITORY=memory, VehicleRepository serves get(), read(),
+   version(), list(), page() / page_json() and count() from a VehicleStore
+   instead of SQL: no session round trip, statement compilation or SQLite call.
+2. Rows are compact __slots__ records in a dict keyed by VIN (the hash index),
+   with hash indexes on the equality filters (manufacturer_name, model_name,
+   model_year, fuel_type) and sorted (key, vin) indexes for the sort orders,
+   which also serve the *_min / *_max range filters.
+3. SQLite stays the system of record: writes go through the repository as
+   before (write-through) and mark their VINs dirty once committed; the next
+   read re-reads just those rows.
+4. On first use the store loads the whole table in one scan and remembers the
+   change-log position of that snapshot; every VEHICLE_MEMORY_POLL_INTERVAL
+   seconds it replays VINs written since (by other processes, or by anything
+   that bypassed the repository) from vehicle_changes, and reloads if the log
+   was pruned past it or the database was replaced. A caller holding a newer
+   table generation (the ETag of a page about to be cached) makes it poll
+   at once.
+5. SQLite is read outside the lock readers take: one thread at a time syncs,
+   building new rows or a whole new snapshot aside, and takes the lock only
+   to swap them in, so reads keep serving the previous state meanwhile.
+6. One store per database file, shared by the sync and async engines;
+   search, stats, streaming exports and delta sync stay on SQL.
+"""
+import heapq
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from . import config, models, schemas, versioning
+from .cache import defer_invalidation
+
+_vehicles = models.Vehicle.__table__
+
+# Record fields: the VehicleResponse columns, in its field order
+FIELDS = tuple(schemas.VehicleResponse.model_fields)
+
+# Filters answered from a hash index (value → VINs)
+EQUALITY_FIELDS = ("manufacturer_name", "model_name", "model_year", "fuel_type")
+
+# Sort orders kept as sorted indexes; "vin" holds VINs, the others (key, vin) tuples
+SORT_FIELDS = ("vin", "model_year", "purchase_price")
+
+# Types a cursor's sort key may decode to, per non-VIN sort field
+_KEY_TYPES = {"model_year": (int,), "purchase_price": (int, float)}
+
+# Low-cardinality strings shared between records rather than stored per row
+_INTERNED = ("manufacturer_name", "model_name", "fuel_type")
+
+# VINs re-read per IN (...) query
+_REFRESH_CHUNK_SIZE = 500
+
+# A plain SELECT, only used to ask a session which engine it reads from
+_PROBE = select(1)
+
+
+class VehicleRecord:
+    """One vehicle; attributes as on VehicleResponse and on Core rows."""
+
+    __slots__ = FIELDS
+
+    def __init__(self, row):
+        """`row` holds the FIELDS values in order (a Core row of the same columns)."""
+        for name, value in zip(FIELDS, row):
+            setattr(self, name, sys.intern(value) if name in _INTERNED else value)
+
+    def _asdict(self) -> dict:
+        return {name: getattr(self, name) for name in FIELDS}
+
+
+class _AfterAll:
+    """Sorts after every VIN, so (key, _AFTER_ALL) bounds all entries with that key."""
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+
+_AFTER_ALL = _AfterAll()
+
+# Bucket of a value no vehicle has
+_EMPTY = frozenset()
+
+
+def _split_filters(filters: schemas.VehicleFilter | None):
+    """VehicleFilter → ({field: value} equalities, {field: [min, max]} inclusive ranges)."""
+    equal, ranges = {}, {}
+    for field, value in (filters.model_dump(exclude_none=True) if filters else {}).items():
+        if field.endswith("_min"):
+            ranges.setdefault(field[:-4], [None, None])[0] = value
+        elif field.endswith("_max"):
+            ranges.setdefault(field[:-4], [None, None])[1] = value
+        else:
+            equal[field] = value
+    return equal, ranges
+
+
+def _position(field: str, after):
+    """
+    A decoded cursor position checked against the sort field's types, since it is
+    compared with the index entries; raises ValueError like decode_cursor().
+    """
+    if field == "vin":
+        if isinstance(after, str):
+            return after
+    elif isinstance(after, (list, tuple)) and len(after) == 2:
+        key, vin = after
+        if isinstance(key, _KEY_TYPES[field]) and not isinstance(key, bool) and isinstance(vin, str):
+            return key, vin
+    raise ValueError("Invalid cursor")
+
+
+def _in_ranges(record: VehicleRecord, ranges: dict) -> bool:
+    for field, (low, high) in ranges.items():
+        value = getattr(record, field)
+        if (low is not None and value < low) or (high is not None and value > high):
+            return False
+    return True
+
+
+class VehicleStore:
+    """Thread-safe in-memory copy of the vehicles table with hash and sorted indexes."""
+
+    def __init__(self, poll_interval: float = 1.0):
+        self.poll_interval = poll_interval
+        self._lock = threading.RLock()  # guards the state below; never held across SQL
+        self._sync_lock = threading.Lock()  # one thread at a time reads SQLite to catch up
+        self._instance = None  # database instance of the loaded snapshot; None until loaded
+        self._seq = 0  # last change-log sequence reflected in memory
+        self._generation = None  # table generation token reflected in memory (at least)
+        self._next_poll = 0.0
+        self._dirty: set[str] = set()  # VINs written since they were last read
+        self._refreshing: set[str] = set()  # VINs being re-read by the syncing thread
+        self._rows: dict[str, VehicleRecord] = {}
+        self._by_value = {field: defaultdict(set) for field in EQUALITY_FIELDS}
+        self._sorted = {field: [] for field in SORT_FIELDS}
+        self._stats = dict.fromkeys(["loads", "polls", "refreshed"], 0)
+
+    # Coherence
+
+    def sync(self, db: Session, generation: str | None = None):
+        """
+        Load on first use, then catch up with writes committed since the last read.
+        Polls the change log every poll_interval, or at once when `generation` (a
+        VehicleRepository.generation() token) is not the one the store reflects.
+        """
+        if not self._behind(generation):
+            return
+        with self._sync_lock:
+            if self._instance is None:
+                self._load(db)
+                return
+            if time.monotonic() >= self._next_poll or (generation is not None and generation != self._generation):
+                self._poll(db)
+            with self._lock:
+                vins, self._dirty = self._dirty, set()
+                self._refreshing = vins
+            if vins:
+                self._refresh(db, vins)
+
+    def _behind(self, generation: str | None) -> bool:
+        """Whether sync() has anything to do; checked without waiting for a sync in progress."""
+        with self._lock:
+            return (
+                self._instance is None
+                or time.monotonic() >= self._next_poll
+                or (generation is not None and generation != self._generation)
+                or bool(self._dirty or self._refreshing)
+            )
+
+    def publish(self, db: Session, vins):
+        """Record a write inside the current transaction; its VINs are re-read once it commits."""
+        defer_invalidation(db, self, vins)
+
+    def invalidate(self, vins):
+        """Mark VINs as changed in SQLite."""
+        with self._lock:
+            self._dirty.update(vins)
+
+    def clear(self):
+        """Forget everything; the next read reloads the table."""
+        with self._lock:
+            self._instance = None
+            self._dirty.clear()
+
+    def _load(self, db: Session):
+        """Read the whole table and build its indexes aside, then swap them in."""
+        with self._lock:
+            # Covered by the snapshot; VINs written from here on stay dirty
+            self._refreshing, self._dirty = self._dirty | self._refreshing, set()
+        try:
+            # The log position is read first: rows written meanwhile are replayed again later
+            instance, generation, seq = db.execute(text("""
+                SELECT (SELECT instance FROM table_generations WHERE name = 'vehicles'),
+                       (SELECT generation FROM table_generations WHERE name = 'vehicles'),
+                       coalesce((SELECT seq FROM sqlite_sequence WHERE name = 'vehicle_changes'), 0)
+            """)).one()
+            rows = db.execute(select(*(_vehicles.c[f] for f in FIELDS)).order_by(_vehicles.c.vin)).all()
+        except BaseException:
+            self._requeue()
+            raise
+
+        records = {row.vin: VehicleRecord(row) for row in rows}
+        by_value = {field: defaultdict(set) for field in EQUALITY_FIELDS}
+        for vin, record in records.items():
+            for field in EQUALITY_FIELDS:
+                by_value[field][getattr(record, field)].add(vin)
+        sorted_ = {"vin": list(records)}
+        for field in SORT_FIELDS[1:]:
+            sorted_[field] = sorted((getattr(r, field), vin) for vin, r in records.items())
+
+        with self._lock:
+            self._rows, self._by_value, self._sorted = records, by_value, sorted_
+            self._instance, self._seq = instance or "", seq
+            self._generation = versioning.generation_token(instance, generation)
+            self._refreshing = set()
+            self._next_poll = time.monotonic() + self.poll_interval
+            self._stats["loads"] += 1
+
+    def _poll(self, db: Session):
+        """Replay VINs from the change log; reload if it no longer reaches back to our position."""
+        with self._lock:
+            self._next_poll = time.monotonic() + self.poll_interval
+            self._stats["polls"] += 1
+            position, loaded = self._seq, self._instance  # only the syncing thread moves them
+        # The generation is read first, so the changes replayed reach at least that far
+        instance, generation = db.execute(
+            text("SELECT instance, generation FROM table_generations WHERE name = 'vehicles'")
+        ).first() or (None, None)
+        changes = db.execute(
+            text("SELECT seq, vin FROM vehicle_changes WHERE seq > :seq ORDER BY seq"), {"seq": position}
+        ).all()
+        if (instance or "") != loaded or (changes and changes[0].seq != position + 1):
+            self._load(db)
+            return
+        with self._lock:
+            if changes:
+                self._seq = changes[-1].seq
+                self._dirty.update(change.vin for change in changes)
+            self._generation = versioning.generation_token(instance, generation)
+
+    def _refresh(self, db: Session, vins: set):
+        """Re-read the given VINs from SQLite, then upsert the ones found and drop the rest."""
+        vins = sorted(vins)
+        found = {}
+        try:
+            for start in range(0, len(vins), _REFRESH_CHUNK_SIZE):
+                chunk = vins[start:start + _REFRESH_CHUNK_SIZE]
+                found.update(
+                    (row.vin, VehicleRecord(row))
+                    for row in db.execute(select(*(_vehicles.c[f] for f in FIELDS)).where(_vehicles.c.vin.in_(chunk)))
+                )
+        except BaseException:
+            self._requeue()
+            raise
+
+        with self._lock:
+            for vin in vins:
+                self._remove(vin)
+                if vin in found:
+                    self._add(found[vin])
+            self._refreshing = set()
+            self._stats["refreshed"] += len(vins)
+
+    def _requeue(self):
+        """A failed sync leaves the VINs it was re-reading dirty for the next one."""
+        with self._lock:
+            self._dirty |= self._refreshing
+            self._refreshing = set()
+
+    def _add(self, record: VehicleRecord):
+        vin = record.vin
+        self._rows[vin] = record
+        for field in EQUALITY_FIELDS:
+            self._by_value[field][getattr(record, field)].add(vin)
+        insort(self._sorted["vin"], vin)
+        for field in SORT_FIELDS[1:]:
+            insort(self._sorted[field], (getattr(record, field), vin))
+
+    def _remove(self, vin: str):
+        record = self._rows.pop(vin, None)
+        if record is None:
+            return
+        for field in EQUALITY_FIELDS:
+            bucket = self._by_value[field][getattr(record, field)]
+            bucket.discard(vin)
+            if not bucket:
+                del self._by_value[field][getattr(record, field)]
+        for field in SORT_FIELDS:
+            index = self._sorted[field]
+            entry = vin if field == "vin" else (getattr(record, field), vin)
+            del index[bisect_left(index, entry)]
+
+    # Reads (callers sync() first)
+
+    def get(self, vin: str) -> VehicleRecord | None:
+        return self._rows.get(vin)
+
+    def all(self) -> list[VehicleRecord]:
+        """Every vehicle, in VIN order."""
+        with self._lock:
+            return [self._rows[vin] for vin in self._sorted["vin"]]
+
+    def _candidates(self, equal: dict):
+        """VINs passing every equality filter (intersected hash-index buckets); None without any."""
+        if not equal:
+            return None
+        buckets = sorted((self._by_value[field].get(value, _EMPTY) for field, value in equal.items()), key=len)
+        return buckets[0].intersection(*buckets[1:]) if len(buckets) > 1 else buckets[0]
+
+    def _range_slice(self, field: str, low, high) -> tuple[int, int]:
+        """Positions [begin, end) of the sorted index on `field` inside an inclusive range."""
+        index = self._sorted[field]
+        begin = 0 if low is None else bisect_left(index, (low,))
+        end = len(index) if high is None else bisect_right(index, (high, _AFTER_ALL))
+        return begin, end
+
+    def count(self, filters: schemas.VehicleFilter | None = None) -> int:
+        """Number of vehicles matching the filters."""
+        equal, ranges = _split_filters(filters)
+        with self._lock:
+            vins = self._candidates(equal)
+            if not ranges:
+                return len(self._rows) if vins is None else len(vins)
+
+            # Count inside the narrowest range slice, or over the candidates if fewer
+            slices = {field: self._range_slice(field, *bounds) for field, bounds in ranges.items()}
+            field = min(slices, key=lambda f: slices[f][1] - slices[f][0])
+            begin, end = slices[field]
+            rest = {f: bounds for f, bounds in ranges.items() if f != field}
+            if vins is None and not rest:
+                return end - begin
+            if vins is not None and len(vins) < end - begin:
+                return sum(1 for vin in vins if _in_ranges(self._rows[vin], ranges))
+            return sum(
+                1 for _, vin in self._sorted[field][begin:end]
+                if (vins is None or vin in vins) and _in_ranges(self._rows[vin], rest)
+            )
+
+    def scan(self, filters: schemas.VehicleFilter | None, sort: str, after, limit: int) -> list[VehicleRecord]:
+        """
+        Up to `limit` matching vehicles in `sort` order (VIN breaks ties), strictly
+        after the cursor position `after`: a VIN for sort="vin", else (key, vin).
+        """
+        descending = sort.startswith("-")
+        field = sort.lstrip("-")
+        equal, ranges = _split_filters(filters)
+        if after is not None:
+            after = _position(field, after)
+
+        with self._lock:
+            vins = self._candidates(equal)
+            # Like a query planner: ordering a few candidates beats walking the sort
+            # index past the (about len(index) / len(vins)) non-matches per match
+            if vins is not None and len(vins) ** 2 < limit * len(self._sorted[field]):
+                return self._top(vins, ranges, field, descending, after, limit)
+            return self._walk(vins, ranges, field, descending, after, limit)
+
+    def _top(self, vins, ranges: dict, field: str, descending: bool, after, limit: int) -> list[VehicleRecord]:
+        """The first `limit` candidates in sort order, by partial heap sort."""
+        sort_key = (lambda r: r.vin) if field == "vin" else (lambda r: (getattr(r, field), r.vin))
+        matches = [
+            record for record in map(self._rows.__getitem__, vins)
+            if _in_ranges(record, ranges)
+            and (after is None or (sort_key(record) < after if descending else sort_key(record) > after))
+        ]
+        return (heapq.nlargest if descending else heapq.nsmallest)(limit, matches, key=sort_key)
+
+    def _walk(self, vins, ranges: dict, field: str, descending: bool, after, limit: int) -> list[VehicleRecord]:
+        """Walk the sort index from the cursor (or range bound on the sort column) until `limit` match."""
+        index = self._sorted[field]
+        low, high = ranges.pop(field, (None, None))
+        begin, end = self._range_slice(field, low, high) if field != "vin" else (0, len(index))
+        if descending:
+            if after is not None:
+                end = min(end, bisect_left(index, after))
+            positions = range(end - 1, begin - 1, -1)
+        else:
+            if after is not None:
+                begin = max(begin, bisect_right(index, after))
+            positions = range(begin, end)
+
+        rows = []
+        for position in positions:
+            vin = index[position] if field == "vin" else index[position][1]
+            if vins is not None and vin not in vins:
+                continue
+            record = self._rows[vin]
+            if _in_ranges(record, ranges):
+                rows.append(record)
+                if len(rows) == limit:
+                    break
+        return rows
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "size": len(self._rows), "dirty": len(self._dirty | self._refreshing)}
+
+
+# One store per database, created on first use
+_stores: dict[str, VehicleStore] = {}
+_stores_lock = threading.Lock()
+
+
+def _store_key(url) -> str:
+    """
+    The database file, whichever driver opens it: the aiosqlite engine of
+    VEHICLE_API_MODE=async shares the store preloaded through the sync engine.
+    """
+    if url.database and url.database != ":memory:" and not url.database.startswith("file:"):
+        return os.path.abspath(url.database)
+    return str(url)  # in-memory and URI databases: one per URL
+
+
+def store_for(db: Session) -> VehicleStore | None:
+    """The in-memory store for the session's database; None unless VEHICLE_REPOSITORY=memory."""
+    if config.REPOSITORY != "memory":
+        return None
+    # A SELECT routes to the reader on RoutingSession without marking the session as writing
+    key = _store_key(db.get_bind(clause=_PROBE).engine.url)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = VehicleStore(poll_interval=config.MEMORY_POLL_INTERVAL)
+        return store
+
+
+def preload(session_factory):
+    """Load the configured store before the first request; a no-op for the sqlite backend."""
+    with session_factory() as db:
+        store = store_for(db)
+        if store is not None:
+            store.sync(db)
@@ -0,0 +1,309 @@
+# Request, SQL and pool metrics
+"""
+1. A small in-process registry of counters, gauges and histograms rendered in
+   the Prometheus text exposition format (GET /metrics).
+2. MetricsMiddleware (pure ASGI) counts requests per route template and status,
+   observes latency and tracks in-flight requests.
+3. instrument_engine() hooks before/after_cursor_execute to attribute statement
+   count and DB time to the current request, and times connection checkouts.
+4. Threadpool queue time is the delay between dispatch (mark_dispatch, on the
+   event loop) and the first sync dependency starting in a worker thread (get_db).
+5. Admission control (app/admission.py) reports active slots, queue depth,
+   queue time and shed requests per budget.
+6. Per-request state lives in a ContextVar, which worker threads and run_sync
+   greenlets inherit, so no locking is needed on the request path.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+import anyio.to_thread
+from starlette.requests import HTTPConnection
+from sqlalchemy import event
+
+# Prometheus default latency buckets (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+# Finer buckets for single statements and waits
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Label for statements run outside any request (background imports, startup)
+BACKGROUND = "background"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: dict = {}
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.label_names, k)} {v}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, *labels, value: float):
+        index = bisect.bisect_left(self.buckets, value)  # first bucket with le >= value
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(k, (list(v[0]), v[1], v[2])) for k, v in self._values.items()]
+        lines = self.header()
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip((*self.buckets, "+Inf"), counts):
+                cumulative += n
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: list[_Metric] = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+requests_total = registry.add(Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ["method", "route", "status"]))
+request_duration = registry.add(Histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ["method", "route"]))
+requests_in_flight = registry.add(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled.", ["method", "route"]))
+request_statements = registry.add(Histogram(
+    "http_request_db_statements", "SQL statements executed per request.", ["route"], COUNT_BUCKETS))
+request_db_time = registry.add(Histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request.", ["route"], FAST_BUCKETS))
+statements_total = registry.add(Counter(
+    "db_statements_total", "SQL statements executed, by route (or background).", ["route"]))
+statement_duration = registry.add(Histogram(
+    "db_statement_duration_seconds", "Duration of single SQL statements.", ["engine"], FAST_BUCKETS))
+pool_checkout_wait = registry.add(Histogram(
+    "db_pool_checkout_seconds", "Time to obtain a connection from the pool.", ["engine"], FAST_BUCKETS))
+threadpool_wait = registry.add(Histogram(
+    "threadpool_queue_seconds", "Delay before sync request work starts on a worker thread.", [], FAST_BUCKETS))
+threadpool_threads = registry.add(Gauge(
+    "threadpool_threads", "Worker thread tokens: busy and total.", ["state"]))
+threadpool_waiting = registry.add(Gauge(
+    "threadpool_waiting_tasks", "Tasks waiting for a worker thread.", []))
+admission_active = registry.add(Gauge(
+    "admission_active_requests", "Requests holding a slot of an admission budget.", ["budget"]))
+admission_queued = registry.add(Gauge(
+    "admission_queue_depth", "Requests waiting for a slot of an admission budget.", ["budget"]))
+admission_wait = registry.add(Histogram(
+    "admission_wait_seconds", "Time admitted requests waited for a slot.", ["budget"], FAST_BUCKETS))
+admission_shed = registry.add(Counter(
+    "admission_shed_total", "Requests rejected with 503 by admission control.", ["budget", "reason"]))
+
+
+class RequestStats:
+    """Mutable per-request accumulator shared by the request's task and its worker threads."""
+    __slots__ = ("route", "method", "statements", "db_seconds", "dispatched_at", "in_flight")
+
+    def __init__(self, method: str):
+        self.method = method
+        self.route = None
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.dispatched_at = None
+        self.in_flight = False
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current() -> RequestStats | None:
+    """Stats of the request being handled in this context, if any."""
+    return _current.get()
+
+
+def _route_of(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"  # never the raw path: unbounded cardinality
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: cheaper than BaseHTTPMiddleware and keeps streaming intact."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats(scope["method"])
+        token = _current.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current.reset(token)
+            route = stats.route or _route_of(scope)
+            if stats.in_flight:
+                requests_in_flight.dec(stats.method, route)
+            requests_total.inc(stats.method, route, str(status))
+            request_duration.observe(stats.method, route, value=elapsed)
+            request_statements.observe(route, value=stats.statements)
+            request_db_time.observe(route, value=stats.db_seconds)
+
+
+async def mark_dispatch(connection: HTTPConnection):
+    """
+    App-wide async dependency: runs on the event loop once the route is known,
+    before any sync dependency is sent to the threadpool. (HTTPConnection, so
+    WebSocket routes resolve it too; they are not tracked.)
+    """
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.route = _route_of(connection.scope)
+    stats.in_flight = True
+    requests_in_flight.inc(stats.method, stats.route)
+    stats.dispatched_at = time.perf_counter()
+
+
+def threadpool_started():
+    """Called first thing on a worker thread: record how long the work queued."""
+    stats = _current.get()
+    if stats is not None and stats.dispatched_at is not None:
+        threadpool_wait.observe(value=time.perf_counter() - stats.dispatched_at)
+        stats.dispatched_at = None  # one sample per request
+
+
+def _statement_finished(name: str, context):
+    started = getattr(context, "_metrics_start", None)
+    if started is None:  # failed before reaching the cursor
+        return
+    context._metrics_start = None
+    elapsed = time.perf_counter() - started
+    statement_duration.observe(name, value=elapsed)
+    stats = _current.get()
+    if stats is None:
+        statements_total.inc(BACKGROUND)
+        return
+    stats.statements += 1
+    stats.db_seconds += elapsed
+    statements_total.inc(stats.route or "unmatched")
+
+
+def instrument_engine(engine, name: str):
+    """Attach statement and pool-checkout timing to a (sync) Engine."""
+    if getattr(engine, "_metrics_instrumented", False):
+        return
+    engine._metrics_instrumented = True
+
+    # The start time lives on the statement's execution context, so it cannot leak
+    # or pair with another statement's end when one raises
+    @event.listens_for(engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        _statement_finished(name, context)
+
+    @event.listens_for(engine, "handle_error")
+    def failed(exception_context):  # after_cursor_execute does not fire for failed statements
+        if exception_context.execution_context is not None:
+            _statement_finished(name, exception_context.execution_context)
+
+    # Connection() calls engine.raw_connection() to check out from the pool;
+    # wrapping it on the instance survives pool recreation on dispose()
+    raw_connection = engine.raw_connection
+
+    def timed_raw_connection():
+        started = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            pool_checkout_wait.observe(name, value=time.perf_counter() - started)
+
+    engine.raw_connection = timed_raw_connection
+
+
+def render() -> str:
+    """Current metrics in Prometheus text format (refreshes threadpool gauges)."""
+    try:
+        limiter = anyio.to_thread.current_default_thread_limiter().statistics()
+        threadpool_threads.set("busy", value=limiter.borrowed_tokens)
+        threadpool_threads.set("total", value=limiter.total_tokens)
+        threadpool_waiting.set(value=limiter.tasks_waiting)
+    except RuntimeError:  # no running event loop
+        pass
+    return registry.render()
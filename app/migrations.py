@@ -0,0 +1,202 @@
+# Schema migrations
+"""
+1. The schema version lives in SQLite's `PRAGMA user_version` (a header field,
+   no table needed). run() reads it once and returns immediately when the
+   database is already current, which is every start after the first.
+2. Otherwise it takes the write lock (BEGIN IMMEDIATE), re-reads the version so
+   concurrent starters do not repeat work, applies the pending steps in order
+   and stamps the new version, all in one transaction.
+3. A database without a vehicles table is created from the models in one step
+   and stamped with the latest version.
+4. Databases created by older builds (create_all at import, no version) start
+   at 0; each step checks what is already there, so it is safe to apply to
+   any of them.
+5. New steps are appended to MIGRATIONS; never renumber or edit applied ones.
+6. `python -m app.migrations [status|upgrade]` runs the same code from a shell.
+"""
+import argparse
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateTable
+
+from . import changelog, models, search, stats, versioning
+
+
+def _columns(conn, table: str) -> dict:
+    """name → PRAGMA table_info row for an existing table."""
+    return {row.name: row for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+
+def _rebuild_vehicles(conn):
+    """Make `color` nullable and add `version`: SQLite can only do this by copying the table."""
+    columns = _columns(conn, "vehicles")
+    if not columns["color"].notnull and "version" in columns:
+        return
+
+    table = models.Vehicle.__table__
+    ddl = str(CreateTable(table).compile(dialect=conn.dialect)).replace(
+        "CREATE TABLE vehicles", "CREATE TABLE vehicles_new", 1)
+    conn.execute(text(ddl))
+
+    copied = [c.name for c in table.columns if c.name in columns and c.name != "version"]
+    conn.execute(text(f"""
+        INSERT INTO vehicles_new ({", ".join(copied)}, version)
+        SELECT {", ".join(copied)}, {"version" if "version" in columns else "1"} FROM vehicles
+    """))
+    # Dropping the old table takes its indexes and triggers with it; later steps
+    # recreate them, and the FTS index is rebuilt because rowids changed
+    search.drop(conn)
+    conn.execute(text("DROP TABLE vehicles"))
+    conn.execute(text("ALTER TABLE vehicles_new RENAME TO vehicles"))
+
+
+def _vehicle_indexes(conn):
+    """Secondary indexes behind the list filters and sorts."""
+    for index in models.Vehicle.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+def _supporting_tables(conn):
+    """Import jobs, stats summary and table generations."""
+    if "table_generations" in inspect(conn).get_table_names() and "instance" not in _columns(conn, "table_generations"):
+        conn.execute(text("DROP TABLE table_generations"))  # derived; reseeded below
+    # Fires the metadata after_create listeners (stats / generation triggers)
+    models.Base.metadata.create_all(conn)
+
+
+def _row_versions(conn):
+    """Generation triggers; start the generation past every existing version."""
+    versioning.install(conn)
+    conn.execute(text("""
+        UPDATE table_generations
+        SET generation = max(generation, (SELECT coalesce(max(version), 0) FROM vehicles))
+        WHERE name = 'vehicles'
+    """))
+
+
+def _full_text_search(conn):
+    """FTS5 index and triggers, populated from the current rows."""
+    search.install(conn)
+    conn.execute(text("INSERT INTO vehicles_fts(vehicles_fts) VALUES ('rebuild')"))
+
+
+def _fleet_stats(conn):
+    """Stats triggers and a summary recomputed from the current rows."""
+    stats.install(conn)
+    stats.recompute(conn)
+
+
+def _change_log(conn):
+    """Change log table and its triggers; history starts now."""
+    models.VehicleChange.__table__.create(conn, checkfirst=True)
+    changelog.install(conn)
+
+
+def _tombstones(conn):
+    """Deletion records and the version index behind delta sync."""
+    models.VehicleTombstone.__table__.create(conn, checkfirst=True)
+    for index in models.Vehicle.__table__.indexes:
+        index.create(conn, checkfirst=True)
+    for name in versioning.TOMBSTONE_TRIGGERS:  # recreated with the tombstone statements
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+    versioning.install(conn)
+
+
+def _import_leases(conn):
+    """Owner and lease columns, so only one process runs each import job."""
+    columns = _columns(conn, "import_jobs")
+    for name, type_ in (("owner", "VARCHAR"), ("lease_expires_at", "FLOAT")):
+        if name not in columns:
+            conn.execute(text(f"ALTER TABLE import_jobs ADD COLUMN {name} {type_}"))
+
+
+
+def _drop_cache_generation(conn):
+    """The cache hook reads table_generations now; its old counter table goes."""
+    conn.execute(text("DROP TABLE IF EXISTS cache_generation"))
+
+
+# (version, description, step); a step moves the schema from version - 1 to version
+MIGRATIONS = [
+    (1, "vehicles: nullable color, row version column", _rebuild_vehicles),
+    (2, "vehicles: secondary indexes", _vehicle_indexes),
+    (3, "supporting tables", _supporting_tables),
+    (4, "row versions and table generation", _row_versions),
+    (5, "full-text search index", _full_text_search),
+    (6, "fleet statistics summary", _fleet_stats),
+    (7, "change log", _change_log),
+    (8, "delta sync: tombstones and version index", _tombstones),
+    (9, "import jobs: owner and lease", _import_leases),
+    (10, "drop the cache generation counter", _drop_cache_generation),
+]
+
+LATEST = MIGRATIONS[-1][0]
+
+
+def current_version(conn) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar()
+
+
+def run(engine) -> list[int]:
+    """Bring the database up to LATEST; return the versions applied (empty when current)."""
+    with engine.connect() as conn:
+        if current_version(conn) == LATEST:
+            return []
+
+        # Drive the transaction by hand so it can start as BEGIN IMMEDIATE:
+        # a second process starting at the same time waits here, then sees LATEST
+        dbapi_conn = conn.connection.dbapi_connection
+        isolation_level = dbapi_conn.isolation_level
+        dbapi_conn.isolation_level = None
+        try:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                applied = _apply(conn)
+                conn.exec_driver_sql("COMMIT")
+            except BaseException:
+                conn.exec_driver_sql("ROLLBACK")
+                raise
+        finally:
+            dbapi_conn.isolation_level = isolation_level
+        conn.rollback()  # end SQLAlchemy's (empty) view of the transaction
+    return applied
+
+
+def _apply(conn) -> list[int]:
+    version = current_version(conn)
+    if version >= LATEST:
+        return []
+
+    if version == 0 and not inspect(conn).has_table("vehicles"):
+        models.Base.metadata.create_all(conn)  # fresh database: the models are the latest schema
+        applied = [LATEST]
+    else:
+        applied = []
+        for number, _description, step in MIGRATIONS:
+            if number > version:
+                step(conn)
+                applied.append(number)
+
+    conn.exec_driver_sql(f"PRAGMA user_version = {LATEST}")
+    return applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply or inspect schema migrations.")
+    parser.add_argument("command", nargs="?", choices=["status", "upgrade"], default="upgrade")
+    args = parser.parse_args()
+
+    from .database import engine
+    if args.command == "status":
+        with engine.connect() as conn:
+            version = current_version(conn)
+        for number, description, _step in MIGRATIONS:
+            print(f"{'applied' if number <= version else 'pending'}  {number:>3}  {description}")
+        return
+
+    applied = run(engine)
+    print(f"applied {applied}" if applied else f"already at version {LATEST}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,36 @@
 1. Defines the Vehicle model, mapping Python attributes → SQL table columns.
 2. Controls how data is stored in the vehicles table.
 3. Enforces DB-level structure (types, nullable fields, primary key on VIN).
+   Secondary indexes cover every filter / sort supported by GET /vehicle.
+   The FTS5 search index (app/search.py) is created and dropped with the table.
+4. Defines ImportJob / ImportReject for tracking background bulk imports.
+5. Every vehicle row carries a version, taken from the `vehicles` table
+   generation (TableGeneration) that triggers bump on every write (app/versioning.py).
+   Versions are never reused for a VIN, even after a delete; they back the ETags.
+6. Defines VehicleStats, the per-group summary behind GET /vehicle/stats;
+   its maintenance triggers (app/stats.py) are installed once all tables exist.
+7. Defines VehicleTombstone, the deletion record behind delta sync (GET /vehicle/changes).
+8. Defines VehicleChange, the append-only change log written by triggers
+   (app/changelog.py) and served as a change feed.
 """
-from sqlalchemy import Column, String, Integer, Float
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Index, event, func, select
 from .database import Base
+from . import changelog, search, stats, versioning
+
+class TableGeneration(Base):
+    __tablename__ = "table_generations"  # one row per versioned table, bumped on every row write
+
+    name = Column(String, primary_key=True)
+    generation = Column(Integer, nullable=False, default=0)
+    # Random per database, so generations of different databases never compare equal
+    instance = Column(String, nullable=False)
+
+
+# Version for a row being written: one past the current table generation
+_next_version = func.coalesce(
+    select(TableGeneration.generation).where(TableGeneration.name == "vehicles").scalar_subquery(), 0
+) + 1
+
 
 class Vehicle(Base):
     __tablename__ = "vehicles" # Name of the table in SQLite
@@ -18,4 +45,100 @@ class Vehicle(Base):
     model_year = Column(Integer, nullable=False)
     purchase_price = Column(Float, nullable=False)
     fuel_type = Column(String, nullable=False)
-    color  = Column(String, nullable=False)
\ No newline at end of file
+    color = Column(String)  # not collected by the API yet
+    # Set inline by every INSERT / UPDATE statement, so writes stay single statements
+    version = Column(Integer, nullable=False, default=_next_version, onupdate=_next_version)
+
+    __table_args__ = (
+        # Equality filters first, then the range columns commonly combined with them
+        Index("ix_vehicles_manufacturer_year_price", "manufacturer_name", "model_year", "purchase_price"),
+        Index("ix_vehicles_fuel_year_price", "fuel_type", "model_year", "purchase_price"),
+        Index("ix_vehicles_model_year", "model_name", "model_year"),
+        # Range-only filters and sorted pages (VIN is the keyset tie-breaker)
+        Index("ix_vehicles_year_vin", "model_year", "vin"),
+        Index("ix_vehicles_price_vin", "purchase_price", "vin"),
+        # Delta sync: rows written after a (version, vin) cursor
+        Index("ix_vehicles_version_vin", "version", "vin"),
+    )
+
+
+# Keep the full-text index's lifecycle tied to the vehicles table
+event.listen(Vehicle.__table__, "after_create", lambda target, connection, **kw: search.install(connection))
+event.listen(Vehicle.__table__, "before_drop", lambda target, connection, **kw: search.drop(connection))
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(String, primary_key=True)
+    format = Column(String, nullable=False)  # csv | ndjson
+    path = Column(String, nullable=False)  # spooled upload on disk
+    status = Column(String, nullable=False, default="queued")  # queued | running | completed | failed
+    total_bytes = Column(Integer, nullable=False)
+    # Resume point: end of the last committed chunk
+    committed_offset = Column(Integer, nullable=False, default=0)
+    committed_line = Column(Integer, nullable=False, default=0)
+    rows_processed = Column(Integer, nullable=False, default=0)
+    rows_created = Column(Integer, nullable=False, default=0)
+    rows_rejected = Column(Integer, nullable=False, default=0)
+    # Progress of the current run, used for rows/sec and ETA
+    run_started_at = Column(Float)
+    run_start_offset = Column(Integer, nullable=False, default=0)
+    run_start_rows = Column(Integer, nullable=False, default=0)
+    finished_at = Column(Float)
+    error = Column(String)
+    # Worker running the job (imports.WORKER_ID) and until when it is reserved to it
+    owner = Column(String)
+    lease_expires_at = Column(Float)
+
+
+class ImportReject(Base):
+    __tablename__ = "import_rejects"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(String, ForeignKey("import_jobs.id"), nullable=False, index=True)
+    line = Column(Integer, nullable=False)  # 1-based line in the uploaded file
+    vin = Column(String)
+    detail = Column(String, nullable=False)
+
+
+class VehicleStats(Base):
+    __tablename__ = "vehicle_stats"  # one row per (manufacturer, year, fuel) group
+
+    manufacturer_name = Column(String, primary_key=True)
+    model_year = Column(Integer, primary_key=True)
+    fuel_type = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False)
+    sum_price = Column(Float, nullable=False)
+    sum_hp = Column(Float, nullable=False)
+    min_price = Column(Float, nullable=False)
+    max_price = Column(Float, nullable=False)
+    min_hp = Column(Integer, nullable=False)
+    max_hp = Column(Integer, nullable=False)
+
+
+class VehicleTombstone(Base):
+    __tablename__ = "vehicle_tombstones"  # one row per deleted VIN, until it is re-created
+
+    vin = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False)  # table generation produced by the delete
+
+    __table_args__ = (Index("ix_vehicle_tombstones_version_vin", "version", "vin"),)
+
+
+class VehicleChange(Base):
+    __tablename__ = "vehicle_changes"  # append-only; pruned by age / size
+    __table_args__ = {"sqlite_autoincrement": True}  # sequence numbers are never reused
+
+    seq = Column(Integer, primary_key=True)
+    vin = Column(String, nullable=False)
+    op = Column(String, nullable=False)  # create | update | delete
+    version = Column(Integer, nullable=False)  # row version written (deleted, for op=delete)
+    changes = Column(String)  # JSON object of changed fields; NULL for deletes
+    at = Column(Float, nullable=False)  # unix time
+
+
+# Triggers reference several tables, so install them once create_all has made them all
+event.listen(Base.metadata, "after_create", lambda target, connection, **kw: versioning.install(connection))
+event.listen(Base.metadata, "after_create", lambda target, connection, **kw: stats.install(connection))
+event.listen(Base.metadata, "after_create", lambda target, connection, **kw: changelog.install(connection))
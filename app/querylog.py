@@ -0,0 +1,197 @@
+# Slow-query log
+"""
+1. instrument_engine() times every statement; ones slower than the threshold
+   (VEHICLE_SLOW_QUERY_MS) become structured JSON records on the
+   "app.slow_query" logger.
+2. A record holds the normalized SQL, parameters (redacted by default), the
+   duration, the originating VehicleRepository method and route, and the
+   EXPLAIN QUERY PLAN of the statement, captured on the same connection.
+3. Records are kept for a rolling window; top() aggregates them by normalized
+   SQL for the debug endpoint GET /debug/slow-queries.
+4. Everything beyond one perf_counter pair per statement happens only for
+   slow statements.
+5. Statements that fail are timed too; slow ones are logged with an "error"
+   field (a lock timeout is often the slow query worth finding).
+"""
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+
+from . import config, metrics
+
+logger = logging.getLogger("app.slow_query")
+
+# Statements EXPLAIN QUERY PLAN can describe
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+_whitespace = re.compile(r"\s+")
+_strings = re.compile(r"'(?:[^']|'')*'")
+_numbers = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_lists = re.compile(r"\(\?(?:, \?)+\)")
+_rows = re.compile(r"\(\?, \.\.\.\)(?:, \(\?, \.\.\.\))+")
+
+
+def normalize(sql: str) -> str:
+    """SQL with literals replaced by ? and IN lists / VALUES rows collapsed."""
+    sql = _whitespace.sub(" ", sql).strip()
+    sql = _strings.sub("?", sql)
+    sql = _numbers.sub("?", sql)
+    sql = _lists.sub("(?, ...)", sql)
+    return _rows.sub("(?, ...), ...", sql)
+
+
+def redact(parameters, mode: str):
+    """Parameters as logged: full values, their types only (redact), or nothing (none)."""
+    if mode == "none" or parameters is None:
+        return None
+    values = parameters.values() if isinstance(parameters, dict) else parameters
+    if mode == "full":
+        return [v if isinstance(v, (int, float, str, type(None))) else repr(v) for v in values]
+    return [type(v).__name__ for v in values]
+
+
+def repository_method() -> str | None:
+    """
+    Outermost VehicleRepository method on the current stack (the public entry
+    point), e.g. "VehicleRepository.page_json". Only walked for slow statements.
+    """
+    found = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        name = frame.f_code.co_qualname
+        if name.startswith(("VehicleRepository.", "AsyncVehicleRepository.")):
+            found = name
+        frame = frame.f_back
+    return found
+
+
+def explain(dbapi_connection, statement: str, parameters) -> list[str] | str:
+    """EXPLAIN QUERY PLAN detail lines, via a raw cursor so no engine events fire."""
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return []
+    cursor = None
+    try:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters or ())
+        return [row[3] for row in cursor.fetchall()]
+    except Exception as exc:  # a plan is best effort; never fail the request over it
+        return f"unavailable: {exc}"
+    finally:
+        if cursor is not None:
+            cursor.close()
+
+
+class SlowQueryLog:
+    """Thread-safe rolling window of slow-statement records."""
+
+    def __init__(self, threshold_ms: float, window: float = 300.0, params: str = "redact",
+                 max_records: int = 10_000):
+        self.threshold_ms = threshold_ms  # <= 0 disables logging
+        self.window = window
+        self.params = params  # redact | full | none
+        self._records: deque = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, record: dict):
+        logger.warning(json.dumps(record, default=str))
+        with self._lock:
+            self._records.append(record)
+            self._prune(time.time())
+
+    def _prune(self, now: float):
+        while self._records and self._records[0]["ts"] < now - self.window:
+            self._records.popleft()
+
+    def top(self, limit: int = 10, window: float | None = None) -> list[dict]:
+        """Slowest normalized statements over the last `window` seconds, by total time."""
+        now = time.time()
+        since = now - min(window or self.window, self.window)
+        groups = {}
+        with self._lock:
+            self._prune(now)
+            records = [r for r in self._records if r["ts"] >= since]
+
+        for r in records:
+            g = groups.setdefault(r["sql"], {"sql": r["sql"], "count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            g["count"] += 1
+            g["total_ms"] += r["duration_ms"]
+            if r["duration_ms"] >= g["max_ms"]:
+                g["max_ms"] = r["duration_ms"]
+                g["slowest"] = {k: r[k] for k in ("ts", "params", "repository_method", "route", "plan")}
+
+        ranked = sorted(groups.values(), key=lambda g: g["total_ms"], reverse=True)[:limit]
+        for g in ranked:
+            g["total_ms"] = round(g["total_ms"], 3)
+            g["mean_ms"] = round(g["total_ms"] / g["count"], 3)
+        return ranked
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+
+slow_log = SlowQueryLog(
+    threshold_ms=config.SLOW_QUERY_MS,
+    window=config.SLOW_QUERY_WINDOW,
+    params=config.SLOW_QUERY_PARAMS,
+)
+
+
+def _finished(log: SlowQueryLog, name: str, conn, statement, parameters, context, executemany,
+              error: str | None = None):
+    started = getattr(context, "_slow_query_start", None)
+    if started is None:  # failed before reaching the cursor
+        return
+    context._slow_query_start = None
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if log.threshold_ms <= 0 or elapsed_ms < log.threshold_ms:
+        return
+
+    sample = parameters[0] if executemany and parameters else parameters
+    stats = metrics.current()
+    record = {
+        "ts": time.time(),
+        "engine": name,
+        "duration_ms": round(elapsed_ms, 3),
+        "sql": normalize(statement),
+        "params": redact(sample, log.params),
+        "executemany": executemany,
+        "repository_method": repository_method(),
+        "route": (stats.route if stats else None) or metrics.BACKGROUND,
+        "plan": explain(conn.connection.dbapi_connection, statement, sample),
+    }
+    if error is not None:
+        record["error"] = error
+    log.record(record)
+
+
+def instrument_engine(engine, name: str, log: SlowQueryLog = slow_log):
+    """Attach slow-statement detection to a (sync) Engine."""
+    if getattr(engine, "_querylog_instrumented", False):
+        return
+    engine._querylog_instrumented = True
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_start = time.perf_counter()  # per statement: nothing to leak on errors
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        _finished(log, name, conn, statement, parameters, context, executemany)
+
+    @event.listens_for(engine, "handle_error")
+    def failed(exception_context):
+        """Failed statements skip after_cursor_execute; slow ones are logged with their error."""
+        context = exception_context.execution_context
+        if context is not None:
+            exc = exception_context.original_exception
+            _finished(log, name, context.root_connection, exception_context.statement,
+                      exception_context.parameters, context, context.executemany,
+                      error=f"{type(exc).__name__}: {exc}")
+
@@ -3,11 +3,25 @@
 1. Defines request/response validation rules.
 2. VehicleCreate → required fields for POST (includes VIN).
 3. VehicleUpdate → updatable fields for PUT (VIN excluded).
+   VehicleChanges / VehiclePatch → any subset of them for PATCH (plus an optional
+   expected version) and for bulk updates.
 4. VehicleResponse → what the API returns.
-5. Ensures type validation and clean API responses.
+5. VehicleFilter / VehicleSort / VehiclePage → list filtering, sorting and keyset pagination.
+6. VehicleBatchCreate / VehicleBatchResult → bulk create request and per-item outcome.
+   VehicleLookup / VehicleLookupResult → batch lookup by VIN.
+   VehicleBulkUpdate / VehicleBulkDelete / VehicleBulkResult → writes by filter.
+7. ImportJobStatus → progress report for background file imports.
+8. Ensures type validation and clean API responses.
 """
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Literal, Optional
+
+# Page size bounds for list endpoints
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Maximum number of items accepted by POST /vehicle/batch
+MAX_BATCH_SIZE = 1000
 
 # Shared fields across Create, Update, Response
 class VehicleBase(BaseModel):
@@ -30,9 +44,203 @@ class VehicleUpdate(VehicleBase):
     pass
 
 
+class VehicleChanges(BaseModel):
+    """Any subset of the updatable fields; only the fields sent are written."""
+    manufacturer_name: Optional[str] = None
+    description: Optional[str] = None
+    horse_power: Optional[int] = None
+    model_name: Optional[str] = None
+    model_year: Optional[int] = None
+    purchase_price: Optional[float] = None
+    fuel_type: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_changes(self):
+        changed = self.changes()
+        if not changed:
+            raise ValueError("at least one field to change is required")
+        cleared = sorted(f for f, v in changed.items() if v is None and f != "description")
+        if cleared:
+            raise ValueError(f"fields cannot be null: {', '.join(cleared)}")
+        return self
+
+    def changes(self) -> dict:
+        """Column values to write: the fields the client set."""
+        return self.model_dump(include=set(VehicleChanges.model_fields), exclude_unset=True)
+
+
+class VehiclePatch(VehicleChanges):
+    """
+    Request body for a partial update.
+    With `version`, the update applies only if the vehicle is still at that version.
+    """
+    version: Optional[int] = Field(None, description="Expected current version; 409 if it has changed")
+
+
 class VehicleResponse(VehicleBase):
     """Response model returned to clients."""
     vin: str
+    version: int  # grows on every write; also sent as the ETag
 
     class Config:
         from_attributes = True  # enables ORM → Pydantic conversion
+
+
+class VehicleFilter(BaseModel):
+    """
+    Optional query filters shared by list-style endpoints.
+    Plain fields match exactly; *_min / *_max fields are inclusive range bounds.
+    """
+    manufacturer_name: Optional[str] = None
+    model_name: Optional[str] = None
+    model_year: Optional[int] = None
+    model_year_min: Optional[int] = None
+    model_year_max: Optional[int] = None
+    fuel_type: Optional[str] = None
+    purchase_price_min: Optional[float] = None
+    purchase_price_max: Optional[float] = None
+
+
+# Sort keys for list endpoints ("-" prefix → descending); VIN breaks ties
+VehicleSort = Literal["vin", "model_year", "-model_year", "purchase_price", "-purchase_price"]
+
+
+class VehiclePage(BaseModel):
+    """One page of vehicles plus an opaque cursor for the next page."""
+    items: list[VehicleResponse]
+    next_cursor: Optional[str] = None
+
+
+class VehicleDelta(BaseModel):
+    """
+    One page of a delta sync: vehicles created or updated and VINs deleted since
+    the `since` cursor. Pass next_cursor as `since` on the next call.
+    """
+    items: list[VehicleResponse]
+    deleted: list[str]
+    next_cursor: str
+    has_more: bool
+
+
+# Dimensions GET /vehicle/stats can group by
+StatsDimension = Literal["manufacturer_name", "model_year", "fuel_type"]
+
+
+class VehicleStatsFilter(BaseModel):
+    """Optional exact-match filters on the stats dimensions."""
+    manufacturer_name: Optional[str] = None
+    model_year: Optional[int] = None
+    fuel_type: Optional[str] = None
+
+
+class MetricStats(BaseModel):
+    """Aggregates of one numeric column within a group."""
+    sum: float
+    avg: float
+    min: float
+    max: float
+
+
+class VehicleStatsGroup(BaseModel):
+    """
+    Statistics for one group; dimensions not grouped by are omitted (null).
+    """
+    manufacturer_name: Optional[str] = None
+    model_year: Optional[int] = None
+    fuel_type: Optional[str] = None
+    count: int
+    purchase_price: MetricStats
+    horse_power: MetricStats
+
+
+class VehicleStatsResponse(BaseModel):
+    """Response body for GET /vehicle/stats."""
+    group_by: list[StatsDimension]
+    groups: list[VehicleStatsGroup]
+
+
+class VehicleLookup(BaseModel):
+    """Request body for a batch lookup; VINs are normalized and repeats ignored."""
+    vins: list[str] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class VehicleLookupResult(BaseModel):
+    """Vehicles found, in the order first requested, and the (normalized) VINs that were not."""
+    items: list[VehicleResponse]
+    missing: list[str]
+
+
+class VehicleBatchCreate(BaseModel):
+    """
+    Request body for bulk creation.
+    Items are validated one by one so a bad item is reported instead of failing the batch.
+    """
+    items: list[dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        description="VehicleCreate payloads",
+    )
+    mode: Literal["all_or_nothing", "best_effort"] = "best_effort"
+
+
+class VehicleBatchItemResult(BaseModel):
+    """Outcome for one batch item, reported in input order."""
+    index: int
+    vin: Optional[str] = None
+    # skipped → valid, but not written because an all_or_nothing batch failed
+    status: Literal["created", "duplicate", "invalid", "skipped"]
+    detail: Optional[str] = None
+
+
+class VehicleBatchResult(BaseModel):
+    """Response body for bulk creation."""
+    created: int
+    results: list[VehicleBatchItemResult]
+
+
+class VehicleBulkDelete(BaseModel):
+    """Request body for deleting every vehicle matching a filter."""
+    filter: VehicleFilter
+    dry_run: bool = Field(False, description="Only count the matching vehicles")
+
+    @model_validator(mode="after")
+    def check_filter(self):
+        if not self.filter.model_dump(exclude_none=True):  # never the whole table by accident
+            raise ValueError("filter must set at least one condition")
+        return self
+
+
+class VehicleBulkUpdate(VehicleBulkDelete):
+    """Request body for applying the same changes to every vehicle matching a filter."""
+    changes: VehicleChanges
+
+
+class VehicleBulkResult(BaseModel):
+    """Outcome of a bulk update / delete."""
+    dry_run: bool
+    matched: int
+    affected: int  # 0 on a dry run
+
+
+class ImportRejectResponse(BaseModel):
+    """A row of an import file that could not be created."""
+    line: int
+    vin: Optional[str] = None
+    detail: str
+
+
+class ImportJobStatus(BaseModel):
+    """Progress of a background import job."""
+    id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    format: Literal["csv", "ndjson"]
+    rows_processed: int
+    rows_created: int
+    rows_rejected: int
+    bytes_processed: int
+    total_bytes: int
+    rows_per_sec: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    error: Optional[str] = None
+    rejects: list[ImportRejectResponse] = Field(default_factory=list, description="First rejected rows")
@@ -0,0 +1,104 @@
+# Full-text search index
+"""
+1. Defines the FTS5 index (vehicles_fts) over description, model_name and
+   manufacturer_name, stored as an external-content table over `vehicles`.
+2. Triggers on `vehicles` keep the index in sync for every write path
+   (ORM, Core, bulk inserts, imports) inside the same transaction.
+3. Builds safe MATCH expressions from free text with prefix matching.
+4. `python -m app.search rebuild` (re)creates the index for an existing
+   database, e.g. one created before search existed or after a VACUUM
+   renumbered rowids.
+"""
+import argparse
+import re
+
+from sqlalchemy import text
+
+# Column order matters: bm25() weights below are positional
+FTS_COLUMNS = ("description", "model_name", "manufacturer_name")
+
+# bm25 column weights: a hit on model / manufacturer counts more than one in free text
+BM25_WEIGHTS = (1.0, 4.0, 4.0)
+
+_columns = ", ".join(FTS_COLUMNS)
+_new_values = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+_old_values = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+
+CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS vehicles_fts USING fts5(
+        {_columns},
+        content='vehicles', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS vehicles_fts_ai AFTER INSERT ON vehicles BEGIN
+        INSERT INTO vehicles_fts(rowid, {_columns}) VALUES (new.rowid, {_new_values});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS vehicles_fts_ad AFTER DELETE ON vehicles BEGIN
+        INSERT INTO vehicles_fts(vehicles_fts, rowid, {_columns}) VALUES ('delete', old.rowid, {_old_values});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS vehicles_fts_au AFTER UPDATE OF {_columns} ON vehicles BEGIN
+        INSERT INTO vehicles_fts(vehicles_fts, rowid, {_columns}) VALUES ('delete', old.rowid, {_old_values});
+        INSERT INTO vehicles_fts(rowid, {_columns}) VALUES (new.rowid, {_new_values});
+    END
+    """,
+]
+
+# Ranked page of matches; bm25() is lower for better matches
+SEARCH_SQL = f"""
+    SELECT vehicles.* FROM vehicles_fts
+    JOIN vehicles ON vehicles.rowid = vehicles_fts.rowid
+    WHERE vehicles_fts MATCH :match
+    ORDER BY bm25(vehicles_fts, {", ".join(map(str, BM25_WEIGHTS))}), vehicles.vin
+    LIMIT :limit OFFSET :offset
+"""
+
+
+def install(conn):
+    """Create the FTS table and its triggers if missing."""
+    for statement in CREATE_STATEMENTS:
+        conn.execute(text(statement))
+
+
+def drop(conn):
+    """Drop the FTS table (triggers go away with the vehicles table)."""
+    conn.execute(text("DROP TABLE IF EXISTS vehicles_fts"))
+
+
+def rebuild(engine):
+    """Create the index if needed and repopulate it from the vehicles table."""
+    with engine.begin() as conn:
+        install(conn)
+        conn.execute(text("INSERT INTO vehicles_fts(vehicles_fts) VALUES ('rebuild')"))
+
+
+def match_expression(query: str) -> str | None:
+    """
+    Turn free text into an FTS5 MATCH expression: every word must match, as a prefix.
+    Words are quoted so user input can never be parsed as FTS5 syntax.
+    Returns None if the text contains no searchable words.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the vehicle full-text search index.")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args()
+
+    from .database import engine
+    rebuild(engine)
+    print("vehicles_fts rebuilt")
+
+
+if __name__ == "__main__":
+    main()
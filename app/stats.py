@@ -0,0 +1,147 @@
+# Fleet statistics summary
+"""
+1. vehicle_stats (models.VehicleStats) holds count / sum / min / max of
+   purchase_price and horse_power per (manufacturer_name, model_year, fuel_type).
+2. Triggers on `vehicles` maintain it incrementally inside the same transaction
+   as every write the repository makes, without extra round trips.
+   Removing a group's current min / max re-derives just that group via the
+   (manufacturer_name, model_year, ...) index.
+3. Queries aggregate the summary rows, so their cost depends on the number of
+   groups, not the number of vehicles.
+4. `python -m app.stats recompute` rebuilds the summary from scratch and
+   `python -m app.stats check` reports groups that drifted from the vehicles table.
+"""
+import argparse
+import math
+import sys
+
+from sqlalchemy import text
+
+DIMENSIONS = ("manufacturer_name", "model_year", "fuel_type")
+
+_key = " AND ".join(f"{d} = {{row}}.{d}" for d in DIMENSIONS)
+_group_select = f"""
+    SELECT {", ".join(DIMENSIONS)}, count(*),
+           sum(purchase_price), sum(horse_power),
+           min(purchase_price), max(purchase_price), min(horse_power), max(horse_power)
+    FROM vehicles
+"""
+
+
+def _add(row: str) -> str:
+    """Upsert one vehicle (`new` / `old` trigger row) into its group."""
+    return f"""
+        INSERT INTO vehicle_stats ({", ".join(DIMENSIONS)}, count, sum_price, sum_hp, min_price, max_price, min_hp, max_hp)
+        VALUES ({", ".join(f"{row}.{d}" for d in DIMENSIONS)}, 1,
+                {row}.purchase_price, {row}.horse_power,
+                {row}.purchase_price, {row}.purchase_price, {row}.horse_power, {row}.horse_power)
+        ON CONFLICT ({", ".join(DIMENSIONS)}) DO UPDATE SET
+            count = count + 1,
+            sum_price = sum_price + excluded.sum_price,
+            sum_hp = sum_hp + excluded.sum_hp,
+            min_price = min(min_price, excluded.min_price),
+            max_price = max(max_price, excluded.max_price),
+            min_hp = min(min_hp, excluded.min_hp),
+            max_hp = max(max_hp, excluded.max_hp);
+    """
+
+
+def _remove(row: str) -> str:
+    """Take one vehicle out of its group, re-deriving min / max only if it was an extreme."""
+    key = _key.format(row=row)
+    where_vehicles = " AND ".join(f"v.{d} = {row}.{d}" for d in DIMENSIONS)
+    return f"""
+        UPDATE vehicle_stats SET
+            count = count - 1,
+            sum_price = sum_price - {row}.purchase_price,
+            sum_hp = sum_hp - {row}.horse_power
+        WHERE {key};
+        UPDATE vehicle_stats SET
+            min_price = (SELECT min(v.purchase_price) FROM vehicles v WHERE {where_vehicles}),
+            max_price = (SELECT max(v.purchase_price) FROM vehicles v WHERE {where_vehicles}),
+            min_hp = (SELECT min(v.horse_power) FROM vehicles v WHERE {where_vehicles}),
+            max_hp = (SELECT max(v.horse_power) FROM vehicles v WHERE {where_vehicles})
+        WHERE {key} AND count > 0
+          AND ({row}.purchase_price IN (min_price, max_price) OR {row}.horse_power IN (min_hp, max_hp));
+        DELETE FROM vehicle_stats WHERE {key} AND count <= 0;
+    """
+
+
+_tracked = ", ".join((*DIMENSIONS, "purchase_price", "horse_power"))
+
+CREATE_STATEMENTS = [
+    f"CREATE TRIGGER IF NOT EXISTS vehicle_stats_ai AFTER INSERT ON vehicles BEGIN {_add('new')} END",
+    f"CREATE TRIGGER IF NOT EXISTS vehicle_stats_ad AFTER DELETE ON vehicles BEGIN {_remove('old')} END",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS vehicle_stats_au AFTER UPDATE OF {_tracked} ON vehicles BEGIN
+        {_remove('old')}
+        {_add('new')}
+    END
+    """,
+]
+
+
+def install(conn):
+    """Create the maintenance triggers; seed the summary if it starts out empty."""
+    for statement in CREATE_STATEMENTS:
+        conn.execute(text(statement))
+
+    has_stats = conn.execute(text("SELECT EXISTS (SELECT 1 FROM vehicle_stats)")).scalar()
+    has_vehicles = conn.execute(text("SELECT EXISTS (SELECT 1 FROM vehicles)")).scalar()
+    if has_vehicles and not has_stats:
+        recompute(conn)
+
+
+def recompute(conn):
+    """Rebuild every summary row from the vehicles table."""
+    conn.execute(text("DELETE FROM vehicle_stats"))
+    conn.execute(text(f"""
+        INSERT INTO vehicle_stats ({", ".join(DIMENSIONS)}, count, sum_price, sum_hp, min_price, max_price, min_hp, max_hp)
+        {_group_select} GROUP BY {", ".join(DIMENSIONS)}
+    """))
+
+
+def check(conn) -> list:
+    """Return the group keys whose summary row differs from a fresh aggregate."""
+    def load(sql):
+        return {tuple(r[:3]): r[3:] for r in conn.execute(text(sql))}
+
+    expected = load(f"{_group_select} GROUP BY {', '.join(DIMENSIONS)}")
+    actual = load(f"""
+        SELECT {", ".join(DIMENSIONS)}, count, sum_price, sum_hp, min_price, max_price, min_hp, max_hp
+        FROM vehicle_stats
+    """)
+
+    drifted = []
+    for key in expected.keys() | actual.keys():
+        a, b = expected.get(key), actual.get(key)
+        # Running float sums may differ in the last bits; anything more is drift
+        if a is None or b is None or not all(math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-6) for x, y in zip(a, b)):
+            drifted.append(key)
+    return sorted(drifted, key=repr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the vehicle_stats summary table.")
+    parser.add_argument("command", choices=["recompute", "check"])
+    args = parser.parse_args()
+
+    from .database import engine
+    from .migrations import run
+    run(engine)  # summary table + triggers on older databases
+
+    with engine.begin() as conn:
+        if args.command == "recompute":
+            recompute(conn)
+            print("vehicle_stats recomputed")
+            return
+
+        drifted = check(conn)
+    for key in drifted:
+        print("drifted:", key)
+    print(f"{len(drifted)} drifted group(s)")
+    sys.exit(1 if drifted else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# Row versions, table generation and ETags
+"""
+1. Triggers on `vehicles` bump the `vehicles` row of table_generations on
+   every insert / update / delete, in the same transaction as the write.
+2. Each write stamps the row's version with the next generation
+   (models.Vehicle.version), so versions only ever grow.
+3. ETags derive from those numbers: a vehicle's ETag is its version and
+   a collection's is the table generation (qualified by a random
+   per-database instance id), so clients can revalidate
+   without rows being loaded or serialized.
+4. Parses If-None-Match (weak comparison) and If-Match (strong comparison).
+5. Deletes leave a tombstone (models.VehicleTombstone) stamped the same way,
+   so "everything written or deleted after sequence N" is two index range
+   scans on version (GET /vehicle/changes). Versions only grow from one commit
+   to the next; rows written by one multi-row statement may share one.
+"""
+from sqlalchemy import text
+
+_bump = "UPDATE table_generations SET generation = generation + 1 WHERE name = 'vehicles';"
+
+CREATE_STATEMENTS = [
+    """
+    INSERT OR IGNORE INTO table_generations (name, generation, instance)
+    VALUES ('vehicles', 0, lower(hex(randomblob(8))))
+    """,
+    # A re-created VIN is live again: its tombstone goes
+    f"""
+    CREATE TRIGGER IF NOT EXISTS vehicles_generation_ai AFTER INSERT ON vehicles BEGIN
+        {_bump}
+        DELETE FROM vehicle_tombstones WHERE vin = new.vin;
+    END
+    """,
+    f"CREATE TRIGGER IF NOT EXISTS vehicles_generation_au AFTER UPDATE ON vehicles BEGIN {_bump} END",
+    # A delete is stamped with the generation it produced, like a write
+    f"""
+    CREATE TRIGGER IF NOT EXISTS vehicles_generation_ad AFTER DELETE ON vehicles BEGIN
+        {_bump}
+        INSERT INTO vehicle_tombstones (vin, version)
+        VALUES (old.vin, (SELECT generation FROM table_generations WHERE name = 'vehicles'))
+        ON CONFLICT (vin) DO UPDATE SET version = excluded.version;
+    END
+    """,
+]
+
+# Triggers whose definition changed since they were first shipped (see app/migrations.py)
+TOMBSTONE_TRIGGERS = ("vehicles_generation_ai", "vehicles_generation_ad")
+
+
+def install(conn):
+    """Create the generation row and its triggers if missing."""
+    for statement in CREATE_STATEMENTS:
+        conn.execute(text(statement))
+
+
+def generation_token(instance: str | None, generation: int | None) -> str:
+    """Opaque token for the table's state: instance id plus generation ("0" before the first write)."""
+    return "0" if instance is None else f"{instance}-{generation}"
+
+
+def vehicle_etag(version: int) -> str:
+    """Strong ETag of a single vehicle representation."""
+    return f'"v{version}"'
+
+
+def collection_etag(generation: str) -> str:
+    """Strong ETag of any collection response computed at this table generation."""
+    return f'"g{generation}"'
+
+
+def _tags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def none_match(header: str | None, etag: str) -> bool:
+    """True if If-None-Match lists `etag` (or is *), i.e. the client copy is current."""
+    if not header:
+        return False
+    tags = _tags(header)
+    return "*" in tags or etag in (t.removeprefix("W/") for t in tags)
+
+
+def if_match_versions(header: str | None) -> list[int] | None:
+    """
+    Versions an If-Match header accepts: None when absent or *, otherwise the
+    versions of the listed strong vehicle ETags (possibly empty: nothing matches).
+    """
+    if not header:
+        return None
+    tags = _tags(header)
+    if "*" in tags:
+        return None
+    return [int(t[2:-1]) for t in tags if t.startswith('"v') and t.endswith('"') and t[2:-1].isdigit()]
@@ -0,0 +1,13 @@
+# Benchmark suite
+"""
+1. data.py: deterministic synthetic vehicles and VINs (10k – 1M rows).
+2. scenarios.py: one request mix per /vehicle route plus mixed read/write ratios.
+3. runner.py: drives a scenario in-process (ASGI) or against a local uvicorn.
+4. results.py: percentiles, JSON result files and baseline comparison.
+
+Usage:
+    python -m bench run --rows 10000 --target inprocess --out results.json
+    python -m bench compare baseline.json results.json --threshold 10
+
+The standalone bench_*.py scripts cover narrower experiments.
+"""
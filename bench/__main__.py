@@ -0,0 +1,104 @@
+# Benchmark CLI
+"""
+python -m bench run      → seed, run scenarios, print and optionally save results
+python -m bench compare  → diff a result file against a baseline; exit 1 on regression
+python -m bench list     → list scenario names
+"""
+import argparse
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from . import results, scenarios, runner
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=runner.ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def cmd_run(args):
+    names = args.scenarios or list(scenarios.SCENARIOS)
+    unknown = [n for n in names if n not in scenarios.SCENARIOS]
+    if unknown:
+        sys.exit(f"unknown scenario(s): {', '.join(unknown)}")
+
+    env = dict(item.split("=", 1) for item in args.env)
+    with tempfile.TemporaryDirectory() as tmp:
+        out = runner.run(names, args, os.path.join(tmp, "bench.db"), env)
+
+    results.print_run(out)
+    if args.out:
+        meta = {
+            "target": args.target,
+            "rows": args.rows,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "env": env,
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        }
+        results.save(args.out, meta, out)
+        print(f"saved {args.out}", file=sys.stderr)
+
+
+def cmd_compare(args):
+    baseline, current = results.load(args.baseline), results.load(args.current)
+    for key in ("target", "rows", "concurrency"):
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            print(f"warning: {key} differs ({baseline['meta'].get(key)} vs {current['meta'].get(key)})", file=sys.stderr)
+
+    rows = results.compare(baseline, current, threshold=args.threshold, min_ms=args.min_ms)
+    results.print_comparison(rows)
+    regressions = [r for r in rows if r["regression"]]
+    print(f"{len(regressions)} regression(s) above {args.threshold}%")
+    sys.exit(1 if regressions else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Load and latency benchmarks for the /vehicle API.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run scenarios")
+    run.add_argument("scenarios", nargs="*", help="scenario names (default: all)")
+    run.add_argument("--target", choices=["inprocess", "uvicorn"], default="inprocess")
+    run.add_argument("--rows", type=int, default=10_000, help="seeded vehicles (10k – 1M)")
+    run.add_argument("--requests", type=int, default=2000, help="timed requests per scenario")
+    run.add_argument("--warmup", type=int, default=100, help="untimed requests per scenario")
+    run.add_argument("--concurrency", type=int, default=32)
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                     help="app setting, e.g. --env VEHICLE_DB_PROFILE=production (repeatable)")
+    run.add_argument("--port", type=int, default=8766, help="uvicorn target only")
+    run.add_argument("--workers", type=int, default=1, help="uvicorn target only")
+    run.add_argument("--out", help="write results as JSON")
+    run.set_defaults(func=cmd_run)
+
+    compare = sub.add_parser("compare", help="diff results against a baseline")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=10.0, help="allowed worsening in percent")
+    compare.add_argument("--min-ms", type=float, default=0.5, help="ignore latency changes below this")
+    compare.set_defaults(func=cmd_compare)
+
+    sub.add_parser("list", help="list scenarios").set_defaults(
+        func=lambda args: print("\n".join(scenarios.SCENARIOS))
+    )
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
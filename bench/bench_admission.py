@@ -0,0 +1,165 @@
+# Overload benchmark for admission control
+"""
+1. Seeds a SQLite file with --rows vehicles and starts the API under uvicorn
+   twice: with VEHICLE_ADMISSION=off and =on (read-cache disabled, so every
+   lookup reaches the database).
+2. Offers open-loop load: requests start at --rate per second for --duration
+   seconds whether or not earlier ones have finished, as real clients do.
+   The mix is GET /vehicle/{vin} point lookups plus, every --bulk-every
+   requests, a POST /vehicle/bulk-update that rewrites a whole manufacturer.
+3. Prints, per mode and request kind: completed (2xx), shed (503), failed
+   (timeouts / other errors) and p50 / p99 latency of the completed requests,
+   plus the p99 of the 503s (how fast shedding is). Per mode it also prints the
+   rate the client actually achieved and the server-side mean time of point
+   lookups (from GET /metrics): when the achieved rate falls short of --rate,
+   the client itself is saturated and its latencies include its own queueing;
+   run it on another machine.
+
+Usage: python bench/bench_admission.py [--rows 20000] [--rate 180] [--duration 10]
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench import data  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_server(admission: bool, db_path: str, args) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "VEHICLE_DATABASE_URL": f"sqlite:///{db_path}",
+        "VEHICLE_CACHE_SIZE": "0",
+        "VEHICLE_ADMISSION": "on" if admission else "off",
+        "VEHICLE_SLOW_QUERY_MS": "0",  # the overload makes every statement "slow"
+        "VEHICLE_ADMISSION_READ_LIMIT": str(args.read_limit),
+        "VEHICLE_ADMISSION_WRITE_LIMIT": str(args.write_limit),
+        "VEHICLE_ADMISSION_MAX_WAIT_MS": str(args.max_wait_ms),
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient):
+    for _ in range(200):
+        try:
+            await client.get("/vehicle", params={"limit": 1})
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def pct(samples: list, p: float) -> float:
+    if not samples:
+        return float("nan")
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+
+
+async def offer_load(client: httpx.AsyncClient, args) -> dict:
+    rng = random.Random(11)
+    results = {kind: {"ok": [], "shed": [], "failed": 0} for kind in ("lookup", "bulk")}
+
+    async def one(i: int):
+        if args.bulk_every and i % args.bulk_every == 0:
+            kind = "bulk"
+            request = client.post("/vehicle/bulk-update", json={
+                "filter": {"manufacturer_name": data.make_of(i)},
+                "changes": {"description": f"bulk {i}"},
+            })
+        else:
+            kind = "lookup"
+            request = client.get(f"/vehicle/{data.vin(rng.randrange(args.rows))}")
+        started = time.perf_counter()
+        try:
+            r = await request
+        except httpx.HTTPError:
+            results[kind]["failed"] += 1
+            return
+        elapsed = time.perf_counter() - started
+        if r.status_code == 503:
+            results[kind]["shed"].append(elapsed)
+        elif r.status_code < 300:
+            results[kind]["ok"].append(elapsed)
+        else:
+            results[kind]["failed"] += 1
+
+    tasks = []
+    started = time.perf_counter()
+    for i in range(int(args.rate * args.duration)):
+        delay = started + i / args.rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(one(i)))
+    await asyncio.gather(*tasks)
+    results["achieved_rate"] = len(tasks) / (time.perf_counter() - started)
+    results["server_ms"] = await server_mean_ms(client, 'method="GET",route="/vehicle/{vin}"')
+    return results
+
+
+async def server_mean_ms(client: httpx.AsyncClient, labels: str) -> float:
+    """Mean server-side request time for `labels` from the metrics histogram."""
+    sums = {}
+    for line in (await client.get("/metrics")).text.splitlines():
+        for part in ("sum", "count"):
+            if line.startswith(f"http_request_duration_seconds_{part}{{{labels}}}"):
+                sums[part] = float(line.rsplit(" ", 1)[1])
+    return sums["sum"] / sums["count"] * 1000 if sums.get("count") else float("nan")
+
+
+async def bench_mode(admission: bool, db_path: str, args) -> dict:
+    server = start_server(admission, db_path, args)
+    try:
+        limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits,
+                                     timeout=args.timeout) as client:
+            await wait_ready(client)
+            return await offer_load(client, args)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--rate", type=float, default=180, help="requests started per second")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of offered load")
+    parser.add_argument("--bulk-every", type=int, default=100, help="every Nth request is a bulk update (0 = none)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="client timeout in seconds")
+    parser.add_argument("--connections", type=int, default=256, help="client keep-alive connections")
+    parser.add_argument("--read-limit", type=int, default=4, help="VEHICLE_ADMISSION_READ_LIMIT")
+    parser.add_argument("--write-limit", type=int, default=2, help="VEHICLE_ADMISSION_WRITE_LIMIT")
+    parser.add_argument("--max-wait-ms", type=float, default=100, help="VEHICLE_ADMISSION_MAX_WAIT_MS")
+    parser.add_argument("--port", type=int, default=8768)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'kind':<7} {'ok':>6} {'shed':>6} {'failed':>6} {'p50 ms':>9} {'p99 ms':>9} {'503 p99':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, admission in (("off", False), ("on", True)):
+            db_path = os.path.join(tmp, f"{name}.db")
+            data.seed_database(f"sqlite:///{db_path}", args.rows)
+            results = asyncio.run(bench_mode(admission, db_path, args))
+            achieved, server_ms = results.pop("achieved_rate"), results.pop("server_ms")
+            for kind, r in results.items():
+                print(f"{name:<10} {kind:<7} {len(r['ok']):>6} {len(r['shed']):>6} {r['failed']:>6} "
+                      f"{pct(r['ok'], 0.5):>9.1f} {pct(r['ok'], 0.99):>9.1f} {pct(r['shed'], 0.99):>9.1f}")
+            print(f"{name:<10} achieved {achieved:.0f}/s of {args.rate:.0f}/s; "
+                  f"server-side lookup mean {server_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# Sync vs async request path benchmark
+"""
+1. Starts the API under uvicorn twice: VEHICLE_API_MODE=sync and =async,
+   each against its own freshly seeded SQLite file.
+2. Fires point reads (and optionally writes) at high concurrency with httpx.
+3. Prints throughput and p50 / p99 latency per mode.
+
+Usage: python bench/bench_async.py [--requests 5000] [--concurrency 200] [--rows 1000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def vehicle(i: int) -> dict:
+    return {
+        "vin": f"BENCH{i:08d}",
+        "manufacturer_name": "Bench",
+        "description": None,
+        "horse_power": 100 + i % 300,
+        "model_name": f"M{i % 50}",
+        "model_year": 2000 + i % 25,
+        "purchase_price": 10000.0 + i,
+        "fuel_type": "Petrol",
+    }
+
+
+def start_server(mode: str, db_path: str, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "VEHICLE_API_MODE": mode,
+        "VEHICLE_DATABASE_URL": f"sqlite:///{db_path}",
+        "VEHICLE_CACHE_SIZE": "0",  # measure the DB path, not the cache
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient):
+    for _ in range(100):
+        try:
+            await client.get("/vehicle", params={"limit": 1})
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def run(client: httpx.AsyncClient, total: int, concurrency: int, rows: int, write_every: int):
+    latencies = []
+    queue = iter(range(total))
+
+    async def worker():
+        for i in queue:
+            started = time.perf_counter()
+            if write_every and i % write_every == 0:
+                await client.post("/vehicle", json=vehicle(rows + i))
+            else:
+                await client.get(f"/vehicle/BENCH{i % rows:08d}")
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    return {"rps": total / elapsed, "p50_ms": pct(0.50), "p99_ms": pct(0.99), "mean_ms": statistics.mean(latencies) * 1000}
+
+
+async def bench_mode(mode: str, args, port: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        server = start_server(mode, os.path.join(tmp, "bench.db"), port)
+        try:
+            limits = httpx.Limits(max_connections=args.concurrency)
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+                await wait_ready(client)
+                for start in range(0, args.rows, 1000):
+                    items = [vehicle(i) for i in range(start, min(start + 1000, args.rows))]
+                    await client.post("/vehicle/batch", json={"items": items})
+                return await run(client, args.requests, args.concurrency, args.rows, args.write_every)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--write-every", type=int, default=0, help="make every Nth request a POST (0 = reads only)")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{'mode':<6} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for mode in ("sync", "async"):
+        result = asyncio.run(bench_mode(mode, args, args.port))
+        print(f"{mode:<6} {result['rps']:>9.0f} {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# Cold-start benchmark
+"""
+1. import: time `import app.main` in a fresh interpreter (module loading only;
+   no database is touched at import).
+2. first response: spawn `uvicorn app.main:app` and time from spawn until the
+   first GET /vehicle?limit=1 succeeds, against
+   - fresh:  an empty SQLite file (the lifespan creates the schema),
+   - legacy: a database in the original schema (create_all at import, no
+     version) holding --rows vehicles, which the lifespan migrates,
+   - current: an already migrated database (a single version check).
+3. Each case runs --runs times; prints min / median / max in milliseconds.
+
+Usage: python bench/bench_cold_start.py [--runs 5] [--rows 10000]
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench import data  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+# The vehicles table as the first release created it
+LEGACY_SCHEMA = """
+CREATE TABLE vehicles (
+    vin VARCHAR NOT NULL PRIMARY KEY,
+    manufacturer_name VARCHAR NOT NULL,
+    description VARCHAR,
+    horse_power INTEGER NOT NULL,
+    model_name VARCHAR NOT NULL,
+    model_year INTEGER NOT NULL,
+    purchase_price FLOAT NOT NULL,
+    fuel_type VARCHAR NOT NULL,
+    color VARCHAR NOT NULL
+);
+CREATE INDEX ix_vehicles_vin ON vehicles (vin);
+"""
+
+
+def env_for(db_path: str) -> dict:
+    return {**os.environ, "VEHICLE_DATABASE_URL": f"sqlite:///{db_path}"}
+
+
+def time_import(db_path: str) -> float:
+    out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, env=env_for(db_path),
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip())
+
+
+def time_first_response(db_path: str, port: int) -> float:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env_for(db_path),
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=10) as client:
+            while time.perf_counter() - started < 60:
+                try:
+                    if client.get("/vehicle", params={"limit": 1}).status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None:
+                    raise RuntimeError("server exited during startup")
+                time.sleep(0.005)
+        raise RuntimeError("server did not start")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def make_legacy(db_path: str, rows: int):
+    conn = sqlite3.connect(db_path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.executemany(
+        "INSERT INTO vehicles VALUES (:vin, :manufacturer_name, :description, :horse_power,"
+        " :model_name, :model_year, :purchase_price, :fuel_type, 'Black')",
+        data.vehicles(rows),
+    )
+    conn.commit()
+    conn.close()
+
+
+def summary(samples: list) -> str:
+    ms = [s * 1000 for s in samples]
+    return f"{min(ms):>9.1f} {statistics.median(ms):>9.1f} {max(ms):>9.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=10_000, help="vehicles in the legacy database")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    print(f"{'case':<24} {'min ms':>9} {'median ms':>9} {'max ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = lambda name, i: os.path.join(tmp, f"{name}-{i}.db")
+
+        imports = [time_import(path("import", i)) for i in range(args.runs)]
+        print(f"{'import app.main':<24} {summary(imports)}")
+
+        fresh = [time_first_response(path("fresh", i), args.port) for i in range(args.runs)]
+        print(f"{'first response, fresh':<24} {summary(fresh)}")
+
+        legacy = []
+        for i in range(args.runs):
+            make_legacy(path("legacy", i), args.rows)
+            legacy.append(time_first_response(path("legacy", i), args.port))
+        print(f"{'first response, legacy':<24} {summary(legacy)}")
+
+        # The fresh databases are now migrated; start on them again
+        current = [time_first_response(path("fresh", i), args.port) for i in range(args.runs)]
+        print(f"{'first response, current':<24} {summary(current)}")
+
+
+if __name__ == "__main__":
+    main()
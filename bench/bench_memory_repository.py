@@ -0,0 +1,105 @@
+# In-memory repository benchmark
+"""
+1. Seeds a fresh SQLite file with N synthetic vehicles (bench/data.py).
+2. Runs the same reads through VehicleRepository twice: on SQLite, and with an
+   in-memory VehicleStore (VEHICLE_REPOSITORY=memory):
+   - read:   VIN lookups (random existing VINs, plus 10% misses),
+   - page:   first pages of GET /vehicle for a mix of filters and sorts,
+   - count:  counts for the same filters.
+3. Prints p50 / p99 latency and operations per second per backend and read,
+   plus the store's load time and the memory it holds (tracemalloc).
+
+Usage: python bench/bench_memory_repository.py [--rows 100000] [--ops 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import schemas  # noqa: E402
+from app.crud import VehicleRepository  # noqa: E402
+from app.memory import VehicleStore  # noqa: E402
+from bench import data  # noqa: E402
+
+FILTERS = [
+    ({}, "vin"),
+    ({"manufacturer_name": "Kia"}, "vin"),
+    ({"manufacturer_name": "Ford", "model_year_min": 2015}, "-purchase_price"),
+    ({"fuel_type": "Electric"}, "model_year"),
+    ({"model_year_min": 2010, "model_year_max": 2012}, "purchase_price"),
+    ({"purchase_price_min": 50000.0, "purchase_price_max": 60000.0}, "-model_year"),
+]
+
+
+def timed(fn, args_list) -> list:
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def summary(samples: list) -> str:
+    samples = sorted(samples)
+    pick = lambda p: samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+    return f"{pick(0.50):>9.3f} {pick(0.99):>9.3f} {len(samples) / sum(samples):>11.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--ops", type=int, default=20_000, help="lookups per backend")
+    parser.add_argument("--pages", type=int, default=500, help="pages / counts per backend")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'memory.db')}"
+        data.seed_database(url, args.rows)
+        session = sessionmaker(bind=create_engine(url, connect_args={"check_same_thread": False}))
+
+        rng = random.Random(3)
+        vins = [(data.vin(rng.randrange(args.rows)) if rng.random() < 0.9 else f"MISSING{i}",)
+                for i in range(args.ops)]
+        pages = [(rng.choice(FILTERS),) for _ in range(args.pages)]
+
+        store = VehicleStore(poll_interval=1.0)
+        started = time.perf_counter()
+        store.sync(session())
+        load_s = time.perf_counter() - started
+
+        tracemalloc.start()  # a second, traced load: tracing slows loading down
+        traced = VehicleStore()
+        traced.sync(session())
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del traced
+        print(f"store: {args.rows} rows loaded in {load_s * 1000:.0f} ms, {held / 2**20:.1f} MiB held")
+
+        print(f"{'backend':<8} {'read':<6} {'p50 ms':>9} {'p99 ms':>9} {'ops/s':>11}")
+        for name in ("sqlite", "memory"):
+            repo = VehicleRepository(session())
+            repo.store = store if name == "memory" else None
+
+            def page(case):
+                fields, sort = case
+                repo.page(limit=schemas.DEFAULT_PAGE_SIZE, filters=schemas.VehicleFilter(**fields), sort=sort)
+
+            def count(case):
+                repo.count(schemas.VehicleFilter(**case[0]))
+
+            for label, fn, cases in (("read", repo.read, vins), ("page", page, pages), ("count", count, pages)):
+                print(f"{name:<8} {label:<6} {summary(timed(fn, cases))}")
+            repo.db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# Full-text search latency benchmark
+"""
+1. Builds a fresh SQLite file with N synthetic vehicles (FTS index maintained by triggers).
+2. Times VehicleRepository.search() for a mix of one-, two- and three-word queries,
+   and the equivalent LIKE '%...%' scan for comparison.
+3. Prints load time and p50 / p95 / p99 latency per method.
+
+Usage: python bench/bench_search.py [--rows 1000000] [--queries 200]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, or_
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import models  # noqa: E402
+from app.crud import VehicleRepository  # noqa: E402
+from app.database import Base  # noqa: E402
+
+MAKES = ["Toyota", "Honda", "Ford", "BMW", "Audi", "Kia", "Hyundai", "Tesla", "Volvo", "Mazda"]
+MODELS = ["Sedan", "Coupe", "Wagon", "Crossover", "Pickup", "Hatchback", "Roadster", "Van"]
+WORDS = ["red", "blue", "silver", "black", "white", "green", "hybrid", "diesel", "electric",
+         "sunroof", "leather", "navigation", "certified", "owner", "warranty", "towing", "sport"]
+# Option / trim codes widen the vocabulary so most terms are selective, as real searches are
+WORDS += [f"opt{i}" for i in range(500)]
+
+
+def rows(n: int, seed: int = 42):
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "vin": f"FTSB{i:09d}",
+            "manufacturer_name": rng.choice(MAKES),
+            "description": " ".join(rng.sample(WORDS, 5)),
+            "horse_power": rng.randint(70, 600),
+            "model_name": f"{rng.choice(MODELS)} {rng.randint(1, 99)}",
+            "model_year": rng.randint(1995, 2025),
+            "purchase_price": round(rng.uniform(3000, 150000), 2),
+            "fuel_type": rng.choice(["Petrol", "Diesel", "Hybrid", "Electric"]),
+        }
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda p: samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+    return pick(0.50), pick(0.95), pick(0.99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--skip-like", action="store_true", help="skip the LIKE baseline (slow at 1M rows)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'search.db')}")
+        Base.metadata.create_all(bind=engine)
+
+        started = time.perf_counter()
+        batch = []
+        with engine.begin() as conn:
+            for row in rows(args.rows):
+                batch.append(row)
+                if len(batch) == 10_000:
+                    conn.execute(insert(models.Vehicle), batch)
+                    batch = []
+            if batch:
+                conn.execute(insert(models.Vehicle), batch)
+        print(f"loaded {args.rows} rows (with FTS triggers) in {time.perf_counter() - started:.1f}s")
+
+        rng = random.Random(7)
+        queries = [
+            " ".join(rng.sample(WORDS + [m.lower() for m in MAKES], rng.randint(1, 3)))
+            for _ in range(args.queries)
+        ]
+
+        db = sessionmaker(bind=engine)()
+        repo = VehicleRepository(db)
+
+        fts = []
+        for q in queries:
+            started = time.perf_counter()
+            repo.search(q, limit=20)
+            fts.append(time.perf_counter() - started)
+
+        print(f"{'method':<6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        print(f"{'fts5':<6} " + " ".join(f"{v:>9.2f}" for v in percentiles(fts)))
+
+        if not args.skip_like:
+            like = []
+            for q in queries[: max(1, args.queries // 10)]:
+                started = time.perf_counter()
+                conditions = [
+                    or_(*(getattr(models.Vehicle, c).like(f"%{word}%")
+                          for c in ("description", "model_name", "manufacturer_name")))
+                    for word in q.split()
+                ]
+                db.query(models.Vehicle).filter(*conditions).limit(20).all()
+                like.append(time.perf_counter() - started)
+            print(f"{'like':<6} " + " ".join(f"{v:>9.2f}" for v in percentiles(like)))
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# List serialization microbenchmark
+"""
+1. Builds a fresh SQLite file with N synthetic vehicles.
+2. Produces one N-row page body two ways:
+   - orm:  VehicleRepository.page() + VehiclePage validation (from_attributes)
+           + JSON encoding, as response_model does
+   - core: VehicleRepository.page_json(), column tuples straight to JSON bytes
+3. Prints per-row CPU time (process time, best of --repeat) and per-row
+   allocations (tracemalloc peak bytes) for each path.
+
+Usage: python bench/bench_serialization.py [--rows 10000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import models, schemas  # noqa: E402
+from app.crud import VehicleRepository  # noqa: E402
+from app.database import Base  # noqa: E402
+
+
+def rows(n: int, seed: int = 42):
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "vin": f"SER{i:09d}",
+            "manufacturer_name": rng.choice(["Toyota", "Honda", "Ford", "BMW", "Audi"]),
+            "description": "Synthetic vehicle for serialization benchmarks",
+            "horse_power": rng.randint(70, 600),
+            "model_name": f"Model {rng.randint(1, 99)}",
+            "model_year": rng.randint(1995, 2025),
+            "purchase_price": round(rng.uniform(3000, 150000), 2),
+            "fuel_type": rng.choice(["Petrol", "Diesel", "Hybrid", "Electric"]),
+        }
+
+
+def orm_body(repo, limit):
+    items, next_cursor = repo.page(limit=limit)
+    page = schemas.VehiclePage.model_validate({"items": items, "next_cursor": next_cursor}, from_attributes=True)
+    # Encoded like Starlette's JSONResponse
+    return json.dumps(page.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def core_body(repo, limit):
+    return repo.page_json(limit=limit)
+
+
+def measure(make_repo, build, limit, repeat):
+    """Best-of-`repeat` CPU seconds, then one traced run for peak allocated bytes."""
+    cpu = []
+    for _ in range(repeat):
+        repo = make_repo()  # fresh session: empty identity map, as per request
+        started = time.process_time()
+        build(repo, limit)
+        cpu.append(time.process_time() - started)
+        repo.db.close()
+
+    repo = make_repo()
+    tracemalloc.start()
+    body = build(repo, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    repo.db.close()
+    return min(cpu), peak, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'serialization.db')}")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(insert(models.Vehicle), list(rows(args.rows)))
+
+        Session = sessionmaker(bind=engine)
+        make_repo = lambda: VehicleRepository(Session())
+
+        print(f"{args.rows} rows per response")
+        print(f"{'path':<5} {'cpu us/row':>11} {'peak B/row':>11} {'body bytes':>11}")
+        for name, build in [("orm", orm_body), ("core", core_body)]:
+            cpu, peak, size = measure(make_repo, build, args.rows, args.repeat)
+            n = args.rows
+            print(f"{name:<5} {cpu / n * 1e6:>11.2f} {peak / n:>11.0f} {size:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# SQLite engine profile benchmark
+"""
+1. Builds the "default" and "production" engine profiles (app/database.py)
+   against fresh SQLite files seeded with vehicles.
+2. Runs reader threads (point lookups) alongside writer threads (updates)
+   for a fixed duration.
+3. Prints reads/sec, writes/sec and "database is locked" errors per profile.
+
+Usage: python bench/bench_sqlite_profile.py [--rows 10000] [--readers 8] [--writers 2] [--seconds 5]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import schemas  # noqa: E402
+from app.crud import VehicleRepository  # noqa: E402
+from app.database import Base, build_engines, routing_sessionmaker  # noqa: E402
+
+
+def vehicle(i: int) -> dict:
+    return {
+        "vin": f"PROF{i:08d}",
+        "manufacturer_name": "Bench",
+        "description": None,
+        "horse_power": 100 + i % 300,
+        "model_name": f"M{i % 50}",
+        "model_year": 2000 + i % 25,
+        "purchase_price": 10000.0 + i,
+        "fuel_type": "Petrol",
+    }
+
+
+def run_profile(profile: str, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        write_engine, read_engine = build_engines(f"sqlite:///{os.path.join(tmp, 'bench.db')}", profile)
+        Session = routing_sessionmaker(write_engine, read_engine, autoflush=False)
+        Base.metadata.create_all(bind=write_engine)
+
+        db = Session()
+        repo = VehicleRepository(db)
+        for start in range(0, args.rows, 1000):
+            repo.create_many([vehicle(i) for i in range(start, min(start + 1000, args.rows))])
+        db.close()
+
+        counts = {"reads": 0, "writes": 0, "locked": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + args.seconds
+
+        def reader():
+            done = 0
+            rng = random.Random()
+            while time.perf_counter() < deadline:
+                db = Session()
+                try:
+                    VehicleRepository(db).get(f"PROF{rng.randrange(args.rows):08d}")
+                    done += 1
+                except OperationalError:
+                    with lock:
+                        counts["locked"] += 1
+                finally:
+                    db.close()
+            with lock:
+                counts["reads"] += done
+
+        def writer():
+            done = 0
+            rng = random.Random()
+            while time.perf_counter() < deadline:
+                i = rng.randrange(args.rows)
+                data = {k: v for k, v in vehicle(i).items() if k != "vin"}
+                data["purchase_price"] += rng.random()
+                db = Session()
+                try:
+                    VehicleRepository(db).update(f"PROF{i:08d}", schemas.VehicleUpdate(**data))
+                    done += 1
+                except OperationalError:
+                    with lock:
+                        counts["locked"] += 1
+                finally:
+                    db.close()
+            with lock:
+                counts["writes"] += done
+
+        threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+        threads += [threading.Thread(target=writer) for _ in range(args.writers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        write_engine.dispose()
+        read_engine.dispose()
+        return {
+            "reads_per_sec": counts["reads"] / args.seconds,
+            "writes_per_sec": counts["writes"] / args.seconds,
+            "locked_errors": counts["locked"],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    print(f"{'profile':<11} {'reads/s':>9} {'writes/s':>9} {'locked':>7}")
+    for profile in ("default", "production"):
+        r = run_profile(profile, args)
+        print(f"{profile:<11} {r['reads_per_sec']:>9.0f} {r['writes_per_sec']:>9.0f} {r['locked_errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# Group-commit write benchmark
+"""
+1. Starts the API under uvicorn twice, with per-request commits and with
+   VEHICLE_WRITE_COALESCE=on, each against its own fresh SQLite file.
+2. Fires concurrent single-vehicle writes with httpx: POST /vehicle, and
+   with --update-every N every Nth request is a PUT to an existing vehicle.
+3. Prints writes/sec, p50 / p99 latency and failed requests (e.g. 500s from
+   "database is locked") per mode.
+
+Usage: python bench/bench_write_coalesce.py [--requests 3000] [--concurrency 64] [--workers 1]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def vehicle(i: int) -> dict:
+    return {
+        "vin": f"WRITE{i:08d}",
+        "manufacturer_name": "Bench",
+        "description": None,
+        "horse_power": 100 + i % 300,
+        "model_name": f"M{i % 50}",
+        "model_year": 2000 + i % 25,
+        "purchase_price": 10000.0 + i,
+        "fuel_type": "Petrol",
+    }
+
+
+def start_server(coalesce: bool, db_path: str, args) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "VEHICLE_DATABASE_URL": f"sqlite:///{db_path}",
+        "VEHICLE_DB_PROFILE": args.profile,
+        "VEHICLE_WRITE_COALESCE": "on" if coalesce else "off",
+        "VEHICLE_WRITE_COALESCE_WINDOW_MS": str(args.window_ms),
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient):
+    for _ in range(200):
+        try:
+            await client.get("/vehicle", params={"limit": 1})
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def run(client: httpx.AsyncClient, args) -> dict:
+    latencies, failed = [], 0
+    queue = iter(range(args.requests))
+
+    async def worker():
+        nonlocal failed
+        for i in queue:
+            started = time.perf_counter()
+            if args.update_every and i % args.update_every == 0 and i:
+                body = {k: v for k, v in vehicle(i).items() if k != "vin"}
+                r = await client.put(f"/vehicle/WRITE{i // 2:08d}", json=body)
+                ok = r.status_code in (200, 404)
+            else:
+                r = await client.post("/vehicle", json=vehicle(i))
+                ok = r.status_code == 201
+            latencies.append(time.perf_counter() - started)
+            failed += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    return {"wps": args.requests / elapsed, "p50_ms": pct(0.50), "p99_ms": pct(0.99), "failed": failed}
+
+
+async def bench_mode(coalesce: bool, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        server = start_server(coalesce, os.path.join(tmp, "bench.db"), args)
+        try:
+            limits = httpx.Limits(max_connections=args.concurrency)
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits, timeout=60) as client:
+                await wait_ready(client)
+                return await run(client, args)
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--update-every", type=int, default=0, help="make every Nth request a PUT (0 = creates only)")
+    parser.add_argument("--profile", default="default", help="VEHICLE_DB_PROFILE of the server")
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'writes/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'failed':>7}")
+    for name, coalesce in (("per-req", False), ("coalesced", True)):
+        r = asyncio.run(bench_mode(coalesce, args))
+        print(f"{name:<10} {r['wps']:>9.0f} {r['p50_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['failed']:>7}")
+
+
+if __name__ == "__main__":
+    main()
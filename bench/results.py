@@ -0,0 +1,81 @@
+# Result files and baseline comparison
+"""
+1. summarize() turns raw latencies into throughput and p50 / p95 / p99.
+2. save() / load() keep a run as JSON: run metadata plus one entry per scenario.
+3. compare() diffs a run against a baseline: a scenario regresses when its
+   throughput drops, or a latency percentile rises, by more than the threshold.
+"""
+import json
+import statistics
+
+# metric → +1 if higher is better, -1 if lower is better
+METRICS = {"rps": 1, "p50_ms": -1, "p95_ms": -1, "p99_ms": -1}
+
+
+def percentile(sorted_samples: list, p: float) -> float:
+    return sorted_samples[min(len(sorted_samples) - 1, int(p * len(sorted_samples)))]
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    """Throughput and latency percentiles (ms) for one scenario run."""
+    samples = sorted(latencies) or [0.0]
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.mean(samples) * 1000, 3),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 3),
+    }
+
+
+def save(path: str, meta: dict, scenarios: dict):
+    with open(path, "w") as fh:
+        json.dump({"meta": meta, "scenarios": scenarios}, fh, indent=2)
+
+
+def load(path: str) -> dict:
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def compare(baseline: dict, current: dict, threshold: float = 10.0, min_ms: float = 0.5) -> list[dict]:
+    """
+    One row per (scenario, metric) present in both runs, with the relative change
+    in percent and whether it is a regression. Latency changes smaller than
+    `min_ms` in absolute terms are treated as noise.
+    """
+    rows = []
+    for name, base in baseline["scenarios"].items():
+        cur = current["scenarios"].get(name)
+        if cur is None:
+            continue
+        for metric, direction in METRICS.items():
+            before, after = base[metric], cur[metric]
+            change = (after - before) / before * 100 if before else 0.0
+            worse = -change * direction  # positive = got worse, in percent
+            noise = metric.endswith("_ms") and abs(after - before) < min_ms
+            rows.append({
+                "scenario": name,
+                "metric": metric,
+                "baseline": before,
+                "current": after,
+                "change_pct": round(change, 1),
+                "regression": worse > threshold and not noise,
+            })
+    return rows
+
+
+def print_run(scenarios: dict):
+    print(f"{'scenario':<14} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, r in scenarios.items():
+        print(f"{name:<14} {r['rps']:>9.0f} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['errors']:>7}")
+
+
+def print_comparison(rows: list[dict]):
+    print(f"{'scenario':<14} {'metric':<7} {'baseline':>10} {'current':>10} {'change':>8}")
+    for r in rows:
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(f"{r['scenario']:<14} {r['metric']:<7} {r['baseline']:>10.2f} {r['current']:>10.2f} {r['change_pct']:>+7.1f}%{flag}")
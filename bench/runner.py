@@ -0,0 +1,112 @@
+# Scenario runner
+"""
+1. Seeds a fresh SQLite file once per run, then plays each scenario's
+   requests with `concurrency` concurrent clients, after a short warm-up.
+2. Targets:
+   - inprocess: the ASGI app called through httpx.ASGITransport (no sockets),
+     isolating application cost from the HTTP server.
+   - uvicorn: a local `uvicorn app.main:app` subprocess over real HTTP.
+3. Settings go to the app as VEHICLE_* environment variables in both targets.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from . import data, results, scenarios
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def play(client: httpx.AsyncClient, requests: list, concurrency: int):
+    """Send every request with `concurrency` workers; return (latencies, errors, elapsed)."""
+    latencies = []
+    errors = 0
+    queue = iter(requests)
+
+    async def worker():
+        nonlocal errors
+        for req in queue:
+            started = time.perf_counter()
+            try:
+                response = await client.request(req.method, req.path, params=req.params, json=req.json)
+                ok = response.status_code in req.expect
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def run_scenarios(client, names, args) -> dict:
+    ctx = scenarios.Context(args.rows, args.seed)
+    out = {}
+    for name in names:
+        if args.warmup:
+            await play(client, scenarios.build(name, ctx, args.warmup, seed=-1), args.concurrency)
+        requests = scenarios.build(name, ctx, args.requests, seed=args.seed)
+        if not requests:
+            print(f"{name}: no requests left to send, skipped", file=sys.stderr)
+            continue
+        out[name] = results.summarize(*await play(client, requests, args.concurrency))
+    return out
+
+
+def _wait_ready(base_url: str, server: subprocess.Popen):
+    for _ in range(300):
+        if server.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            httpx.get(f"{base_url}/vehicle/stats", timeout=1)
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError("uvicorn did not start")
+
+
+def run(names, args, db_path: str, env: dict) -> dict:
+    """Seed the database, then run the scenarios against the chosen target."""
+    url = f"sqlite:///{db_path}"
+    env = {**env, "VEHICLE_DATABASE_URL": url}
+    if args.target == "inprocess":
+        os.environ.update(env)  # read by app.config, which seeding imports first
+
+    started = time.perf_counter()
+    data.seed_database(url, args.rows, args.seed)
+    print(f"seeded {args.rows} rows in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+
+    if args.target == "inprocess":
+        from app.main import app
+
+        async def main():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+                return await run_scenarios(client, names, args)
+
+        return asyncio.run(main())
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=ROOT, env={**os.environ, **env},
+    )
+    try:
+        _wait_ready(base_url, server)
+
+        async def main():
+            async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+                return await run_scenarios(client, names, args)
+
+        return asyncio.run(main())
+    finally:
+        server.terminate()
+        server.wait()
@@ -0,0 +1,112 @@
+# Request scenarios
+"""
+1. Each operation builds one request (method, path, params, json, expected statuses)
+   from a seeded RNG, so a scenario replays the same requests on every run.
+2. A scenario is a weighted mix of operations: one per /vehicle route, plus
+   mixed read/write ratios.
+3. Rows [0, hot) are read and updated; the last 10% of the seeded rows are
+   reserved for deletes, and creates use fresh indexes past the seeded rows.
+"""
+import random
+from dataclasses import dataclass, field
+
+from . import data
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    params: dict | None = None
+    json: dict | None = None
+    expect: tuple = (200,)
+
+
+@dataclass
+class Context:
+    """Shared across scenarios of one run, so VINs are never created or deleted twice."""
+    rows: int
+    seed: int = 42
+    hot: int = field(init=False)
+    next_create: int = field(init=False)
+    next_delete: int = field(init=False)
+
+    def __post_init__(self):
+        self.hot = max(1, self.rows - self.rows // 10)
+        self.next_create = self.rows
+        self.next_delete = self.hot
+
+    @property
+    def deletes_left(self) -> int:
+        return self.rows - self.next_delete
+
+
+def point_read(ctx, rng):
+    return Request("GET", f"/vehicle/{data.vin(rng.randrange(ctx.hot), ctx.seed)}")
+
+
+def list_page(ctx, rng):
+    params = {"limit": 100}
+    shape = rng.randrange(4)
+    if shape == 1:
+        params["manufacturer_name"] = rng.choice(list(data.MAKES))
+    elif shape == 2:
+        year = rng.randint(1995, 2020)
+        params |= {"model_year_min": year, "model_year_max": year + 5, "sort": "-purchase_price"}
+    elif shape == 3:
+        params |= {"fuel_type": rng.choice(data.FUELS), "sort": "model_year"}
+    return Request("GET", "/vehicle", params=params)
+
+
+def search(ctx, rng):
+    return Request("GET", "/vehicle/search", params={"q": " ".join(rng.sample(data.WORDS, 2)), "limit": 20})
+
+
+def stats(ctx, rng):
+    dims = ["manufacturer_name", "model_year", "fuel_type"]
+    return Request("GET", "/vehicle/stats", params={"group_by": rng.sample(dims, rng.randint(0, 2))})
+
+
+def create(ctx, rng):
+    i = ctx.next_create
+    ctx.next_create += 1
+    return Request("POST", "/vehicle", json=data.vehicle(i, rng, ctx.seed), expect=(201,))
+
+
+def update(ctx, rng):
+    i = rng.randrange(ctx.hot)
+    payload = data.vehicle(i, rng, ctx.seed)
+    return Request("PUT", f"/vehicle/{payload.pop('vin')}", json=payload)
+
+
+def delete(ctx, rng):
+    i = ctx.next_delete
+    ctx.next_delete += 1
+    return Request("DELETE", f"/vehicle/{data.vin(i, ctx.seed)}", expect=(204,))
+
+
+# name → [(weight, operation)]
+SCENARIOS = {
+    "point_read": [(1, point_read)],
+    "list": [(1, list_page)],
+    "search": [(1, search)],
+    "stats": [(1, stats)],
+    "create": [(1, create)],
+    "update": [(1, update)],
+    "delete": [(1, delete)],
+    "mixed_95_5": [(95, point_read), (5, update)],
+    "mixed_80_20": [(70, point_read), (10, list_page), (10, update), (10, create)],
+    "mixed_50_50": [(50, point_read), (50, update)],
+}
+
+
+def build(name: str, ctx: Context, count: int, seed: int = 0) -> list[Request]:
+    """Generate `count` requests for a scenario (fewer for deletes once the reserved rows run out)."""
+    mix = SCENARIOS[name]
+    if any(op is delete for _, op in mix):
+        count = min(count, ctx.deletes_left)
+
+    rng = random.Random(f"{name}:{seed}")
+    weights = [w for w, _ in mix]
+    ops = [op for _, op in mix]
+    return [rng.choices(ops, weights)[0](ctx, rng) for _ in range(count)]
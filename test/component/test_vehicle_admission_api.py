@@ -0,0 +1,158 @@
+# Component tests for admission control
+"""
+1. Run the API against a temporary DB with a small AdmissionController in place.
+2. Validate slot release, fast 503 + Retry-After when a budget is saturated,
+   shedding at the queue-time deadline, separate read / write budgets and metrics.
+3. Exercise Budget's FIFO hand-over directly on an event loop.
+"""
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import admission
+from app.database import Base, get_db
+from app.main import app
+
+TEST_DB_URL = "sqlite:///./test_admission.db"
+
+engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def controller():
+    """A one-slot-per-budget controller installed for this module only."""
+    previous = admission.controller
+    admission.controller = admission.AdmissionController(
+        read_limit=1, write_limit=1, queue_size=1, max_wait=0.05,
+    )
+    yield admission.controller
+    admission.controller = previous
+
+
+@pytest.fixture(scope="module")
+def client(controller):
+    """TestClient bound to this module's DB; restores any previous override afterwards."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def vehicle(vin):
+    return {
+        "vin": vin,
+        "manufacturer_name": "Opel",
+        "description": None,
+        "horse_power": 100,
+        "model_name": "Corsa",
+        "model_year": 2019,
+        "purchase_price": 13000.0,
+        "fuel_type": "Petrol",
+    }
+
+
+def test_requests_release_their_slot(client, controller):
+    assert client.post("/vehicle", json=vehicle("ADM1")).status_code == 201
+    assert client.get("/vehicle/ADM1").status_code == 200
+    assert client.get("/vehicle/ADM404").status_code == 404
+    assert controller.read.active == 0 and controller.write.active == 0
+
+
+def test_saturated_budget_sheds_fast_without_starving_the_other(client, controller):
+    controller.read.active = controller.read.limit  # every read slot busy
+    controller.read.queue_size = 0
+    try:
+        started = time.perf_counter()
+        r = client.get("/vehicle/ADM1")
+        assert r.status_code == 503
+        assert r.headers["Retry-After"] == "1"
+        assert time.perf_counter() - started < 0.05  # not queued at all
+
+        assert client.post("/vehicle", json=vehicle("ADM2")).status_code == 201  # writes unaffected
+        assert client.get("/metrics").status_code == 200  # unlimited route
+    finally:
+        controller.read.active = 0
+        controller.read.queue_size = 1
+
+
+def test_queued_request_is_shed_at_deadline(client, controller):
+    controller.write.active = controller.write.limit
+    try:
+        started = time.perf_counter()
+        r = client.delete("/vehicle/ADM1")
+        assert r.status_code == 503
+        assert time.perf_counter() - started >= controller.write.max_wait
+    finally:
+        controller.write.active = 0
+    assert controller.write.queued == 0
+
+    body = client.get("/metrics").text
+    assert 'admission_shed_total{budget="write",reason="deadline"} 1' in body
+    assert 'admission_shed_total{budget="read",reason="queue_full"} 1' in body
+    assert 'admission_queue_depth{budget="write"} 0' in body
+
+
+async def settle():
+    """Let queued tasks run until they block again."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_budget_hands_slots_to_waiters_in_order():
+    async def scenario():
+        budget = admission.Budget("test", limit=1, queue_size=2, max_wait=1.0)
+        admitted = []
+
+        async def request(name):
+            await budget.acquire()
+            admitted.append(name)
+
+        await budget.acquire()
+        waiters = [asyncio.create_task(request(name)) for name in ("first", "second")]
+        await settle()
+        assert budget.queued == 2
+        with pytest.raises(HTTPException):
+            await budget.acquire()  # queue full: shed immediately
+
+        budget.release()
+        await settle()
+        assert admitted == ["first"] and budget.active == 1
+        budget.release()
+        await asyncio.gather(*waiters)
+        assert admitted == ["first", "second"]
+        budget.release()
+        assert budget.active == 0 and budget.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_route_overrides_are_parsed():
+    routes = admission.parse_routes("POST /vehicle/bulk-update=3, GET  /vehicle/export=none")
+    assert routes == {"POST /vehicle/bulk-update": "3", "GET /vehicle/export": "none"}
+    controller = admission.AdmissionController(2, 2, 4, 0.1, routes=routes)
+    assert controller.budget_for("POST", "/vehicle/bulk-update").limit == 3
+    assert controller.budget_for("GET", "/vehicle/export") is None
+    assert controller.budget_for("POST", "/vehicle/lookup") is controller.read
+    assert controller.budget_for("PATCH", "/vehicle/{vin}") is controller.write
+    with pytest.raises(ValueError):
+        admission.parse_routes("GET /vehicle")
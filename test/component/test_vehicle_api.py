@@ -95,7 +95,7 @@ def test_duplicate_vehicle():
 
 def test_get_all_vehicles():
     """
-    Tests returning all vehicles.
+    Tests returning the first page of vehicles.
     Verifies:
       - API returns HTTP 200
       - Exactly one vehicle exists in DB
@@ -103,9 +103,28 @@ def test_get_all_vehicles():
     """
     r = client.get("/vehicle")
     assert r.status_code == 200
-    data = r.json()
+    data = r.json()["items"]
     assert len(data) == 1
     assert data[0]["vin"] == "ABC123"
+    assert r.json()["next_cursor"] is None
+
+
+def test_get_all_vehicles_filtered():
+    """
+    Tests that list filters are applied.
+    A manufacturer that does not exist yields an empty page.
+    """
+    r = client.get("/vehicle", params={"manufacturer_name": "Tesla"})
+    assert r.status_code == 200
+    assert r.json()["items"] == []
+
+
+def test_get_all_vehicles_invalid_cursor():
+    """
+    Tests that a malformed cursor returns HTTP 400.
+    """
+    r = client.get("/vehicle", params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
 
 
 def test_get_vehicle_success():
@@ -120,6 +139,16 @@ def test_get_vehicle_success():
     assert r.json()["vin"] == "ABC123"
 
 
+def test_read_routes_keep_documented_schema():
+    """
+    Tests that the ORM-free read routes still document their response models.
+    """
+    paths = client.get("/openapi.json").json()["paths"]
+    schema_of = lambda path: paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema_of("/vehicle") == {"$ref": "#/components/schemas/VehiclePage"}
+    assert schema_of("/vehicle/{vin}") == {"$ref": "#/components/schemas/VehicleResponse"}
+
+
 def test_get_vehicle_not_found():
     """
     Tests retrieving a non-existent VIN.
@@ -129,6 +158,53 @@ def test_get_vehicle_not_found():
     assert r.status_code == 404
 
 
+# ---------------------------------------------------
+# GET /vehicle/search
+# ---------------------------------------------------
+
+def test_search_vehicles():
+    """
+    Tests full-text search.
+    Verifies:
+      - Prefixes of model and description words find the vehicle
+      - A query without words returns HTTP 400
+    """
+    r = client.get("/vehicle/search", params={"q": "coroll sed"})
+    assert r.status_code == 200
+    assert [v["vin"] for v in r.json()["items"]] == ["ABC123"]
+
+    r = client.get("/vehicle/search", params={"q": "!!"})
+    assert r.status_code == 400
+
+
+# ---------------------------------------------------
+# GET /vehicle/stats
+# ---------------------------------------------------
+
+def test_vehicle_stats():
+    """
+    Tests fleet statistics.
+    Verifies:
+      - Groups by the requested dimensions with count and aggregates
+      - An unknown dimension returns HTTP 422
+    """
+    r = client.get("/vehicle/stats", params={"group_by": ["manufacturer_name", "fuel_type"]})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["group_by"] == ["manufacturer_name", "fuel_type"]
+    assert body["groups"] == [{
+        "manufacturer_name": "Toyota",
+        "model_year": None,
+        "fuel_type": "Petrol",
+        "count": 1,
+        "purchase_price": {"sum": 20000.0, "avg": 20000.0, "min": 20000.0, "max": 20000.0},
+        "horse_power": {"sum": 130.0, "avg": 130.0, "min": 130.0, "max": 130.0},
+    }]
+
+    r = client.get("/vehicle/stats", params={"group_by": "color"})
+    assert r.status_code == 422
+
+
 # ---------------------------------------------------
 # PUT /vehicle/{vin}
 # ---------------------------------------------------
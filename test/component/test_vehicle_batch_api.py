@@ -0,0 +1,80 @@
+# Component tests for POST /vehicle/batch
+"""
+1. Run bulk creation through the API against a temporary DB.
+2. Validate per-item results, best_effort vs all_or_nothing, and size limits.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import schemas
+from app.database import Base, get_db
+from app.main import app
+
+TEST_DB_URL = "sqlite:///./test_batch.db"
+
+engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient bound to this module's DB; restores any previous override afterwards."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def vehicle(vin):
+    return {
+        "vin": vin,
+        "manufacturer_name": "Nissan",
+        "description": None,
+        "horse_power": 147,
+        "model_name": "Leaf",
+        "model_year": 2022,
+        "purchase_price": 28000.0,
+        "fuel_type": "Electric",
+    }
+
+
+def test_batch_best_effort(client):
+    """Returns 201 with a result per item; duplicates do not block valid items."""
+    r = client.post("/vehicle/batch", json={"items": [vehicle("B1"), vehicle("B2"), vehicle("b1")]})
+    assert r.status_code == 201
+    body = r.json()
+    assert body["created"] == 2
+    assert [i["status"] for i in body["results"]] == ["created", "created", "duplicate"]
+    assert client.get("/vehicle/B2").status_code == 200
+
+
+def test_batch_all_or_nothing_conflict(client):
+    """A duplicate in an all_or_nothing batch returns 400 and writes nothing."""
+    r = client.post("/vehicle/batch", json={"items": [vehicle("B3"), vehicle("B1")], "mode": "all_or_nothing"})
+    assert r.status_code == 400
+    statuses = [i["status"] for i in r.json()["detail"]["results"]]
+    assert statuses == ["skipped", "duplicate"]
+    assert client.get("/vehicle/B3").status_code == 404
+
+
+def test_batch_size_limit(client):
+    """Empty and oversized batches are rejected by validation."""
+    assert client.post("/vehicle/batch", json={"items": []}).status_code == 422
+    too_many = [vehicle(f"X{i}") for i in range(schemas.MAX_BATCH_SIZE + 1)]
+    assert client.post("/vehicle/batch", json={"items": too_many}).status_code == 422
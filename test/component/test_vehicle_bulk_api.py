@@ -0,0 +1,86 @@
+# Component tests for bulk update / delete by filter
+"""
+1. Run POST /vehicle/bulk-update and /vehicle/bulk-delete against a temporary DB.
+2. Validate dry runs, affected counts and request validation.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.main import app
+
+TEST_DB_URL = "sqlite:///./test_bulk.db"
+
+engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient bound to this module's DB; restores any previous override afterwards."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def vehicle(vin, make="Ford", year=2015, fuel="Diesel"):
+    return {
+        "vin": vin,
+        "manufacturer_name": make,
+        "description": "Van",
+        "horse_power": 130,
+        "model_name": "Transit",
+        "model_year": year,
+        "purchase_price": 20000.0,
+        "fuel_type": fuel,
+    }
+
+
+def test_bulk_update(client):
+    items = [vehicle("FLEET1"), vehicle("FLEET2"), vehicle("FLEET3", fuel="Petrol"), vehicle("FLEET4", make="Opel")]
+    client.post("/vehicle/batch", json={"items": items})
+    request = {"filter": {"model_year": 2015, "fuel_type": "Diesel"}, "changes": {"purchase_price": 15000.0}}
+
+    r = client.post("/vehicle/bulk-update", json=request | {"dry_run": True})
+    assert r.json() == {"dry_run": True, "matched": 3, "affected": 0}
+    assert client.get("/vehicle/FLEET1").json()["purchase_price"] == 20000.0
+
+    r = client.post("/vehicle/bulk-update", json=request)
+    assert r.status_code == 200
+    assert r.json() == {"dry_run": False, "matched": 3, "affected": 3}
+    assert client.get("/vehicle/FLEET4").json()["purchase_price"] == 15000.0
+    assert client.get("/vehicle/FLEET3").json()["purchase_price"] == 20000.0
+
+
+def test_bulk_delete(client):
+    request = {"filter": {"manufacturer_name": "Ford"}}
+    assert client.post("/vehicle/bulk-delete", json=request | {"dry_run": True}).json()["matched"] == 3
+
+    r = client.post("/vehicle/bulk-delete", json=request)
+    assert r.json() == {"dry_run": False, "matched": 3, "affected": 3}
+    assert client.get("/vehicle/FLEET1").status_code == 404
+    assert [v["vin"] for v in client.get("/vehicle").json()["items"]] == ["FLEET4"]
+
+
+def test_bulk_requests_validated(client):
+    assert client.post("/vehicle/bulk-delete", json={"filter": {}}).status_code == 422
+    assert client.post("/vehicle/bulk-update", json={"filter": {"model_year": 2015}, "changes": {}}).status_code == 422
+    r = client.post("/vehicle/bulk-update", json={"filter": {"model_year": 2015}, "changes": {"fuel_type": None}})
+    assert r.status_code == 422
@@ -0,0 +1,80 @@
+# Component tests for delta sync
+"""
+1. Drive GET /vehicle/changes against a temporary DB.
+2. Validate full sync, incremental sync with tombstones, paging and cursor errors.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import encode_cursor
+from app.database import Base, get_db
+from app.main import app
+
+TEST_DB_URL = "sqlite:///./test_delta.db"
+
+engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient bound to this module's DB; restores any previous override afterwards."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def vehicle(vin):
+    return {
+        "vin": vin,
+        "manufacturer_name": "Skoda",
+        "description": None,
+        "horse_power": 150,
+        "model_name": "Octavia",
+        "model_year": 2020,
+        "purchase_price": 24000.0,
+        "fuel_type": "Diesel",
+    }
+
+
+def test_full_then_incremental_sync(client):
+    for vin in ("DELTA1", "DELTA2", "DELTA3"):
+        assert client.post("/vehicle", json=vehicle(vin)).status_code == 201
+
+    first = client.get("/vehicle/changes", params={"limit": 2}).json()
+    assert [v["vin"] for v in first["items"]] == ["DELTA1", "DELTA2"] and first["has_more"]
+    rest = client.get("/vehicle/changes", params={"since": first["next_cursor"]}).json()
+    assert [v["vin"] for v in rest["items"]] == ["DELTA3"] and not rest["has_more"]
+    cursor = rest["next_cursor"]
+
+    idle = client.get("/vehicle/changes", params={"since": cursor}).json()
+    assert idle == {"items": [], "deleted": [], "next_cursor": cursor, "has_more": False}
+
+    client.patch("/vehicle/DELTA1", json={"purchase_price": 22000.0})
+    client.delete("/vehicle/DELTA2")
+    delta = client.get("/vehicle/changes", params={"since": cursor}).json()
+    assert [(v["vin"], v["purchase_price"]) for v in delta["items"]] == [("DELTA1", 22000.0)]
+    assert delta["deleted"] == ["DELTA2"]
+
+
+def test_bad_cursors(client):
+    assert client.get("/vehicle/changes", params={"since": "garbage"}).status_code == 400
+    foreign = encode_cursor(None, "changes", ["another-db", 0])
+    assert client.get("/vehicle/changes", params={"since": foreign}).status_code == 410
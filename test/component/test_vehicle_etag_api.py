@@ -0,0 +1,163 @@
+# Component tests for ETags and conditional requests
+"""
+1. Validate ETags on single vehicles and pages against a temporary DB.
+2. Validate If-None-Match (304) and If-Match (412) handling.
+3. Validate PATCH partial updates and their version check (409).
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.main import app
+
+TEST_DB_URL = "sqlite:///./test_etag.db"
+
+engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient bound to this module's DB; restores any previous override afterwards."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+vehicle_payload = {
+    "vin": "ETAG1",
+    "manufacturer_name": "Volvo",
+    "description": "Estate",
+    "horse_power": 250,
+    "model_name": "V60",
+    "model_year": 2022,
+    "purchase_price": 45000.0,
+    "fuel_type": "Hybrid",
+}
+update_payload = {k: v for k, v in vehicle_payload.items() if k != "vin"}
+
+
+def test_versions_grow_with_every_write(client):
+    created = client.post("/vehicle", json=vehicle_payload)
+    assert created.status_code == 201
+    assert created.headers["ETag"] == f'"v{created.json()["version"]}"'
+
+    r = client.get("/vehicle/ETAG1")
+    assert r.headers["ETag"] == created.headers["ETag"]
+
+    updated = client.put("/vehicle/ETAG1", json=update_payload | {"horse_power": 260})
+    assert updated.json()["version"] > created.json()["version"]
+    assert updated.headers["ETag"] != created.headers["ETag"]
+
+    # A re-created VIN never reuses an old version
+    client.delete("/vehicle/ETAG1")
+    recreated = client.post("/vehicle", json=vehicle_payload)
+    assert recreated.json()["version"] > updated.json()["version"]
+
+
+def test_if_none_match_on_single_vehicle(client):
+    etag = client.get("/vehicle/ETAG1").headers["ETag"]
+
+    r = client.get("/vehicle/etag1", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["ETag"] == etag
+    assert r.content == b""
+
+    r = client.get("/vehicle/ETAG1", headers={"If-None-Match": '"v0", W/' + etag})
+    assert r.status_code == 304
+
+    r = client.get("/vehicle/ETAG1", headers={"If-None-Match": '"v0"'})
+    assert r.status_code == 200
+
+    r = client.get("/vehicle/MISSING", headers={"If-None-Match": "*"})
+    assert r.status_code == 404
+
+
+def test_collection_etag_follows_writes(client):
+    first = client.get("/vehicle")
+    etag = first.headers["ETag"]
+    assert client.get("/vehicle", headers={"If-None-Match": etag}).status_code == 304
+
+    # Cached page bytes are identical to the freshly serialized ones
+    assert client.get("/vehicle").content == first.content
+
+    client.post("/vehicle", json=vehicle_payload | {"vin": "ETAG2"})
+    r = client.get("/vehicle", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+    assert [v["vin"] for v in r.json()["items"]] == ["ETAG1", "ETAG2"]
+
+
+def test_if_match_on_update_and_delete(client):
+    etag = client.get("/vehicle/ETAG2").headers["ETag"]
+    client.put("/vehicle/ETAG2", json=update_payload | {"horse_power": 300})
+
+    # Stale ETag: rejected, current ETag reported
+    r = client.put("/vehicle/ETAG2", json=update_payload, headers={"If-Match": etag})
+    assert r.status_code == 412
+    current = r.headers["ETag"]
+    assert client.get("/vehicle/ETAG2").json()["horse_power"] == 300
+
+    r = client.delete("/vehicle/ETAG2", headers={"If-Match": etag})
+    assert r.status_code == 412
+
+    r = client.put("/vehicle/ETAG2", json=update_payload, headers={"If-Match": current})
+    assert r.status_code == 200
+    current = r.headers["ETag"]
+
+    # Weak ETags never satisfy If-Match
+    assert client.delete("/vehicle/ETAG2", headers={"If-Match": "W/" + current}).status_code == 412
+    assert client.delete("/vehicle/ETAG2", headers={"If-Match": current}).status_code == 204
+    assert client.delete("/vehicle/ETAG2", headers={"If-Match": current}).status_code == 404
+
+
+def test_patch_writes_only_sent_fields(client):
+    created = client.post("/vehicle", json=vehicle_payload | {"vin": "PATCH1"}).json()
+
+    r = client.patch("/vehicle/patch1", json={"purchase_price": 41000.0})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["purchase_price"] == 41000.0
+    assert body["description"] == "Estate"  # not sent, not cleared
+    assert body["version"] > created["version"]
+    assert r.headers["ETag"] == f'"v{body["version"]}"'
+
+    assert client.patch("/vehicle/PATCH1", json={}).status_code == 422
+    assert client.patch("/vehicle/PATCH1", json={"model_name": None}).status_code == 422
+    assert client.patch("/vehicle/MISSING", json={"horse_power": 1}).status_code == 404
+
+
+def test_patch_version_conflict(client):
+    current = client.get("/vehicle/PATCH1").json()["version"]
+
+    r = client.patch("/vehicle/PATCH1", json={"horse_power": 300, "version": current})
+    assert r.status_code == 200
+    newer = r.json()["version"]
+
+    # A second writer still holding the old version loses, and learns the current one
+    r = client.patch("/vehicle/PATCH1", json={"horse_power": 1, "version": current})
+    assert r.status_code == 409
+    assert r.json()["detail"]["version"] == newer
+    assert r.headers["ETag"] == f'"v{newer}"'
+    assert client.get("/vehicle/PATCH1").json()["horse_power"] == 300
+
+    # Without a body version, If-Match applies as on PUT
+    r = client.patch("/vehicle/PATCH1", json={"horse_power": 1}, headers={"If-Match": f'"v{current}"'})
+    assert r.status_code == 412
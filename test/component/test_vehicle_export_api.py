@@ -0,0 +1,99 @@
+# Component tests for the streaming export endpoint
+"""
+1. Seed a temporary DB directly through VehicleRepository.
+2. Validate NDJSON and CSV bodies, filters, and gzip encoding of GET /vehicle/export.
+"""
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import schemas
+from app.crud import VehicleRepository
+from app.database import Base, get_db
+from app.main import app
+
+TEST_DB_URL = "sqlite:///./test_export.db"
+
+engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient bound to this module's DB; restores any previous override afterwards."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+
+    db = TestingSessionLocal()
+    repo = VehicleRepository(db)
+    for i in range(25):
+        repo.create(schemas.VehicleCreate(
+            vin=f"EXP{i:03d}",
+            manufacturer_name="Volvo" if i % 5 == 0 else "Mazda",
+            description="Wagon, 5 doors",
+            horse_power=150 + i,
+            model_name="V60" if i % 5 == 0 else "CX-5",
+            model_year=2020,
+            purchase_price=30000.0 + i,
+            fuel_type="Diesel",
+        ))
+    db.close()
+
+    yield TestClient(app)
+
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def test_export_ndjson(client):
+    """Every row is emitted as one JSON object per line, in VIN order."""
+    r = client.get("/vehicle/export")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert len(rows) == 25
+    assert rows[0]["vin"] == "EXP000"
+    assert rows[0]["description"] == "Wagon, 5 doors"
+
+
+def test_export_csv_with_filter(client):
+    """CSV export starts with a header row and honours list filters."""
+    r = client.get("/vehicle/export", params={"format": "csv", "manufacturer_name": "Volvo"})
+    assert r.status_code == 200
+
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert [row["vin"] for row in rows] == ["EXP000", "EXP005", "EXP010", "EXP015", "EXP020"]
+    assert rows[0]["description"] == "Wagon, 5 doors"
+
+
+def test_export_gzip(client):
+    """gzip=true sets Content-Encoding; the client transparently decodes the body."""
+    r = client.get("/vehicle/export", params={"gzip": True})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert len(r.text.splitlines()) == 25
+
+
+def test_export_rejects_unknown_format(client):
+    """Only ndjson and csv are accepted."""
+    r = client.get("/vehicle/export", params={"format": "xml"})
+    assert r.status_code == 422
@@ -0,0 +1,112 @@
+# Component tests for the change feed
+"""
+1. Read GET /vehicle/feed (Server-Sent Events) and /vehicle/feed/ws (WebSocket)
+   against a temporary DB, with follow=false so the streams end once caught up.
+2. Validate batching, resume by sequence / Last-Event-ID and resync after pruning.
+"""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.websockets import WebSocketDisconnect
+
+from app import changelog
+from app.database import Base, get_db
+from app.main import app
+
+TEST_DB_URL = "sqlite:///./test_feed.db"
+
+engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient bound to this module's DB; restores any previous override afterwards."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def vehicle(vin):
+    return {
+        "vin": vin,
+        "manufacturer_name": "Honda",
+        "description": "Hatch",
+        "horse_power": 130,
+        "model_name": "Jazz",
+        "model_year": 2019,
+        "purchase_price": 15000.0,
+        "fuel_type": "Hybrid",
+    }
+
+
+def sse(body: str) -> list[dict]:
+    """Parse the `changes` events of an SSE body into {"id", "data"} dicts."""
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":") and ": " in line)
+        if fields.get("event") == "changes":
+            events.append({"id": int(fields["id"]), "data": json.loads(fields["data"])})
+    return events
+
+
+def test_sse_feed_resumes_after_sequence(client):
+    client.post("/vehicle", json=vehicle("FEED1"))
+    client.patch("/vehicle/FEED1", json={"purchase_price": 14000.0})
+    client.delete("/vehicle/FEED1")
+
+    r = client.get("/vehicle/feed", params={"after": 0, "follow": False})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = sse(r.text)
+    assert len(events) == 1  # one batch
+    changes = events[0]["data"]
+    assert [(c["seq"], c["op"]) for c in changes] == [(1, "create"), (2, "update"), (3, "delete")]
+    assert changes[1]["changes"] == {"purchase_price": 14000.0}
+    assert events[0]["id"] == 3
+
+    # Reconnect with Last-Event-ID: only what came after
+    client.post("/vehicle", json=vehicle("FEED2"))
+    r = client.get("/vehicle/feed", params={"follow": False}, headers={"Last-Event-ID": "3"})
+    assert [c["vin"] for e in sse(r.text) for c in e["data"]] == ["FEED2"]
+
+
+def test_websocket_feed(client):
+    with client.websocket_connect("/vehicle/feed/ws?after=2&follow=false") as ws:
+        message = json.loads(ws.receive_text())
+        assert message["position"] == 4
+        assert [c["op"] for c in message["changes"]] == ["delete", "create"]
+        with pytest.raises(WebSocketDisconnect):
+            ws.receive_text()  # caught up: the server closes
+
+
+def test_pruned_position_requires_resync(client):
+    with engine.begin() as conn:
+        changelog.prune(conn, max_rows=1, max_age=3600)
+
+    r = client.get("/vehicle/feed", params={"after": 1, "follow": False})
+    assert r.status_code == 410
+    assert client.get("/vehicle/feed", params={"after": 3, "follow": False}).status_code == 200
+
+    with client.websocket_connect("/vehicle/feed/ws?after=0") as ws:
+        with pytest.raises(WebSocketDisconnect) as exc:
+            ws.receive_text()
+        assert exc.value.code == changelog.RESYNC_CLOSE_CODE
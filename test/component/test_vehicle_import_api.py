@@ -0,0 +1,184 @@
+# Component tests for background imports
+"""
+1. Upload CSV / NDJSON bodies to POST /vehicle/import against a temporary DB.
+2. Wait for the background worker and check GET /vehicle/import/{job_id}.
+3. Verify that an interrupted job resumes from its last committed chunk.
+"""
+import json
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import imports, models
+from app.database import Base, get_db
+from app.main import app
+
+TEST_DB_URL = "sqlite:///./test_import.db"
+
+engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+HEADER = "vin,manufacturer_name,description,horse_power,model_name,model_year,purchase_price,fuel_type\n"
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    """TestClient bound to this module's DB, spooling uploads to a temp dir."""
+    previous_dir = imports.IMPORT_DIR
+    imports.IMPORT_DIR = str(tmp_path_factory.mktemp("imports"))
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+
+    yield TestClient(app)
+
+    imports.IMPORT_DIR = previous_dir
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def csv_row(vin, hp="200"):
+    return f'{vin},Subaru,"AWD, boxer",{hp},Outback,2021,31000,Petrol\n'
+
+
+def upload(client, body, fmt="csv"):
+    r = client.post("/vehicle/import", params={"format": fmt}, content=body)
+    assert r.status_code == 202
+    job_id = r.json()["id"]
+    imports.wait(job_id, timeout=30)
+    return client.get(f"/vehicle/import/{job_id}").json()
+
+
+def test_import_csv_reports_progress_and_rejects(client):
+    """Valid rows are created; bad rows are reported with their line numbers."""
+    body = HEADER + csv_row("IMP1") + csv_row("IMP2", hp="lots") + "IMP3,too,few\n" + csv_row("imp1")
+    report = upload(client, body)
+
+    assert report["status"] == "completed"
+    assert report["rows_processed"] == 4
+    assert report["rows_created"] == 1
+    assert report["bytes_processed"] == report["total_bytes"] == len(body)
+    assert report["eta_seconds"] == 0
+    assert [(r["line"], r["vin"]) for r in report["rejects"]] == [(3, "IMP2"), (4, None), (5, "IMP1")]
+    assert client.get("/vehicle/IMP1").json()["description"] == "AWD, boxer"
+
+
+def test_import_ndjson(client):
+    """NDJSON uploads are parsed line by line."""
+    rows = [
+        {"vin": "ND1", "manufacturer_name": "Kia", "horse_power": 201, "model_name": "EV6",
+         "model_year": 2023, "purchase_price": 42000, "fuel_type": "Electric"},
+        "not json",
+    ]
+    body = "\n".join(json.dumps(r) if isinstance(r, dict) else r for r in rows) + "\n"
+    report = upload(client, body, fmt="ndjson")
+
+    assert report["rows_created"] == 1
+    assert report["rejects"][0]["line"] == 2
+    assert report["rejects"][0]["detail"].startswith("invalid JSON")
+
+
+def test_import_unknown_job(client):
+    """Unknown job ids return 404; empty uploads are refused."""
+    assert client.get("/vehicle/import/nope").status_code == 404
+    assert client.post("/vehicle/import", content=b"").status_code == 400
+
+
+def test_spooled_uploads_are_deleted_when_done(client):
+    """Finished jobs and refused uploads leave nothing in the import dir."""
+    assert upload(client, HEADER + csv_row("SPOOL1"))["status"] == "completed"
+    assert client.post("/vehicle/import", content=b"").status_code == 400
+    assert os.listdir(imports.IMPORT_DIR) == []
+
+
+def test_import_resumes_from_committed_chunk(tmp_path):
+    """A job restarted mid-file skips rows already committed in earlier chunks."""
+    first, rest = HEADER + csv_row("RES1"), csv_row("RES2") + csv_row("RES3")
+    path = tmp_path / "resume.csv"
+    path.write_text(first + rest)
+
+    db = TestingSessionLocal()
+    db.add(models.ImportJob(
+        id="resume", format="csv", path=str(path), total_bytes=len(first + rest),
+        status="running", committed_offset=len(first), committed_line=2, rows_processed=1,
+    ))
+    db.commit()
+    db.close()
+
+    imports.run_job(TestingSessionLocal, "resume")
+
+    db = TestingSessionLocal()
+    job = db.get(models.ImportJob, "resume")
+    assert job.status == "completed"
+    assert job.rows_processed == 3
+    assert job.rows_created == 2
+    assert db.get(models.Vehicle, "RES1") is None  # before the resume point
+    assert db.get(models.Vehicle, "RES3") is not None
+    db.close()
+    assert not path.exists()  # no longer needed for a resume
+
+
+def test_job_runs_only_under_its_claim(tmp_path):
+    """A job another worker holds under a live lease is left alone; a lapsed lease is taken over."""
+    path = tmp_path / "claimed.csv"
+    path.write_text(HEADER + csv_row("CLM1"))
+
+    db = TestingSessionLocal()
+    db.add(models.ImportJob(
+        id="claimed", format="csv", path=str(path), total_bytes=path.stat().st_size,
+        status="running", owner="other-worker", lease_expires_at=time.time() + 60,
+    ))
+    db.commit()
+
+    assert not imports.claim(db, "claimed")
+    imports.run_job(TestingSessionLocal, "claimed")
+    db.expire_all()
+    assert db.get(models.ImportJob, "claimed").owner == "other-worker"
+    assert db.get(models.Vehicle, "CLM1") is None
+
+    db.get(models.ImportJob, "claimed").lease_expires_at = time.time() - 1
+    db.commit()
+    imports.run_job(TestingSessionLocal, "claimed")
+    db.expire_all()
+    job = db.get(models.ImportJob, "claimed")
+    assert (job.status, job.owner, job.rows_created) == ("completed", imports.WORKER_ID, 1)
+    db.close()
+
+
+def test_lines_that_are_not_utf8_are_rejected(client):
+    """An undecodable line is one reject; the rows around it still import."""
+    body = (HEADER + csv_row("UTF1")).encode() + b"UTF2,Subaru,Caf\xe9,200,Outback,2021,31000,Petrol\n" \
+        + csv_row("UTF3").encode()
+    report = upload(client, body)
+    assert report["status"] == "completed"
+    assert report["rows_created"] == 2
+    assert [(r["line"], r["detail"].split(":")[0]) for r in report["rejects"]] == [(3, "invalid UTF-8")]
+
+    body = b'{"vin": "UTF\xff"}\n' + json.dumps({
+        "vin": "UTF4", "manufacturer_name": "Kia", "horse_power": 201, "model_name": "EV6",
+        "model_year": 2023, "purchase_price": 42000, "fuel_type": "Electric",
+    }).encode() + b"\n"
+    report = upload(client, body, fmt="ndjson")
+    assert report["rows_created"] == 1
+    assert [r["line"] for r in report["rejects"]] == [1]
+
+    header = HEADER.encode().replace(b"description", b"descripci\xf3n")
+    report = upload(client, header + csv_row("UTF5").encode())
+    assert report["rows_created"] == 1  # description is optional; its column is unrecognised
+    assert [(r["line"], r["detail"].split(":")[0]) for r in report["rejects"]] == [(1, "header")]
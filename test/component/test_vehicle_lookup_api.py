@@ -0,0 +1,72 @@
+# Component tests for batch lookup
+"""
+1. Drive POST /vehicle/lookup against a temporary DB.
+2. Validate input order, de-duplication, missing VINs and request validation.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.main import app
+from app.schemas import MAX_BATCH_SIZE
+
+TEST_DB_URL = "sqlite:///./test_lookup.db"
+
+engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient bound to this module's DB; restores any previous override afterwards."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def vehicle(vin):
+    return {
+        "vin": vin,
+        "manufacturer_name": "Peugeot",
+        "description": None,
+        "horse_power": 110,
+        "model_name": "208",
+        "model_year": 2021,
+        "purchase_price": 19000.0,
+        "fuel_type": "Petrol",
+    }
+
+
+def test_lookup_returns_found_in_order_and_missing(client):
+    for vin in ("LKP1", "LKP2"):
+        assert client.post("/vehicle", json=vehicle(vin)).status_code == 201
+
+    r = client.post("/vehicle/lookup", json={"vins": ["lkp2", "GONE", "LKP1", "LKP2 "]})
+    assert r.status_code == 200
+    body = r.json()
+    assert [v["vin"] for v in body["items"]] == ["LKP2", "LKP1"]
+    assert body["items"][0]["version"] >= 1
+    assert body["missing"] == ["GONE"]
+
+
+def test_lookup_validates_request(client):
+    assert client.post("/vehicle/lookup", json={"vins": []}).status_code == 422
+    too_many = {"vins": [f"V{i}" for i in range(MAX_BATCH_SIZE + 1)]}
+    assert client.post("/vehicle/lookup", json=too_many).status_code == 422
@@ -0,0 +1,111 @@
+# Component tests for GET /metrics
+"""
+1. Run requests against an instrumented temporary DB.
+2. Validate per-route request counts, statement attribution and the
+   Prometheus text format of GET /metrics.
+"""
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import metrics
+from app.database import Base, get_db
+from app.main import app
+
+TEST_DB_URL = "sqlite:///./test_metrics.db"
+
+engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+metrics.instrument_engine(engine, "test")
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def override_get_db():
+    metrics.threadpool_started()
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient bound to this module's DB; restores any previous override afterwards."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def sample(text: str, name: str, **labels) -> float:
+    """Value of one sample in Prometheus text output (0 if absent)."""
+    for line in text.splitlines():
+        match = re.fullmatch(r"(\w+)(?:\{(.*)\})? (\S+)", line)
+        if not match or match.group(1) != name:
+            continue
+        found = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match.group(2) or ""))
+        if found == {k: str(v) for k, v in labels.items()}:
+            return float(match.group(3))
+    return 0.0
+
+
+def test_metrics_count_requests_and_statements(client):
+    before = client.get("/metrics").text
+    route = "/vehicle/{vin}"
+
+    for vin in ("NOPE1", "NOPE2", "NOPE3"):
+        assert client.get(f"/vehicle/{vin}").status_code == 404
+    client.get("/no/such/path")
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    after = r.text
+
+    delta = lambda name, **labels: sample(after, name, **labels) - sample(before, name, **labels)
+    assert delta("http_requests_total", method="GET", route=route, status=404) == 3
+    assert delta("http_requests_total", method="GET", route="unmatched", status=404) == 1
+    assert delta("http_request_duration_seconds_count", method="GET", route=route) == 3
+    # One lookup per request, attributed to the route
+    assert delta("http_request_db_statements_sum", route=route) >= 3
+    assert delta("db_statements_total", route=route) >= 3
+    assert delta("db_pool_checkout_seconds_count", engine="test") >= 3
+    assert delta("threadpool_queue_seconds_count") >= 3
+    assert sample(after, "http_requests_in_flight", method="GET", route=route) == 0
+
+
+def test_failed_statements_are_counted(client):
+    """A statement that raises (duplicate VIN) is still timed and attributed."""
+    payload = {
+        "vin": "DUP1", "manufacturer_name": "Seat", "description": None, "horse_power": 110,
+        "model_name": "Ibiza", "model_year": 2019, "purchase_price": 14000.0, "fuel_type": "Petrol",
+    }
+    assert client.post("/vehicle", json=payload).status_code == 201
+    before = client.get("/metrics").text
+    for _ in range(3):
+        assert client.post("/vehicle", json=payload).status_code == 400
+    after = client.get("/metrics").text
+
+    delta = lambda name, **labels: sample(after, name, **labels) - sample(before, name, **labels)
+    assert delta("db_statements_total", route="/vehicle") >= 3
+    assert delta("db_statement_duration_seconds_count", engine="test") >= 3
+
+
+def test_histogram_buckets_are_cumulative(client):
+    client.get("/vehicle/NOPE1")
+    text = client.get("/metrics").text
+    buckets = [
+        float(line.rsplit(" ", 1)[1]) for line in text.splitlines()
+        if line.startswith('http_request_duration_seconds_bucket{method="GET",route="/vehicle/{vin}"')
+    ]
+    assert buckets == sorted(buckets)
+    assert buckets[-1] == sample(text, "http_request_duration_seconds_count", method="GET", route="/vehicle/{vin}")
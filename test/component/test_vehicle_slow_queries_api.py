@@ -0,0 +1,113 @@
+# Component tests for the slow-query log and GET /debug/slow-queries
+"""
+1. Lower the threshold so every statement on a temporary DB counts as slow.
+2. Validate the structured records (normalized SQL, redacted params, repository
+   method, route, query plan) and the top-N aggregation.
+"""
+import json
+import logging
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import metrics, querylog
+from app.database import Base, get_db
+from app.main import app
+
+TEST_DB_URL = "sqlite:///./test_slow_queries.db"
+
+engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+metrics.instrument_engine(engine, "test")
+querylog.instrument_engine(engine, "test")
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient bound to this module's DB, logging every statement as slow."""
+    previous = app.dependency_overrides.get(get_db)
+    threshold = querylog.slow_log.threshold_ms
+    app.dependency_overrides[get_db] = override_get_db
+    querylog.slow_log.threshold_ms = 1e-6
+    querylog.slow_log.clear()
+    yield TestClient(app)
+    querylog.slow_log.threshold_ms = threshold
+    querylog.slow_log.clear()
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def test_normalize_collapses_literals_and_lists():
+    sql = "SELECT *  FROM vehicles\n WHERE vin IN (?, ?, ?) AND model_year = 2020 AND fuel_type = 'Petrol'"
+    assert querylog.normalize(sql) == "SELECT * FROM vehicles WHERE vin IN (?, ...) AND model_year = ? AND fuel_type = ?"
+    assert querylog.normalize("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (?, ...), ..."
+
+
+def test_explain_on_a_dead_connection_is_unavailable():
+    """Failing to open a cursor degrades the plan instead of raising."""
+    conn = sqlite3.connect(":memory:")
+    conn.close()
+    plan = querylog.explain(conn, "SELECT 1", ())
+    assert plan.startswith("unavailable: ")
+
+
+def test_slow_statements_are_logged_with_plan(client, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.slow_query"):
+        r = client.get("/vehicle", params={"manufacturer_name": "Saab", "model_year_min": 2001})
+    assert r.status_code == 200
+
+    records = [json.loads(m) for m in caplog.messages]
+    page = next(r for r in records if "FROM vehicles" in r["sql"])
+    assert page["repository_method"] == "VehicleRepository.page_json"
+    assert page["route"] == "/vehicle"
+    assert "str" in page["params"] and "Saab" not in json.dumps(page["params"])
+    assert any("ix_vehicles_manufacturer_year_price" in line for line in page["plan"])
+
+
+def test_debug_endpoint_ranks_statements(client):
+    for _ in range(3):
+        client.get("/vehicle/NOPE")
+
+    r = client.get("/debug/slow-queries", params={"limit": 50})
+    assert r.status_code == 200
+    statements = r.json()["statements"]
+    totals = [s["total_ms"] for s in statements]
+    assert totals == sorted(totals, reverse=True)
+
+    lookup = next(s for s in statements if s["sql"].startswith("SELECT") and "vehicles.vin = ?" in s["sql"]
+                  and s["slowest"]["route"] == "/vehicle/{vin}")
+    assert lookup["count"] >= 1
+    assert lookup["slowest"]["repository_method"] == "VehicleRepository.read"
+
+
+def test_failed_statements_are_logged_with_their_error(client, caplog):
+    payload = {
+        "vin": "SLOWDUP", "manufacturer_name": "Saab", "description": None, "horse_power": 150,
+        "model_name": "9-3", "model_year": 2005, "purchase_price": 4000.0, "fuel_type": "Petrol",
+    }
+    with caplog.at_level(logging.WARNING, logger="app.slow_query"):
+        assert client.post("/vehicle", json=payload).status_code == 201
+        assert client.post("/vehicle", json=payload).status_code == 400
+
+    inserts = [r for r in map(json.loads, caplog.messages) if r["sql"].startswith("INSERT INTO vehicles")]
+    assert len(inserts) == 2 and "error" not in inserts[0]
+    insert = inserts[1]
+    assert insert["error"].startswith("IntegrityError")
+    assert insert["route"] == "/vehicle"
+    assert insert["plan"]
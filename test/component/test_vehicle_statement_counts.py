@@ -0,0 +1,125 @@
+# Component tests for per-endpoint SQL statement counts
+"""
+1. Count every statement the test engine executes during one API call.
+2. Assert that each write endpoint is a single round trip (success and error paths).
+3. Assert that conditional and repeated reads skip the row queries.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.main import app
+
+TEST_DB_URL = "sqlite:///./test_statements.db"
+
+engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+statements = []
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def record(conn, cursor, statement, parameters, context, executemany):
+    statements.append(statement)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient bound to this module's DB; restores any previous override afterwards."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+def count(call):
+    """Run one request and return (response, statements executed)."""
+    statements.clear()
+    response = call()
+    return response, list(statements)
+
+
+vehicle_payload = {
+    "vin": "STMT1",
+    "manufacturer_name": "Fiat",
+    "description": "City car",
+    "horse_power": 69,
+    "model_name": "500",
+    "model_year": 2018,
+    "purchase_price": 12000.0,
+    "fuel_type": "Petrol",
+}
+update_payload = {k: v for k, v in vehicle_payload.items() if k != "vin"} | {"horse_power": 85}
+
+
+def test_create_is_one_insert(client):
+    r, sql = count(lambda: client.post("/vehicle", json=vehicle_payload))
+    assert r.status_code == 201
+    assert r.json()["description"] == "City car"
+    assert len(sql) == 1 and sql[0].startswith("INSERT")
+
+    r, sql = count(lambda: client.post("/vehicle", json=vehicle_payload))
+    assert r.status_code == 400
+    assert len(sql) == 1
+
+
+def test_update_is_one_update_returning(client):
+    r, sql = count(lambda: client.put("/vehicle/stmt1", json=update_payload))
+    assert r.status_code == 200
+    assert r.json()["horse_power"] == 85
+    assert len(sql) == 1 and sql[0].startswith("UPDATE") and "RETURNING" in sql[0]
+
+    r, sql = count(lambda: client.put("/vehicle/NOPE", json=update_payload))
+    assert r.status_code == 404
+    assert len(sql) == 1
+
+
+def test_delete_is_one_delete(client):
+    r, sql = count(lambda: client.delete("/vehicle/STMT1"))
+    assert r.status_code == 204
+    assert len(sql) == 1 and sql[0].startswith("DELETE")
+
+    r, sql = count(lambda: client.delete("/vehicle/STMT1"))
+    assert r.status_code == 404
+    assert len(sql) == 1
+
+
+def test_list_page_is_generation_plus_one_select(client):
+    r, sql = count(lambda: client.get("/vehicle", params={"limit": 7}))
+    assert r.status_code == 200
+    assert len(sql) == 2
+
+    # Same page again: served from the serialized page cache
+    r, sql = count(lambda: client.get("/vehicle", params={"limit": 7}))
+    assert r.status_code == 200
+    assert len(sql) == 1 and "table_generations" in sql[0]
+
+
+def test_conditional_get_does_not_load_rows(client):
+    client.post("/vehicle", json=vehicle_payload | {"vin": "STMT2"})
+
+    etag = client.get("/vehicle").headers["ETag"]
+    r, sql = count(lambda: client.get("/vehicle", headers={"If-None-Match": etag}))
+    assert r.status_code == 304
+    assert len(sql) == 1 and "table_generations" in sql[0]
+
+    etag = client.get("/vehicle/STMT2").headers["ETag"]
+    r, sql = count(lambda: client.get("/vehicle/STMT2", headers={"If-None-Match": etag}))
+    assert r.status_code == 304
+    assert len(sql) <= 1  # version lookup, or none when the VIN is cached
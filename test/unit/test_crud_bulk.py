@@ -0,0 +1,57 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.cache import VehicleCache
+from app.crud import VehicleRepository
+from app import schemas, stats
+
+# Isolated SQLite DB for bulk update / delete unit tests
+engine = create_engine(
+    "sqlite:///./unit_bulk.db",
+    connect_args={"check_same_thread": False}
+)
+TestingSession = sessionmaker(bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def vehicle(vin, make="Skoda", year=2015, fuel="Diesel", price=12000.0):
+    return schemas.VehicleCreate(
+        vin=vin, manufacturer_name=make, description="Estate", horse_power=110,
+        model_name="Octavia", model_year=year, purchase_price=price, fuel_type=fuel,
+    )
+
+
+def setup_module():
+    repo = VehicleRepository(TestingSession())
+    repo.create_many([vehicle(f"BULK{i}") for i in range(5)])
+    repo.create_many([vehicle("BULKP", fuel="Petrol"), vehicle("BULKN", year=2016)])
+
+
+def test_update_where_in_chunks():
+    """Every match is updated once, even when the update moves rows out of the filter."""
+    cache = VehicleCache()
+    repo = VehicleRepository(TestingSession(), cache=cache)
+    assert repo.read("BULK0").purchase_price == 12000.0  # now cached
+
+    diesels = schemas.VehicleFilter(model_year=2015, fuel_type="Diesel", purchase_price_max=12000.0)
+    assert repo.count(diesels) == 5
+
+    assert repo.update_where(diesels, {"purchase_price": 9000.0}, chunk_size=2) == 5
+    assert repo.count(diesels) == 5  # 9000 still matches; no row was updated twice
+    assert repo.read("BULK0").purchase_price == 9000.0  # cache entry invalidated
+    assert repo.read("BULKP").purchase_price == 12000.0
+
+    with engine.connect() as conn:
+        assert stats.check(conn) == []
+
+
+def test_delete_where_in_chunks():
+    repo = VehicleRepository(TestingSession())
+    assert repo.delete_where(schemas.VehicleFilter(fuel_type="Diesel", model_year=2015), chunk_size=2) == 5
+    assert repo.delete_where(schemas.VehicleFilter(fuel_type="Diesel", model_year=2015)) == 0
+    assert {v.vin for v in repo.list()} == {"BULKP", "BULKN"}
+
+    with engine.connect() as conn:
+        assert stats.check(conn) == []
@@ -0,0 +1,100 @@
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.cache import VehicleCache, SQLiteGenerationHook
+from app.crud import VehicleRepository
+from app import schemas
+
+# Isolated SQLite DB for cache unit tests
+engine = create_engine(
+    "sqlite:///./unit_cache.db",
+    connect_args={"check_same_thread": False}
+)
+TestingSession = sessionmaker(bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def payload(vin, **overrides):
+    data = dict(
+        vin=vin,
+        manufacturer_name="Mini",
+        description="Cooper",
+        horse_power=134,
+        model_name="Hardtop",
+        model_year=2020,
+        purchase_price=24000.0,
+        fuel_type="Petrol",
+    )
+    data.update(overrides)
+    return data
+
+
+def test_read_is_cached_and_invalidated_by_update():
+    """A second read is a hit; an update invalidates the entry."""
+    cache = VehicleCache()
+    repo = VehicleRepository(TestingSession(), cache=cache)
+    repo.create(schemas.VehicleCreate(**payload("CACHE1")))
+
+    assert repo.read("cache1").horse_power == 134
+    assert repo.read("CACHE1").horse_power == 134
+    assert cache.stats()["hits"] == 1
+
+    update = payload("CACHE1", horse_power=190)
+    del update["vin"]
+    repo.update("CACHE1", schemas.VehicleUpdate(**update))
+
+    assert repo.read("CACHE1").horse_power == 190
+
+
+def test_negative_entry_dropped_on_create():
+    """404s are cached until the VIN is created."""
+    cache = VehicleCache()
+    repo = VehicleRepository(TestingSession(), cache=cache)
+
+    assert repo.read("CACHE2") is None
+    assert repo.read("CACHE2") is None
+    assert cache.stats()["negative_hits"] == 1
+
+    repo.create(schemas.VehicleCreate(**payload("CACHE2")))
+    assert repo.read("CACHE2") is not None
+
+
+def test_lru_eviction_and_ttl_expiry():
+    """Oldest entries are evicted past capacity and entries expire after the TTL."""
+    cache = VehicleCache(max_entries=2, ttl=0.05)
+    for vin in ("A", "B", "C"):
+        _, _, epoch = cache.lookup(vin)
+        cache.store(vin, object(), epoch)
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.lookup("A")[0] is False
+    time.sleep(0.06)
+    assert cache.lookup("C")[0] is False
+    assert cache.stats()["expirations"] == 1
+
+
+def test_store_skipped_after_concurrent_invalidation():
+    """A value read before an invalidation is never cached."""
+    cache = VehicleCache()
+    _, _, epoch = cache.lookup("RACE")
+    cache.invalidate(["RACE"])
+    cache.store("RACE", object(), epoch)
+    assert cache.lookup("RACE")[0] is False
+
+
+def test_generation_hook_keeps_processes_coherent():
+    """A write through one cache clears another cache sharing the DB generation."""
+    cache_a = VehicleCache(hook=SQLiteGenerationHook(poll_interval=0))
+    cache_b = VehicleCache(hook=SQLiteGenerationHook(poll_interval=0))
+    repo_a = VehicleRepository(TestingSession(), cache=cache_a)
+    repo_b = VehicleRepository(TestingSession(), cache=cache_b)
+
+    repo_a.create(schemas.VehicleCreate(**payload("CACHE3")))
+    assert repo_b.read("CACHE3").model_name == "Hardtop"
+
+    repo_a.delete("CACHE3")
+    assert repo_b.read("CACHE3") is None
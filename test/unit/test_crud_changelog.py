@@ -0,0 +1,100 @@
+import asyncio
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.crud import VehicleRepository
+from app import changelog, schemas
+
+# Isolated SQLite DB for change-log unit tests
+engine = create_engine(
+    "sqlite:///./unit_changelog.db",
+    connect_args={"check_same_thread": False}
+)
+TestingSession = sessionmaker(bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def vehicle(vin, price=21000.0):
+    return schemas.VehicleCreate(
+        vin=vin, manufacturer_name="Mazda", description="Roadster", horse_power=181,
+        model_name="MX-5", model_year=2022, purchase_price=price, fuel_type="Petrol",
+    )
+
+
+def test_every_write_is_logged_in_order():
+    repo = VehicleRepository(TestingSession())
+    head, _ = repo.change_bounds()
+
+    created = repo.create(vehicle("LOG1"))
+    repo.patch("LOG1", schemas.VehiclePatch(purchase_price=19500.0, description="Roadster"))  # description unchanged
+    repo.create_many([vehicle("LOG2"), vehicle("LOG3")])
+    repo.delete_where(schemas.VehicleFilter(model_name="MX-5", purchase_price_min=20000.0))
+    repo.delete("LOG1")
+
+    changes = repo.changes(head, 100)
+    assert [c["seq"] for c in changes] == list(range(head + 1, head + 8))
+    assert [(c["op"], c["vin"]) for c in changes] == [
+        ("create", "LOG1"), ("update", "LOG1"), ("create", "LOG2"), ("create", "LOG3"),
+        ("delete", "LOG2"), ("delete", "LOG3"), ("delete", "LOG1"),
+    ]
+    assert changes[0]["changes"]["purchase_price"] == 21000.0
+    assert changes[0]["version"] == created.version
+    assert changes[1]["changes"] == {"purchase_price": 19500.0}  # only what actually changed
+    assert changes[-1]["changes"] is None
+    assert repo.change_bounds()[0] == head + 7
+    assert repo.changes(head + 7, 100) == []
+
+
+def test_prune_keeps_sequences_and_reports_horizon():
+    repo = VehicleRepository(TestingSession())
+    for i in range(5):
+        repo.create(vehicle(f"PRUNE{i}"))
+    head, _ = repo.change_bounds()
+
+    with engine.begin() as conn:
+        assert changelog.prune(conn, max_rows=2, max_age=3600) > 0
+    assert repo.change_bounds() == (head, head - 1)
+    assert [c["seq"] for c in repo.changes(0, 10)] == [head - 1, head]
+
+    with engine.begin() as conn:
+        changelog.prune(conn, max_rows=0, max_age=3600)
+    assert repo.change_bounds() == (head, head + 1)  # empty log: nothing missed if caught up
+    repo.create(vehicle("PRUNE9"))
+    assert repo.changes(head, 10)[0]["seq"] == head + 1  # AUTOINCREMENT: never reused
+
+
+def test_prune_by_age_is_a_primary_key_range():
+    repo = VehicleRepository(TestingSession())
+    for i in range(4):
+        repo.create(vehicle(f"AGED{i}"))
+    head, _ = repo.change_bounds()
+    with engine.begin() as conn:  # the first two entries become a day old
+        conn.execute(text("UPDATE vehicle_changes SET at = at - 86400 WHERE seq <= :seq"), {"seq": head - 2})
+        assert changelog.prune(conn, max_rows=1000, max_age=3600) >= 2
+        plan = conn.execute(text("EXPLAIN QUERY PLAN DELETE FROM vehicle_changes WHERE seq <= 1")).all()
+    assert [c["seq"] for c in repo.changes(0, 10)] == [head - 1, head]
+    assert "SCAN" not in " ".join(row[3] for row in plan)
+
+
+def test_retention_loop_survives_failed_runs(caplog):
+    """A failing prune is logged and the loop keeps running."""
+    calls = []
+
+    def session_factory():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return TestingSession()
+
+    async def run_for_a_while():
+        task = asyncio.ensure_future(changelog.retention_loop(session_factory, interval=0.01))
+        while len(calls) < 3:
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(asyncio.wait_for(run_for_a_while(), timeout=5))
+    assert len(calls) >= 3
+    assert "Change log pruning failed" in caplog.text
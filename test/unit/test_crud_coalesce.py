@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.cache import VehicleCache
+from app.coalesce import CoalescingRepository, WriteCoalescer
+from app.crud import PreconditionFailed, VehicleRepository
+from app import schemas, stats
+
+# Isolated SQLite DB for group-commit unit tests
+engine = create_engine(
+    "sqlite:///./unit_coalesce.db",
+    connect_args={"check_same_thread": False}
+)
+TestingSession = sessionmaker(bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def vehicle(vin, price=18000.0):
+    return schemas.VehicleCreate(
+        vin=vin, manufacturer_name="Kia", description="Hatch", horse_power=120,
+        model_name="Ceed", model_year=2021, purchase_price=price, fuel_type="Petrol",
+    )
+
+
+def test_concurrent_writes_share_commits_but_not_outcomes():
+    coalescer = WriteCoalescer(engine, window=0.05, max_batch=100)
+    repo = CoalescingRepository(coalescer)
+    vins = [f"GRP{i}" for i in range(20)] + ["GRP0"]  # one duplicate
+    results = {}
+
+    def create(i, vin):
+        results[i] = repo.create(vehicle(vin))
+
+    threads = [threading.Thread(target=create, args=(i, vin)) for i, vin in enumerate(vins)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(r is None for r in results.values()) == 1  # the duplicate, reported to its caller only
+    assert len({r.version for r in results.values() if r is not None}) == 20
+    assert coalescer.stats()["writes"] == 21
+    assert coalescer.stats()["batches"] < 21
+
+    assert VehicleRepository(TestingSession()).count() == 20
+    with engine.connect() as conn:
+        assert stats.check(conn) == []
+    coalescer.close()
+
+
+def test_errors_and_cache_invalidation_per_write():
+    cache = VehicleCache()
+    coalescer = WriteCoalescer(engine, cache=cache, window=0)
+    repo = CoalescingRepository(coalescer)
+    reader = VehicleRepository(TestingSession(), cache=cache)
+    version = reader.read("GRP1").version  # now cached
+
+    patched = repo.patch("grp1", schemas.VehiclePatch(purchase_price=17000.0), if_versions=[version])
+    assert reader.read("GRP1").purchase_price == 17000.0  # invalidated once committed
+
+    with pytest.raises(PreconditionFailed) as exc:
+        repo.update("GRP1", schemas.VehicleUpdate(**vehicle("GRP1").model_dump(exclude={"vin"})), if_versions=[version])
+    assert exc.value.version == patched.version
+
+    assert repo.delete("GRP2") is True
+    assert repo.delete("GRP2") is None
+    coalescer.close()
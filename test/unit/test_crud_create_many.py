@@ -0,0 +1,70 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.crud import VehicleRepository
+
+# Isolated SQLite DB for bulk-create unit tests
+engine = create_engine(
+    "sqlite:///./unit_create_many.db",
+    connect_args={"check_same_thread": False}
+)
+TestingSession = sessionmaker(bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def payload(vin, **overrides):
+    """Build a valid VehicleCreate-shaped dict."""
+    data = {
+        "vin": vin,
+        "manufacturer_name": "Skoda",
+        "description": "Hatch",
+        "horse_power": 110,
+        "model_name": "Fabia",
+        "model_year": 2019,
+        "purchase_price": 14000.0,
+        "fuel_type": "Petrol",
+    }
+    data.update(overrides)
+    return data
+
+
+def test_create_many_best_effort():
+    """Valid items are created; duplicates and invalid items are reported per item."""
+    repo = VehicleRepository(TestingSession())
+    repo.create_many([payload("BULK0")])
+
+    results = repo.create_many([
+        payload(" bulk1 "),               # created (normalized)
+        payload("BULK0"),                 # already exists
+        payload("bulk1"),                 # repeated within batch
+        payload("BULK2", horse_power="x"),  # invalid
+        payload("   "),                   # blank VIN
+    ])
+
+    assert [r["status"] for r in results] == ["created", "duplicate", "duplicate", "invalid", "invalid"]
+    assert results[0]["vin"] == "BULK1"
+    assert results[3]["detail"].startswith("horse_power")
+    assert repo.get("BULK1").model_name == "Fabia"
+    assert repo.get("BULK2") is None
+
+
+def test_create_many_all_or_nothing_rejects_whole_batch():
+    """One bad item means nothing is written and valid items are reported as skipped."""
+    repo = VehicleRepository(TestingSession())
+
+    results = repo.create_many([payload("ATOM1"), payload("ATOM2", model_year=None)], atomic=True)
+
+    assert [r["status"] for r in results] == ["skipped", "invalid"]
+    assert repo.get("ATOM1") is None
+
+
+def test_create_many_all_or_nothing_success():
+    """A clean all-or-nothing batch is committed in full."""
+    repo = VehicleRepository(TestingSession())
+
+    results = repo.create_many([payload(f"OK{i}") for i in range(600)], atomic=True)
+
+    assert all(r["status"] == "created" for r in results)
+    assert repo.get("OK599") is not None
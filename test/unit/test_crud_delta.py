@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.crud import CursorExpired, VehicleRepository, decode_cursor, encode_cursor
+from app import schemas
+
+# Isolated SQLite DB for delta-sync unit tests
+engine = create_engine(
+    "sqlite:///./unit_delta.db",
+    connect_args={"check_same_thread": False}
+)
+TestingSession = sessionmaker(bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def vehicle(vin, price=30000.0):
+    return schemas.VehicleCreate(
+        vin=vin, manufacturer_name="Volvo", description=None, horse_power=250,
+        model_name="V60", model_year=2021, purchase_price=price, fuel_type="Hybrid",
+    )
+
+
+def sync(repo, cursor, limit=100):
+    """Follow has_more to the end; returns (upserted VINs, deleted VINs, final cursor)."""
+    upserts, deleted = [], []
+    while True:
+        rows, gone, cursor, has_more = repo.delta(cursor, limit)
+        upserts += [row.vin for row in rows]
+        deleted += gone
+        if not has_more:
+            return upserts, deleted, cursor
+
+
+def test_delta_returns_writes_and_tombstones_since_cursor():
+    repo = VehicleRepository(TestingSession())
+    repo.create_many([vehicle("SYNC1"), vehicle("SYNC2"), vehicle("SYNC3")])
+    upserts, deleted, cursor = sync(repo, None)
+    assert {"SYNC1", "SYNC2", "SYNC3"} <= set(upserts) and deleted == []
+
+    assert repo.delta(cursor, 10)[:2] == ([], [])  # nothing changed: empty, same position
+    assert repo.delta(cursor, 10)[2] == cursor
+
+    repo.patch("SYNC2", schemas.VehiclePatch(purchase_price=28000.0))
+    repo.delete("SYNC3")
+    upserts, deleted, cursor = sync(repo, cursor)
+    assert upserts == ["SYNC2"] and deleted == ["SYNC3"]
+
+    repo.create(vehicle("SYNC3"))  # re-created: live again, no longer a tombstone
+    upserts, deleted, _ = sync(repo, cursor)
+    assert upserts == ["SYNC3"] and deleted == []
+
+
+def test_delta_pages_through_rows_sharing_a_version():
+    repo = VehicleRepository(TestingSession())
+    _, _, cursor = sync(repo, None)
+    repo.create_many([vehicle(f"PAGE{i}") for i in range(5)])  # one statement, one version
+
+    upserts, _, _ = sync(repo, cursor, limit=2)
+    assert upserts == [f"PAGE{i}" for i in range(5)]
+
+
+def test_delta_rejects_bad_and_foreign_cursors():
+    repo = VehicleRepository(TestingSession())
+    with pytest.raises(ValueError):
+        repo.delta("not-a-cursor")
+    with pytest.raises(ValueError):
+        repo.delta(encode_cursor("SYNC1"))  # a page cursor, not a sync cursor
+    key, _ = decode_cursor(repo.delta(None, 1)[2], "changes")
+    with pytest.raises(CursorExpired):
+        repo.delta(encode_cursor(None, "changes", ["other-db", key[1]]))
@@ -0,0 +1,107 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.crud import VehicleRepository, encode_cursor
+from app import schemas, search
+
+# Isolated SQLite DB for full-text search unit tests
+engine = create_engine(
+    "sqlite:///./unit_fulltext.db",
+    connect_args={"check_same_thread": False}
+)
+TestingSession = sessionmaker(bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def payload(vin, manufacturer, model, description):
+    return {
+        "vin": vin,
+        "manufacturer_name": manufacturer,
+        "description": description,
+        "horse_power": 150,
+        "model_name": model,
+        "model_year": 2021,
+        "purchase_price": 25000.0,
+        "fuel_type": "Hybrid",
+    }
+
+
+repo = VehicleRepository(TestingSession())
+repo.create_many([
+    payload("FTS1", "Toyota", "Prius", "Red hybrid sedan, one owner"),
+    payload("FTS2", "Toyota", "Camry", "Blue hybrid sedan"),
+    payload("FTS3", "Honda", "Civic", "Red hatchback"),
+    payload("FTS4", "Hyundai", "Ioniq", "Hybrid liftback mentioning toyota once"),
+])
+
+
+def vins(query, **kwargs):
+    rows, _ = repo.search(query, **kwargs)
+    return [v.vin for v in rows]
+
+
+def test_all_words_must_match_with_prefixes():
+    """Every word has to match, and partial words match as prefixes."""
+    assert vins("red hybrid sedan") == ["FTS1"]
+    assert sorted(vins("hyb sed")) == ["FTS1", "FTS2"]
+    assert vins("nothing-matches-this") == []
+
+
+def test_ranked_by_bm25_with_weighted_columns():
+    """A manufacturer match outranks the same word in the free-text description."""
+    assert vins("toyota")[-1] == "FTS4"
+
+
+def test_paginates_with_cursor():
+    """Pages follow the ranked order without repeats."""
+    first, cursor = repo.search("hybrid", limit=2)
+    second, last = repo.search("hybrid", limit=2, cursor=cursor)
+    assert len(first) == 2 and len(second) == 1 and last is None
+    assert {v.vin for v in first + second} == {"FTS1", "FTS2", "FTS4"}
+
+
+def test_index_follows_updates_and_deletes():
+    """Triggers keep the index in sync with UPDATE and DELETE."""
+    repo.create(schemas.VehicleCreate(**payload("FTS5", "Kia", "Niro", "Green crossover")))
+    assert vins("green") == ["FTS5"]
+
+    update = payload("FTS5", "Kia", "Niro", "Silver crossover")
+    del update["vin"]
+    repo.update("FTS5", schemas.VehicleUpdate(**update))
+    assert vins("green") == [] and vins("silver") == ["FTS5"]
+
+    repo.delete("FTS5")
+    assert vins("silver") == []
+
+
+def test_rebuild_restores_a_missing_index():
+    """rebuild() recreates and repopulates the index for an existing database."""
+    with engine.begin() as conn:
+        search.drop(conn)
+        conn.execute(text("DROP TRIGGER vehicles_fts_ai"))
+
+    search.rebuild(engine)
+    assert vins("civic") == ["FTS3"]
+
+
+def test_rejects_queries_without_words():
+    """Punctuation-only queries cannot be turned into a MATCH expression."""
+    try:
+        repo.search('"*')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_rejects_cursors_without_a_valid_offset():
+    """Offsets that are not non-negative integers are invalid cursors, not SQL errors."""
+    for offset in ("2", -1, 1.5, True, None):
+        try:
+            repo.search("hybrid", cursor=encode_cursor("FTS1", "rank", offset))
+        except ValueError as exc:
+            assert str(exc) == "Invalid cursor"
+        else:
+            raise AssertionError(f"expected ValueError for offset {offset!r}")
@@ -0,0 +1,70 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.cache import VehicleCache
+from app.crud import IN_CHUNK_SIZE, VehicleRepository
+
+# Isolated SQLite DB for batch lookup unit tests
+engine = create_engine(
+    "sqlite:///./unit_lookup.db",
+    connect_args={"check_same_thread": False}
+)
+TestingSession = sessionmaker(bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+VehicleRepository(TestingSession()).create_many([
+    {
+        "vin": f"LOOK{i:04d}", "manufacturer_name": "Dacia", "description": None, "horse_power": 90,
+        "model_name": "Sandero", "model_year": 2020, "purchase_price": 12000.0 + i, "fuel_type": "Petrol",
+    }
+    for i in range(IN_CHUNK_SIZE + 100)
+])
+
+
+def selects(fn):
+    """Run fn and return (its result, the number of SELECTs on vehicles it issued)."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and "FROM vehicles" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        return fn(), len(statements)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def test_lookup_keeps_order_dedupes_and_reports_missing():
+    repo = VehicleRepository(TestingSession())
+    rows, missing = repo.lookup([" look0003", "NOPE1", "LOOK0001", "LOOK0003", "nope1", "LOOK0002"])
+    assert [row.vin for row in rows] == ["LOOK0003", "LOOK0001", "LOOK0002"]
+    assert rows[1].purchase_price == 12001.0
+    assert missing == ["NOPE1"]
+
+
+def test_lookup_reads_in_chunks():
+    vins = [f"LOOK{i:04d}" for i in range(IN_CHUNK_SIZE + 100)]
+    repo = VehicleRepository(TestingSession())
+    repo.store = None  # count SQL whatever VEHICLE_REPOSITORY says
+    (rows, missing), count = selects(lambda: repo.lookup(vins))
+    assert len(rows) == len(vins) and missing == []
+    assert count == 2
+
+
+def test_lookup_uses_cache_first():
+    cache = VehicleCache()
+    repo = VehicleRepository(TestingSession(), cache=cache)
+    repo.store = None
+    repo.read("LOOK0010")
+    repo.read("MISSING1")
+
+    (rows, missing), count = selects(lambda: repo.lookup(["LOOK0010", "MISSING1"]))
+    assert [row.vin for row in rows] == ["LOOK0010"] and missing == ["MISSING1"]
+    assert count == 0  # a hit and a cached 404
+
+    repo.lookup(["LOOK0011", "MISSING2"])  # stored for next time
+    assert cache.lookup("LOOK0011")[0] and cache.lookup("MISSING2")[0]
@@ -0,0 +1,175 @@
+import asyncio
+import itertools
+import random
+import threading
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.crud import VehicleRepository, encode_cursor
+from app.memory import VehicleStore
+from app import memory, schemas
+
+# Isolated SQLite DB for in-memory store unit tests
+engine = create_engine(
+    "sqlite:///./unit_memory.db",
+    connect_args={"check_same_thread": False}
+)
+TestingSession = sessionmaker(bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+SORTS = ["vin", "model_year", "-model_year", "purchase_price", "-purchase_price"]
+FILTERS = [
+    {},
+    {"manufacturer_name": "Kia"},
+    {"fuel_type": "Diesel", "model_year_min": 2012},
+    {"model_year_min": 2011, "model_year_max": 2014},
+    {"purchase_price_min": 12000.0, "purchase_price_max": 16000.0},
+    {"model_name": "Rio", "purchase_price_max": 15000.0},
+]
+
+rng = random.Random(5)
+VehicleRepository(TestingSession()).create_many([
+    {
+        "vin": f"MEM{i:03d}", "manufacturer_name": rng.choice(["Kia", "Seat", "Fiat"]),
+        "description": None, "horse_power": 90 + i, "model_name": rng.choice(["Rio", "Ibiza", "Panda"]),
+        "model_year": rng.randint(2010, 2016), "purchase_price": float(rng.randrange(10000, 18000, 500)),
+        "fuel_type": rng.choice(["Petrol", "Diesel"]),
+    }
+    for i in range(60)
+])
+
+
+def walk(repo, filters, sort, limit=7):
+    vins, cursor = [], None
+    while True:
+        rows, cursor = repo.page(limit=limit, cursor=cursor, filters=filters, sort=sort)
+        vins += [row.vin for row in rows]
+        if cursor is None:
+            return vins
+
+
+@pytest.fixture
+def sql(monkeypatch):
+    """A repository on the SQL path, to compare against whatever VEHICLE_REPOSITORY says."""
+    monkeypatch.setattr(memory.config, "REPOSITORY", "sqlite")
+    return VehicleRepository(TestingSession())
+
+
+def test_pages_and_counts_match_sqlite(sql):
+    mem = VehicleRepository(TestingSession(), store=VehicleStore(poll_interval=0))
+
+    for fields, sort in itertools.product(FILTERS, SORTS):
+        filters = schemas.VehicleFilter(**fields)
+        assert walk(mem, filters, sort) == walk(sql, filters, sort), (fields, sort)
+        assert mem.count(filters) == sql.count(filters), fields
+    assert mem.read("mem007")._asdict() == sql.read("MEM007")._asdict()
+
+
+def test_writes_are_visible_through_the_store():
+    store = VehicleStore(poll_interval=3600)  # no polling: only the repository's own writes
+    repo = VehicleRepository(TestingSession(), store=store)
+    assert repo.read("MEM001") is not None
+
+    repo.patch("MEM001", schemas.VehiclePatch(purchase_price=9999.0))
+    assert repo.read("MEM001").purchase_price == 9999.0
+    assert repo.page(limit=1, sort="purchase_price")[0][0].vin == "MEM001"
+    repo.delete("MEM002")
+    assert repo.read("MEM002") is None and repo.version("MEM002") is None
+    repo.update_where(schemas.VehicleFilter(manufacturer_name="Fiat"), {"fuel_type": "Electric"})
+    assert repo.count(schemas.VehicleFilter(fuel_type="Electric")) == repo.count(
+        schemas.VehicleFilter(manufacturer_name="Fiat")
+    )
+
+
+def test_writes_from_elsewhere_are_replayed_from_the_change_log():
+    store = VehicleStore(poll_interval=0)
+    repo = VehicleRepository(TestingSession(), store=store)
+    assert repo.read("MEM010").horse_power == 100
+
+    with engine.begin() as conn:  # bypasses the repository, like another process
+        conn.execute(text("UPDATE vehicles SET horse_power = 1 WHERE vin = 'MEM010'"))
+        conn.execute(text("DELETE FROM vehicles WHERE vin = 'MEM011'"))
+    assert repo.read("MEM010").horse_power == 1
+    assert repo.read("MEM011") is None
+    assert store.stats()["loads"] == 1  # caught up without reloading
+
+
+def test_pages_catch_up_with_the_generation_they_are_cached_under():
+    store = VehicleStore(poll_interval=3600)  # the poll timer alone would not see the insert
+    repo = VehicleRepository(TestingSession(), store=store)
+    before = repo.count()
+
+    with engine.begin() as conn:  # another process's write
+        conn.execute(text("""
+            INSERT INTO vehicles (vin, manufacturer_name, horse_power, model_name, model_year,
+                                  purchase_price, fuel_type, version)
+            VALUES ('MEMNEW', 'Kia', 99, 'Rio', 2013, 11000.0, 'Petrol', 1)
+        """))
+    generation = repo.generation()
+    rows, _ = repo.page(limit=100, filters=schemas.VehicleFilter(model_year=2013))
+    assert "MEMNEW" in [row.vin for row in rows]
+    assert repo.count() == before + 1
+    assert store.stats()["polls"] == 1 and store._generation == generation
+
+
+def test_sync_and_async_engines_share_a_store(monkeypatch):
+    monkeypatch.setattr(memory.config, "REPOSITORY", "memory")
+    monkeypatch.setattr(memory, "_stores", {})
+    async_engine = create_async_engine("sqlite+aiosqlite:///./unit_memory.db")
+
+    async def async_store():
+        async with AsyncSession(async_engine) as db:
+            return await db.run_sync(memory.store_for)
+
+    try:
+        assert asyncio.run(async_store()) is memory.store_for(TestingSession())
+    finally:
+        asyncio.run(async_engine.dispose())
+
+
+def test_crafted_cursors_are_invalid_not_type_errors():
+    repo = VehicleRepository(TestingSession(), store=VehicleStore())
+    crafted = [
+        ("model_year", "2012", "MEM001"), ("purchase_price", None, "MEM001"),
+        ("model_year", True, "MEM001"), ("-purchase_price", 12000.0, 7), ("vin", None, ["MEM001"]),
+    ]
+    for sort, key, vin in crafted:
+        try:
+            repo.page(cursor=encode_cursor(vin, sort, key), sort=sort)
+        except ValueError as exc:
+            assert str(exc) == "Invalid cursor"
+        else:
+            raise AssertionError(f"expected ValueError for {(sort, key, vin)}")
+    assert repo.page(cursor=encode_cursor("MEM001", "purchase_price", 12000), sort="purchase_price")[0]
+
+
+def test_reads_are_served_while_a_sync_waits_on_sqlite():
+    """SQLite is read outside the store's lock, so readers keep the previous state meanwhile."""
+    store = VehicleStore(poll_interval=3600)
+    store.sync(TestingSession())
+    store.invalidate(["MEM001"])
+    in_sql, release = threading.Event(), threading.Event()
+
+    def stall(*args):
+        in_sql.set()
+        release.wait(5)
+
+    syncing = threading.Thread(target=store.sync, args=(TestingSession(),))
+    event.listen(engine, "before_cursor_execute", stall)
+    try:
+        syncing.start()
+        assert in_sql.wait(5)
+        reader = threading.Thread(target=store.count)
+        reader.start()
+        reader.join(5)
+        assert not reader.is_alive()
+    finally:
+        release.set()
+        syncing.join()
+        event.remove(engine, "before_cursor_execute", stall)
+    assert store.stats()["refreshed"] == 1 and store.stats()["dirty"] == 0
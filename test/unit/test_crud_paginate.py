@@ -0,0 +1,82 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.crud import VehicleRepository
+from app import schemas
+
+# Isolated SQLite DB for pagination unit tests
+engine = create_engine(
+    "sqlite:///./unit_paginate.db",
+    connect_args={"check_same_thread": False}
+)
+TestingSession = sessionmaker(bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def setup_samples():
+    """Insert five vehicles (two Ford, three Kia) and return the repository."""
+    db = TestingSession()
+    repo = VehicleRepository(db)
+
+    for i in range(5):
+        repo.create(schemas.VehicleCreate(
+            vin=f"PAGE{i}",
+            manufacturer_name="Ford" if i < 2 else "Kia",
+            description=None,
+            horse_power=100 + i,
+            model_name="Model",
+            model_year=2015 + i,
+            purchase_price=10000.0 + i,
+            fuel_type="Petrol",
+        ))
+    return repo
+
+
+def test_page_walks_whole_table_in_vin_order():
+    """Following next_cursor visits every row exactly once, in VIN order."""
+    repo = setup_samples()
+
+    seen, cursor = [], None
+    while True:
+        rows, cursor = repo.page(limit=2, cursor=cursor)
+        seen.extend(v.vin for v in rows)
+        if cursor is None:
+            break
+
+    assert seen == ["PAGE0", "PAGE1", "PAGE2", "PAGE3", "PAGE4"]
+
+
+def test_page_applies_filters():
+    """Filters are combined with the keyset condition."""
+    repo = setup_samples()
+
+    rows, cursor = repo.page(limit=10, filters=schemas.VehicleFilter(manufacturer_name="Kia"))
+    assert [v.vin for v in rows] == ["PAGE2", "PAGE3", "PAGE4"]
+    assert cursor is None
+
+
+def test_page_rejects_malformed_cursor():
+    """A cursor that was not produced by the repository raises ValueError."""
+    repo = setup_samples()
+
+    try:
+        repo.page(cursor="%%%")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_page_json_matches_validated_response():
+    """The ORM-free path produces exactly the bytes response_model serialization would."""
+    repo = setup_samples()
+    filters = schemas.VehicleFilter(manufacturer_name="Kia")
+
+    for sort in ["vin", "-purchase_price"]:
+        rows, cursor = repo.page(limit=2, filters=filters, sort=sort)
+        expected = schemas.VehiclePage.model_validate(
+            {"items": rows, "next_cursor": cursor}, from_attributes=True
+        ).model_dump_json().encode()
+        assert repo.page_json(limit=2, filters=filters, sort=sort) == expected
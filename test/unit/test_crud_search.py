@@ -0,0 +1,119 @@
+import itertools
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.crud import VehicleRepository
+from app import schemas
+
+# Isolated SQLite DB for filter / sort / index unit tests
+engine = create_engine(
+    "sqlite:///./unit_search.db",
+    connect_args={"check_same_thread": False}
+)
+TestingSession = sessionmaker(bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+MAKES = ["Audi", "BMW", "Ford"]
+FUELS = ["Petrol", "Diesel", "Electric"]
+
+repo = VehicleRepository(TestingSession())
+repo.create_many([
+    {
+        "vin": f"S{i:03d}",
+        "manufacturer_name": MAKES[i % 3],
+        "horse_power": 100 + i,
+        "model_name": f"M{i % 4}",
+        "model_year": 2010 + i % 7,
+        "purchase_price": float(20000 + (i * 37) % 500),  # many ties across rows
+        "fuel_type": FUELS[i % 5 % 3],
+    }
+    for i in range(60)
+])
+
+SORTS = ["vin", "model_year", "-model_year", "purchase_price", "-purchase_price"]
+
+# One representative value per supported filter
+FILTER_VALUES = {
+    "manufacturer_name": "BMW",
+    "model_name": "M1",
+    "model_year": 2012,
+    "model_year_min": 2011,
+    "model_year_max": 2014,
+    "fuel_type": "Diesel",
+    "purchase_price_min": 20100.0,
+    "purchase_price_max": 20400.0,
+}
+
+
+def walk(filters, sort, limit=7):
+    """Collect every VIN by following cursors."""
+    vins, cursor = [], None
+    while True:
+        rows, cursor = repo.page(limit=limit, cursor=cursor, filters=filters, sort=sort)
+        vins.extend(v.vin for v in rows)
+        if cursor is None:
+            return vins
+
+
+def test_sorted_pages_match_full_sort():
+    """Cursor pagination under each sort returns exactly the fully sorted, filtered result."""
+    filters = schemas.VehicleFilter(model_year_min=2011, purchase_price_max=20400.0)
+    everything = [v for v in repo.list() if v.model_year >= 2011 and v.purchase_price <= 20400.0]
+
+    for sort in SORTS:
+        field = sort.lstrip("-")
+        if field == "vin":
+            expected = sorted(v.vin for v in everything)
+        else:
+            reverse = sort.startswith("-")
+            ordered = sorted(everything, key=lambda v: (getattr(v, field), v.vin), reverse=reverse)
+            expected = [v.vin for v in ordered]
+        assert walk(filters, sort) == expected, sort
+
+
+def test_cursor_is_bound_to_its_sort():
+    """A cursor issued for one sort order is rejected under another."""
+    _, cursor = repo.page(limit=2, sort="model_year")
+    try:
+        repo.page(cursor=cursor, sort="purchase_price")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_no_filter_combination_scans_the_table():
+    """
+    EXPLAIN QUERY PLAN never shows a full table scan of vehicles.
+    Queries with an equality filter must SEARCH an index; a range-only filter may
+    instead walk the sort index in order, which the page LIMIT cuts short.
+    """
+    equality = {"manufacturer_name", "model_name", "model_year", "fuel_type"}
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    conn = repo.db.connection()  # EXPLAIN on the same connection the queries ran on
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        for size in range(len(FILTER_VALUES) + 1):
+            for fields in itertools.combinations(FILTER_VALUES, size):
+                filters = schemas.VehicleFilter(**{f: FILTER_VALUES[f] for f in fields})
+                for sort in SORTS:
+                    captured.clear()
+                    _, cursor = repo.page(limit=1, filters=filters, sort=sort)
+                    if cursor:  # also plan the keyset continuation query
+                        repo.page(limit=1, cursor=cursor, filters=filters, sort=sort)
+
+                    for statement, params in list(captured):
+                        plan = [row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, params)]
+                        label = f"{fields} sort={sort}: {plan}"
+                        assert "SCAN vehicles" not in plan, label
+                        if equality.intersection(fields):
+                            assert any(step.startswith("SEARCH vehicles") for step in plan), label
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
@@ -0,0 +1,88 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.crud import VehicleRepository
+from app import schemas, stats
+
+# Isolated SQLite DB for summary-table unit tests
+engine = create_engine(
+    "sqlite:///./unit_stats.db",
+    connect_args={"check_same_thread": False}
+)
+TestingSession = sessionmaker(bind=engine)
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def vehicle(vin, make="Audi", year=2020, fuel="Petrol", price=30000.0, hp=200):
+    return schemas.VehicleCreate(
+        vin=vin, manufacturer_name=make, description="Test", horse_power=hp,
+        model_name="A4", model_year=year, purchase_price=price, fuel_type=fuel,
+    )
+
+
+def assert_consistent():
+    with engine.connect() as conn:
+        assert stats.check(conn) == []
+
+
+def test_stats_follow_create_update_delete():
+    repo = VehicleRepository(TestingSession())
+    repo.create(vehicle("STAT1", price=10000.0, hp=100))
+    repo.create(vehicle("STAT2", price=30000.0, hp=300))
+    repo.create(vehicle("STAT3", make="BMW", fuel="Diesel", price=50000.0, hp=250))
+
+    audi = repo.stats(["manufacturer_name"], schemas.VehicleStatsFilter(manufacturer_name="Audi"))
+    assert audi == [{
+        "manufacturer_name": "Audi",
+        "count": 2,
+        "purchase_price": {"sum": 40000.0, "avg": 20000.0, "min": 10000.0, "max": 30000.0},
+        "horse_power": {"sum": 400, "avg": 200.0, "min": 100, "max": 300},
+    }]
+
+    # Removing the current minimum re-derives it from the remaining rows
+    repo.update("STAT1", schemas.VehicleUpdate(**vehicle("STAT1", price=40000.0, hp=150).model_dump(exclude={"vin"})))
+    audi = repo.stats(["manufacturer_name"], schemas.VehicleStatsFilter(manufacturer_name="Audi"))[0]
+    assert audi["purchase_price"]["min"] == 30000.0
+    assert audi["purchase_price"]["max"] == 40000.0
+    assert audi["horse_power"]["min"] == 150
+
+    # Moving a vehicle to another group
+    repo.update("STAT2", schemas.VehicleUpdate(**vehicle("STAT2", make="BMW", fuel="Diesel").model_dump(exclude={"vin"})))
+    bmw = repo.stats(["manufacturer_name", "fuel_type"], schemas.VehicleStatsFilter(manufacturer_name="BMW"))
+    assert [(g["fuel_type"], g["count"]) for g in bmw] == [("Diesel", 2)]
+    assert_consistent()
+
+    # Deleting the last vehicle of a group removes the group
+    repo.delete("STAT1")
+    assert repo.stats(["manufacturer_name"], schemas.VehicleStatsFilter(manufacturer_name="Audi")) == []
+    assert_consistent()
+
+
+def test_stats_follow_bulk_creation_and_recompute():
+    repo = VehicleRepository(TestingSession())
+    repo.create_many([
+        vehicle(f"BULK{i}", make="Ford", year=2000 + i % 3, price=1000.0 * (i + 1), hp=100 + i).model_dump()
+        for i in range(9)
+    ])
+    years = repo.stats(["model_year"], schemas.VehicleStatsFilter(manufacturer_name="Ford"))
+    assert [(g["model_year"], g["count"]) for g in years] == [(2000, 3), (2001, 3), (2002, 3)]
+    assert_consistent()
+
+    # A fleet-wide total has no dimensions
+    total = repo.stats()
+    assert len(total) == 1 and "manufacturer_name" not in total[0]
+
+    # Recompute reproduces the incrementally maintained figures
+    before = repo.stats(["manufacturer_name", "model_year", "fuel_type"])
+    with engine.begin() as conn:
+        stats.recompute(conn)
+    assert repo.stats(["manufacturer_name", "model_year", "fuel_type"]) == before
+
+
+def test_failed_write_leaves_stats_untouched():
+    repo = VehicleRepository(TestingSession())
+    before = repo.stats(["manufacturer_name"])
+    assert repo.create(vehicle("BULK0", make="Tesla")) is None  # duplicate VIN
+    assert repo.stats(["manufacturer_name"]) == before
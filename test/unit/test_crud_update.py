@@ -1,3 +1,5 @@
+import pytest
+from pydantic import ValidationError
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.database import Base
@@ -57,3 +59,33 @@ def test_update_vehicle():
     assert updated_vehicle.model_year == 2021
     assert updated_vehicle.description == "Updated Sport"
     assert updated_vehicle.fuel_type == "Hybrid"
+
+
+# Test PATCH logic
+
+def test_patch_writes_only_set_fields():
+    db = TestingSession()
+    repo = crud.VehicleRepository(db)
+    before = repo.read("UPD1")  # detached row, unaffected by the commit below
+
+    patched = repo.patch("upd1", schemas.VehiclePatch(purchase_price=29000.0))
+    assert patched.purchase_price == 29000.0
+    assert patched.description == before.description  # untouched
+    assert patched.version > before.version
+
+    # Conditional on a version the row is no longer at
+    with pytest.raises(crud.PreconditionFailed) as exc:
+        repo.patch("UPD1", schemas.VehiclePatch(horse_power=1), if_versions=[before.version])
+    assert exc.value.version == patched.version
+    assert repo.get("UPD1").horse_power == 260
+
+    assert repo.patch("MISSING", schemas.VehiclePatch(horse_power=1), if_versions=[1]) is None
+    db.close()
+
+
+def test_patch_schema_rejects_empty_and_null_required_fields():
+    with pytest.raises(ValidationError):
+        schemas.VehiclePatch(version=3)
+    with pytest.raises(ValidationError):
+        schemas.VehiclePatch(model_name=None)
+    assert schemas.VehiclePatch(description=None).changes() == {"description": None}
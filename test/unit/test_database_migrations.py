@@ -0,0 +1,87 @@
+import os
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from app.crud import VehicleRepository
+from app import migrations, schemas, search, stats
+
+
+def fresh_engine(path):
+    """Engine on a new, empty SQLite file."""
+    if os.path.exists(path):
+        os.remove(path)
+    return create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+
+def test_fresh_database_created_then_skipped():
+    engine = fresh_engine("./unit_migrate_fresh.db")
+
+    assert migrations.run(engine) == [migrations.LATEST]
+    with engine.connect() as conn:
+        assert migrations.current_version(conn) == migrations.LATEST
+        assert {"vehicles", "vehicle_stats", "table_generations", "vehicles_fts"} <= set(inspect(conn).get_table_names())
+
+    assert migrations.run(engine) == []  # already current: nothing to do
+    engine.dispose()
+
+
+def test_legacy_database_upgraded_in_place():
+    """A database from the first release (color NOT NULL, no version) keeps its rows and gains the rest."""
+    engine = fresh_engine("./unit_migrate_legacy.db")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE vehicles (
+                vin VARCHAR NOT NULL PRIMARY KEY, manufacturer_name VARCHAR NOT NULL,
+                description VARCHAR, horse_power INTEGER NOT NULL, model_name VARCHAR NOT NULL,
+                model_year INTEGER NOT NULL, purchase_price FLOAT NOT NULL,
+                fuel_type VARCHAR NOT NULL, color VARCHAR NOT NULL
+            )
+        """))
+        conn.execute(text(
+            "INSERT INTO vehicles VALUES ('OLD1', 'Audi', 'Quattro wagon', 200, 'A4', 2020, 30000.0, 'Petrol', 'Red')"
+        ))
+        conn.execute(text("CREATE TABLE cache_generation (id INTEGER PRIMARY KEY, generation INTEGER NOT NULL)"))
+
+    assert migrations.run(engine) == [n for n, _, _ in migrations.MIGRATIONS]
+
+    with engine.connect() as conn:
+        assert stats.check(conn) == []
+        hits = conn.execute(text(search.SEARCH_SQL), {"match": "quattro", "limit": 10, "offset": 0}).all()
+        assert [row.vin for row in hits] == ["OLD1"]
+        indexes = {ix["name"] for ix in inspect(conn).get_indexes("vehicles")}
+        assert "ix_vehicles_manufacturer_year_price" in indexes
+        assert "cache_generation" not in inspect(conn).get_table_names()
+
+    repo = VehicleRepository(sessionmaker(bind=engine)())
+    assert repo.read("OLD1").version == 1
+    created = repo.create(schemas.VehicleCreate(
+        vin="NEW1", manufacturer_name="Audi", description=None, horse_power=150,
+        model_name="A3", model_year=2021, purchase_price=25000.0, fuel_type="Petrol",
+    ))
+    assert created.version > 1  # the generation starts past every migrated version
+    engine.dispose()
+
+
+def test_versioned_database_with_required_color_is_rebuilt():
+    """A database that already has `version` but still has color NOT NULL keeps its versions."""
+    engine = fresh_engine("./unit_migrate_versioned.db")
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE vehicles (
+                vin VARCHAR NOT NULL PRIMARY KEY, manufacturer_name VARCHAR NOT NULL,
+                description VARCHAR, horse_power INTEGER NOT NULL, model_name VARCHAR NOT NULL,
+                model_year INTEGER NOT NULL, purchase_price FLOAT NOT NULL,
+                fuel_type VARCHAR NOT NULL, color VARCHAR NOT NULL, version INTEGER NOT NULL
+            )
+        """))
+        conn.execute(text(
+            "INSERT INTO vehicles VALUES ('VER1', 'Audi', 'Wagon', 200, 'A4', 2020, 30000.0, 'Petrol', 'Red', 7)"
+        ))
+
+    assert migrations.run(engine) == [n for n, _, _ in migrations.MIGRATIONS]
+    with engine.connect() as conn:
+        assert not migrations._columns(conn, "vehicles")["color"].notnull
+
+    repo = VehicleRepository(sessionmaker(bind=engine)())
+    assert repo.read("VER1").version == 7
+    engine.dispose()
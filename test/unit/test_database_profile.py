@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from app.database import Base, build_engines, routing_sessionmaker
+from app.crud import VehicleRepository
+from app import models, schemas
+
+# Production profile on an isolated SQLite file
+write_engine, read_engine = build_engines("sqlite:///./unit_profile.db", profile="production")
+TestingSession = routing_sessionmaker(write_engine, read_engine, autoflush=False)
+
+Base.metadata.drop_all(bind=write_engine)
+Base.metadata.create_all(bind=write_engine)
+
+
+def test_production_pragmas_applied():
+    """Writer runs in WAL with tuned pragmas; readers are query-only."""
+    with write_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+    with read_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA query_only")).scalar() == 1
+        with pytest.raises(OperationalError):
+            conn.execute(text("DELETE FROM vehicles"))
+
+
+def test_routing_session_splits_reads_and_writes():
+    """SELECTs go to the reader pool until the transaction writes; then the writer is used."""
+    db = TestingSession()
+    assert db.get_bind(clause=select(models.Vehicle)) is read_engine
+
+    db.execute(models.Vehicle.__table__.delete())
+    assert db.get_bind(clause=select(models.Vehicle)) is write_engine
+    db.commit()
+    assert db.get_bind(clause=select(models.Vehicle)) is read_engine
+    db.close()
+
+
+def test_routing_session_sends_text_statements_to_writer():
+    """A first-statement text() write must not land on the query-only reader."""
+    db = TestingSession()
+    assert db.get_bind(clause=text("SELECT 1")) is write_engine
+    db.close()
+
+    db = TestingSession()
+    db.execute(text("DELETE FROM vehicles WHERE vin = 'NOPE'"))
+    db.commit()
+    db.close()
+
+
+def test_repository_crud_through_routing_session():
+    """The repository works unchanged on top of the reader/writer split."""
+    repo = VehicleRepository(TestingSession())
+    created = repo.create(schemas.VehicleCreate(
+        vin="WAL1",
+        manufacturer_name="Lada",
+        description=None,
+        horse_power=80,
+        model_name="Niva",
+        model_year=2010,
+        purchase_price=5000.0,
+        fuel_type="Petrol",
+    ))
+    assert created.vin == "WAL1"
+    assert repo.get("wal1").model_name == "Niva"
+    assert repo.delete("WAL1") is True
+    assert repo.get("WAL1") is None